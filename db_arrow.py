@@ -0,0 +1,117 @@
+import decimal
+import itertools
+
+
+def batches_to_arrow(batches, column_names):
+    """Builds a pyarrow.Table from batches of row tuples, transposing each batch into columns.
+
+    Only one batch of Python rows is alive at a time, every batch becomes a record batch of
+    typed arrays; column types are unified across batches (e.g. an all null first batch).
+    """
+    import pyarrow
+
+    tables = []
+    for batch in batches:
+        columns = list(zip(*batch))
+        tables.append(pyarrow.Table.from_arrays([pyarrow.array(column) for column in columns], names=column_names))
+    if not tables:
+        return pyarrow.table({name: pyarrow.array([]) for name in column_names})
+    return pyarrow.concat_tables(tables, promote_options='default')
+
+
+def cursor_to_arrow(cursor, batch_size=10000):
+    """pyarrow.Table of the result of an executed DB-API cursor, fetched batch_size rows at a time."""
+    batches = iter(lambda: cursor.fetchmany(batch_size), [])
+    # named (server side) cursors only know their description after the first fetch
+    first = next(batches, [])
+    column_names = [each[0] for each in cursor.description]
+    return batches_to_arrow(itertools.chain([first] if first else [], batches), column_names)
+
+
+INTEGER_TYPES = {'INT', 'INTEGER', 'SMALLINT', 'BIGINT', 'TINYINT', 'MEDIUMINT', 'INT2', 'INT4', 'INT8',
+                 'SERIAL', 'BIGSERIAL', 'SMALLSERIAL'}
+FLOAT_TYPES = {'FLOAT', 'REAL', 'DOUBLE', 'DOUBLE PRECISION', 'BINARY_FLOAT', 'BINARY_DOUBLE', 'FLOAT4', 'FLOAT8'}
+DECIMAL_TYPES = {'NUMBER', 'NUMERIC', 'DECIMAL', 'DEC', 'MONEY', 'SMALLMONEY'}
+BOOLEAN_TYPES = {'BOOLEAN', 'BOOL', 'BIT'}
+BINARY_TYPES = {'BLOB', 'BYTEA', 'RAW', 'LONG RAW', 'BINARY', 'VARBINARY', 'IMAGE', 'TINYBLOB', 'MEDIUMBLOB',
+                'LONGBLOB'}
+TIMESTAMP_TYPES = {'DATETIME', 'DATETIME2', 'SMALLDATETIME', 'TIMESTAMP'}
+
+
+def _catalog_number(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def column_arrow_type(dialect, column):
+    """Arrow type of a column from its fetch_table_details entry (type, precision and scale).
+
+    Exact numbers become int64 or decimal128 from their declared precision and scale, a NUMBER /
+    NUMERIC without precision (any value may come) and types without an Arrow equivalent are
+    written as strings.
+    """
+    import pyarrow
+
+    data_type = str(column.get('DATA_TYPE') or '').upper().strip()
+    base_type = data_type.split('(')[0].strip()
+    if base_type in INTEGER_TYPES:
+        return pyarrow.int64()
+    if base_type in FLOAT_TYPES:
+        return pyarrow.float64()
+    if base_type in DECIMAL_TYPES:
+        # DB2 keeps the precision of DECIMAL in SYSCAT.COLUMNS.LENGTH
+        precision = _catalog_number(column.get('DATA_LENGTH' if dialect == 'db2' else 'DATA_PRECISION'))
+        scale = _catalog_number(column.get('DATA_SCALE')) or 0
+        if precision is None or precision > 38 or scale < 0:
+            return pyarrow.string()
+        if scale == 0 and precision <= 18:
+            return pyarrow.int64()
+        return pyarrow.decimal128(precision, scale)
+    if base_type == 'BIT' and dialect == 'mysql':
+        # BIT(n) of MySQL is a bit string, fetched as bytes
+        return pyarrow.binary()
+    if base_type in BOOLEAN_TYPES:
+        return pyarrow.bool_()
+    if base_type in BINARY_TYPES:
+        return pyarrow.binary()
+    if base_type == 'DATE':
+        # an Oracle DATE carries the time of day
+        return pyarrow.timestamp('us') if dialect == 'oracle' else pyarrow.date32()
+    if base_type in TIMESTAMP_TYPES or data_type.startswith('TIMESTAMP') or base_type == 'DATETIMEOFFSET':
+        # WITH LOCAL TIME ZONE (Oracle) and WITHOUT TIME ZONE (Postgres) values come back naive
+        if base_type == 'DATETIMEOFFSET' or 'WITH TIME ZONE' in data_type:
+            return pyarrow.timestamp('us', tz='UTC')
+        return pyarrow.timestamp('us')
+    return pyarrow.string()
+
+
+def arrow_values(values, arrow_type):
+    """values of one column converted to what pyarrow.array expects for arrow_type (int for an integral Decimal, ...)."""
+    import pyarrow
+
+    if pyarrow.types.is_string(arrow_type):
+        def convert(value):
+            # LOB locators (oracledb CLOB) are read here
+            return value.read() if hasattr(value, 'read') else str(value)
+    elif pyarrow.types.is_integer(arrow_type):
+        convert = int
+    elif pyarrow.types.is_floating(arrow_type):
+        convert = float
+    elif pyarrow.types.is_decimal(arrow_type):
+        exponent = decimal.Decimal(1).scaleb(-arrow_type.scale)
+        # the default context keeps 28 digits, decimal128 holds up to 38
+        context = decimal.Context(prec=arrow_type.precision + 1)
+
+        def convert(value):
+            value = decimal.Decimal(value if isinstance(value, (int, decimal.Decimal)) else str(value))
+            return value.quantize(exponent, context=context)
+    elif pyarrow.types.is_boolean(arrow_type):
+        convert = bool
+    elif pyarrow.types.is_binary(arrow_type):
+        def convert(value):
+            return bytes(value.read() if hasattr(value, 'read') else value)
+    else:
+        return list(values)
+    return [None if value is None else convert(value) for value in values]
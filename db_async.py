@@ -0,0 +1,83 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncConnectionManager:
+    """
+    this class exposes a connection manager to asyncio.
+
+    Every call runs the method of a synchronous manager on a worker thread, each worker keeping
+    its own pooled connection, so one event loop can keep max_concurrency catalog and count
+    queries in flight against the same database.
+    """
+
+    def __init__(self, manager_class, connection_info, max_concurrency=16) -> None:
+        """
+        manager_class is one of the *ConectionManger classes, connection_info is passed to it.
+        """
+        self.manager_class = manager_class
+        self.connection_info = dict(connection_info, use_pool=True,
+                                    pool_max_size=max(int(connection_info.get('pool_max_size', 0)), max_concurrency))
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._idle = []
+
+    async def _run(self, method_name, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            if self._idle:
+                manager = self._idle.pop()
+            else:
+                manager = await loop.run_in_executor(self.executor, self.manager_class, self.connection_info)
+            try:
+                result = await loop.run_in_executor(self.executor,
+                                                    functools.partial(getattr(manager, method_name), *args, **kwargs))
+            except Exception:
+                await loop.run_in_executor(self.executor, manager.connection_close)
+                raise
+            self._idle.append(manager)
+            return result
+
+    async def metadata_details(self, table_name=None, compact=False):
+        if table_name is None:
+            return await self._run('metadata_details', compact=compact)
+        return await self._run('metadata_details', table_name, compact=compact)
+
+    async def table_count(self, table_name, where_clause=None, **kwargs):
+        if not hasattr(self.manager_class, 'table_count'):
+            status, records_count = await self._run('table_count_db2', table_name, **kwargs)
+            return records_count if status else None
+        return await self._run('table_count', table_name, where_clause, **kwargs)
+
+    async def find_table(self, table_name):
+        return await self._run('find_table', table_name)
+
+    async def find_tables(self, names, refresh=False):
+        return await self._run('find_tables', names, refresh)
+
+    async def calculate_checksum(self, sql_query):
+        return await self._run('calculate_checksum', sql_query)
+
+    async def find_min_max_value(self, table_name, column_name):
+        return await self._run('find_min_max_value', table_name, column_name)
+
+    async def find_min_max_values(self, table_name, columns=None):
+        return await self._run('find_min_max_values', table_name, columns)
+
+    async def table_space(self, table_name):
+        return await self._run('table_space', table_name)
+
+    async def table_spaces(self):
+        return await self._run('table_spaces')
+
+    async def fetch_rows(self, sql_query):
+        return await self._run('fetch_rows', sql_query)
+
+    async def close(self):
+        """return every connection to the pool and stop the worker threads."""
+        loop = asyncio.get_running_loop()
+        while self._idle:
+            await loop.run_in_executor(self.executor, self._idle.pop().connection_close)
+        self.executor.shutdown(wait=False)
@@ -1,118 +1,400 @@
-import pyodbc
-
-
-class AzureSqlConectionManger:
-    """
-    this class for Azure Sql the connection and detail of databse.
-    """
-
-    def __init__(self, connection_info) -> None:
-        print("conn_info=====",connection_info)
-        """
-        initalize value connection details and create the connection with mssql database
-        """
-        self.host_address = connection_info.get('host_address', '')
-        self.port_number = connection_info.get('port_number', '1433')
-        self.database_name = connection_info.get('database_name', '')
-        self.username=connection_info.get('username','')
-        self.schema_name = connection_info.get('schema_name', '')
-        self.password = connection_info.get('password', '')
-        self.source_schema = connection_info.get('source_schema', None)
-        err, self.connection = self.create_connection()
-        if self.connection is None:
-            print("Connection not created ")
-            raise Exception(err)
-
-    def create_connection(self):
-        """ Connect to the oracle Server database server """
-        con = None
-        err = None
-        try:
-            # Establish the connection
-            server = self.host_address
-            database = self.database_name
-            username = self.username
-            password = self.password
-            driver= '{ODBC Driver 17 for SQL Server}'
-            con = pyodbc.connect('DRIVER=' + driver + ';SERVER=' + server + ';PORT=1433;DATABASE=' + database + ';UID=' + username + ';PWD=' + password)
-            print(con)
-        except Exception as err:
-            print(err)
-            return err, con
-        return err, con
-
-    def connection_close(self):
-        self.connection.close()
-
-    def metadata_details(self):
-        sql_table = f"SELECT TABLE_NAME FROM information_schema.tables where TABLE_CATALOG ='{self.database_name.upper()}' "
-        meta_data_details = []
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_table)
-            for result in cursor.fetchall():
-                temp = {'table_name': result[0], 'column_detail': self.fetch_table_details(result[0])}
-                meta_data_details.append(temp)
-        return meta_data_details
-
-    def fetch_table_details(self, table_name):
-        temp_col = []
-        with self.connection.cursor() as cursor_tbl:
-            sql_col_detail = f'''
-                           SELECT 
-                               COLUMN_NAME, DATA_TYPE, IS_NULLABLE, column_default,
-                               CASE 
-                                   WHEN DATA_TYPE IN ('decimal', 'numeric') THEN NUMERIC_PRECISION
-                                   WHEN DATA_TYPE IN ('datetime2', 'time', 'datetimeoffset') THEN DATETIME_PRECISION
-                                   ELSE CHARACTER_MAXIMUM_LENGTH
-                               END AS Length,
-                               NUMERIC_PRECISION AS Precision,
-                               NUMERIC_SCALE AS Scale
-
-                           FROM INFORMATION_SCHEMA.COLUMNS
-                           WHERE TABLE_NAME = '{table_name}' '''
-            cursor_tbl.execute(sql_col_detail)
-            column_details_list = cursor_tbl.fetchall()
-            for column_details in column_details_list:
-                temp_col.append({"column_name": column_details[0], "DATA_TYPE": column_details[1],
-                                 "is_nullable": column_details[2], "COLUMN_DEFAULT": column_details[3],
-                                 "DATA_LENGTH": column_details[4], "DATA_PRECISION": column_details[5],
-                                 "DATA_SCALE": column_details[6]})
-        return temp_col
-
-    def find_table(self, table_name):
-        sql_table = f"SELECT count(1) FROM information_schema.tables where TABLE_CATALOG ='{self.database_name.upper()}' and TABLE_NAME='{table_name}'"
-
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_table)
-            data = cursor.fetchone()
-            print(data)
-            table_count = data[0]
-        if table_count == 0:
-            return True
-        else:
-            return False
-
-    def create_table(self, sql_query, table_create=False):
-        result = None
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            if table_create:
-                self.connection.commit()
-            else:
-                data = cursor.fetchone()
-                result = data[0]
-        return result
-
-    def table_space(self, table_name):
-        sql_table = f"SELECT count(1) FROM information_schema.tables where TABLE_CATALOG ='{self.database_name.upper()}' and TABLE_NAME='{table_name}'"
-
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_table)
-            data = cursor.fetchone()
-            print(data)
-            table_count = data[0]
-        if table_count == 0:
-            return True
-        else:
-            return False
-
+from db_arrow import cursor_to_arrow
+from db_factory import lazy_import
+from db_metadata import compact_record
+from db_profile import profile_table
+from db_pool import pool_registry
+from db_queries import StatementCache, bind_query, query_registry, update_table_index
+from db_sqlserver import merge_statement, stage_table_statement
+from db_stats import batched, count_estimate, split_table_name, table_min_max, add_segment_size, table_spaces_result
+
+pyodbc = lazy_import('pyodbc')
+
+
+def odbc_input_size(column):
+    """(sql type, size, decimal digits) of a fetch_table_details column, None lets the driver guess."""
+    if column is None:
+        return None
+    data_type = str(column['DATA_TYPE']).lower()
+    length = column['DATA_LENGTH'] if isinstance(column['DATA_LENGTH'], int) else None
+    scale = column['DATA_SCALE'] if isinstance(column['DATA_SCALE'], int) else 0
+    size = 0 if length in (None, -1) else length
+    if data_type in ('varchar', 'char', 'text'):
+        return (pyodbc.SQL_VARCHAR, size, 0)
+    if data_type in ('nvarchar', 'nchar', 'ntext'):
+        return (pyodbc.SQL_WVARCHAR, size, 0)
+    if data_type in ('varbinary', 'binary', 'image'):
+        return (pyodbc.SQL_VARBINARY, size, 0)
+    if data_type in ('decimal', 'numeric'):
+        return (pyodbc.SQL_DECIMAL, size, scale)
+    if data_type == 'datetime2':
+        precision = 7 if length is None else length
+        return (pyodbc.SQL_TYPE_TIMESTAMP, 20 + precision if precision else 19, precision)
+    simple_types = {'int': pyodbc.SQL_INTEGER, 'bigint': pyodbc.SQL_BIGINT, 'smallint': pyodbc.SQL_SMALLINT,
+                    'tinyint': pyodbc.SQL_TINYINT, 'bit': pyodbc.SQL_BIT, 'float': pyodbc.SQL_DOUBLE,
+                    'real': pyodbc.SQL_REAL, 'date': pyodbc.SQL_TYPE_DATE,
+                    'datetime': pyodbc.SQL_TYPE_TIMESTAMP, 'smalldatetime': pyodbc.SQL_TYPE_TIMESTAMP}
+    if data_type in simple_types:
+        return (simple_types[data_type], 0, 0)
+    return None
+
+
+class AzureSqlConectionManger:
+    """
+    this class for Azure Sql the connection and detail of databse.
+    """
+
+    dialect = 'azure_sql'
+
+    def __init__(self, connection_info) -> None:
+        print("conn_info=====",connection_info)
+        """
+        initalize value connection details and create the connection with mssql database
+        """
+        self.host_address = connection_info.get('host_address', '')
+        self.port_number = connection_info.get('port_number', '1433')
+        self.database_name = connection_info.get('database_name', '')
+        self.username=connection_info.get('username','')
+        self.schema_name = connection_info.get('schema_name', '')
+        self.password = connection_info.get('password', '')
+        self.source_schema = connection_info.get('source_schema', None)
+        self.connection_info = connection_info
+        self.statements = StatementCache(self.prepare_statement, lambda cursor: cursor.close(),
+                                         int(connection_info.get('statement_cache_size', 64)))
+        self._table_index = None
+        self.use_pool = connection_info.get('use_pool', False)
+        if self.use_pool:
+            self.pool = pool_registry.get_pool(self.__class__.__name__, connection_info, self.create_connection)
+            err, self.connection = self.pool.acquire()
+        else:
+            err, self.connection = self.create_connection()
+        if self.connection is None:
+            print("Connection not created ")
+            raise Exception(err)
+
+    def create_connection(self):
+        """ Connect to the oracle Server database server """
+        con = None
+        err = None
+        try:
+            # Establish the connection
+            server = self.host_address
+            database = self.database_name
+            username = self.username
+            password = self.password
+            driver= '{ODBC Driver 17 for SQL Server}'
+            con = pyodbc.connect('DRIVER=' + driver + ';SERVER=' + server + ';PORT=1433;DATABASE=' + database + ';UID=' + username + ';PWD=' + password)
+            print(con)
+        except Exception as err:
+            print(err)
+            return err, con
+        return err, con
+
+    def connection_close(self):
+        if self.connection is None:
+            return
+        self.statements.clear()
+        if self.use_pool:
+            self.pool.release(self.connection)
+        else:
+            self.connection.close()
+        self.connection = None
+
+    def metadata_details(self, table_name=None, compact=False):
+        meta_data_details = []
+        if table_name is None:
+            sql_table = f"SELECT TABLE_NAME FROM information_schema.tables where TABLE_CATALOG ='{self.database_name.upper()}' "
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql_table)
+                table_names = [result[0] for result in cursor.fetchall()]
+        else:
+            table_names = [table_name]
+        for each_table in table_names:
+            temp = {'table_name': each_table, 'column_detail': self.fetch_table_details(each_table)}
+            meta_data_details.append(compact_record(temp) if compact else temp)
+        return meta_data_details
+
+    def ddl_markers(self):
+        """table name -> DDL change marker (sys.objects.modify_date), one catalog query for the whole schema."""
+        sql = """SELECT o.name, CONVERT(varchar(33), o.modify_date, 126)
+                 FROM sys.objects o
+                 WHERE o.type = 'U'"""
+        return {name: str(marker) for name, marker in self.fetch_rows(sql)}
+
+    def prepare_statement(self, sql_query):
+        """cursor dedicated to one statement text, kept in self.statements."""
+        return self.connection.cursor()
+
+    def execute_bound(self, sql_query, values=None):
+        """Runs a select written with $name markers, the values are sent as bind variables.
+
+        Parameters
+        ----------
+        sql_query : str
+            select with $name (or '$name') where a value goes, table and column names can not be bound.
+        values : dict
+            value of every marker.
+
+        Returns
+        -------
+        rows : list
+            tuples of the result.
+        """
+        sql_query, params = bind_query(sql_query, self.dialect, values or {})
+        # pyodbc keeps the prepared statement of a cursor while the text does not change
+        cursor = self.statements.get(sql_query)
+        cursor.execute(sql_query, params)
+        return cursor.fetchall()
+
+    def catalog_rows(self, query_name, **values):
+        """rows of a catalog query of the registry, values are sent as bind variables."""
+        return self.execute_bound(query_registry.template(self.dialect, query_name), values)
+
+    def fetch_table_details(self, table_name):
+        temp_col = []
+        for column_details in self.catalog_rows('table_columns', table_name=table_name):
+            temp_col.append({"column_name": column_details[0], "DATA_TYPE": column_details[1],
+                             "is_nullable": column_details[2], "COLUMN_DEFAULT": column_details[3],
+                             "DATA_LENGTH": column_details[4], "DATA_PRECISION": column_details[5],
+                             "DATA_SCALE": column_details[6]})
+        return temp_col
+
+    def table_count(self, table_name, where_clause=None, estimate=False, max_stats_age_days=7):
+        if estimate and where_clause is None:
+            return self.table_count_estimate(table_name, max_stats_age_days)['row_count']
+        records_count = 0
+        sql = f"select count(1) from {table_name}"
+        if where_clause is not None:
+            sql = sql + f"\n {where_clause}"
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+            data = cursor.fetchone()
+            records_count = data[0]
+        return records_count
+
+    def table_count_estimate(self, table_name, max_stats_age_days=7):
+        """Returns the row count of the table from the storage metadata (sys.partitions.rows).
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table, optionally prefixed by the schema.
+        max_stats_age_days : float
+            kept for the same signature as the other managers, sys.partitions is maintained by the
+            engine so it is never stale; a missing table falls back to an exact count.
+
+        Returns
+        -------
+        result : dict
+            row_count, estimated (False when count(1) was used), last_analyzed, stats_age_days, stale.
+        """
+        schema, name = split_table_name(table_name, 'dbo')
+        sql = f"""SELECT SUM(p.rows)
+                  FROM sys.partitions p
+                  JOIN sys.tables t ON p.object_id = t.object_id
+                  WHERE t.name = '{name}' AND SCHEMA_NAME(t.schema_id) = '{schema}' AND p.index_id IN (0, 1)"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+            data = cursor.fetchone()
+        result = count_estimate(data[0] if data else None, None, max_stats_age_days)
+        if result['stale']:
+            result['row_count'] = self.table_count(table_name)
+            result['estimated'] = False
+        return result
+
+    def find_table(self, table_name):
+        sql_table = "SELECT count(1) FROM information_schema.tables where TABLE_CATALOG = $catalog and TABLE_NAME = $table_name"
+        data = self.execute_bound(sql_table, {'catalog': self.database_name.upper(), 'table_name': table_name})[0]
+        print(data)
+        table_count = data[0]
+        if table_count == 0:
+            return True
+        else:
+            return False
+
+    def table_names(self, refresh=False):
+        """Names of the tables of the database, lower cased as the default collation ignores case.
+
+        Read with one query on first use (or refresh=True), then kept up to date by create_table and
+        delete_table of this manager.
+        """
+        if self._table_index is None or refresh:
+            sql = "SELECT TABLE_NAME FROM information_schema.tables WHERE TABLE_CATALOG = $catalog"
+            self._table_index = {row[0].lower() for row in self.execute_bound(sql, {'catalog': self.database_name.upper()})}
+        return self._table_index
+
+    def find_tables(self, names, refresh=False):
+        """Checks the existence of any number of tables with at most one catalog query.
+
+        Parameters
+        ----------
+        names : list
+            table names.
+        refresh : bool
+            read the catalog again instead of the names known to this manager.
+
+        Returns
+        -------
+        result : dict
+            table name -> True when the table exists (unlike find_table, which returns True when it is missing).
+        """
+        table_index = self.table_names(refresh)
+        return {name: name.lower() in table_index for name in names}
+
+    def create_table(self, sql_query, table_create=False):
+        result = None
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            if table_create:
+                self.connection.commit()
+                self._table_index = update_table_index(self._table_index, sql_query, normalize=str.lower)
+            else:
+                data = cursor.fetchone()
+                result = data[0]
+        return result
+
+    def delete_table(self, sql_query):
+        result = None
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            self.connection.commit()
+        self._table_index = update_table_index(self._table_index, sql_query, normalize=str.lower)
+        return result
+
+    def table_space(self, table_name):
+        sql_table = "SELECT count(1) FROM information_schema.tables where TABLE_CATALOG = $catalog and TABLE_NAME = $table_name"
+        data = self.execute_bound(sql_table, {'catalog': self.database_name.upper(), 'table_name': table_name})[0]
+        print(data)
+        table_count = data[0]
+        if table_count == 0:
+            return True
+        else:
+            return False
+
+    def table_spaces(self):
+        """Size in bytes of every table of the schema from one sys.allocation_units query.
+
+        Returns
+        -------
+        result : dict
+            table name -> table_bytes (heap / clustered index), index_bytes, lob_bytes, total_bytes
+            and partitions (partition number -> bytes, empty when the table is not partitioned).
+        """
+        spaces = {}
+        rows = self.catalog_rows('table_spaces', schema=self.schema_name or 'dbo')
+        for table_name, partition_number, kind, size in rows:
+            add_segment_size(spaces, table_name, kind, size, str(partition_number))
+        return table_spaces_result(spaces)
+
+    def find_min_max_values(self, table_name, columns=None):
+        """min and max of several columns with a single scan of the table, see db_stats.table_min_max."""
+        return table_min_max(self, table_name, columns)
+
+    def fetch_rows(self, sql_query):
+        """run a select and return all rows as tuples."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            return cursor.fetchall()
+
+    def iter_rows(self, sql_query, batch_size=10000):
+        """run a select and yield its rows, fetched batch_size rows per round trip."""
+        with self.connection.cursor() as cursor:
+            cursor.arraysize = batch_size
+            cursor.execute(sql_query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def query_arrow(self, sql_query, batch_size=10000):
+        """Runs a select and returns its result as a pyarrow.Table built column wise batch by batch."""
+        with self.connection.cursor() as cursor:
+            cursor.arraysize = batch_size
+            cursor.execute(sql_query)
+            return cursor_to_arrow(cursor, batch_size)
+
+    def profile_columns(self, table_name, columns=None, sample_percent=None):
+        """Profiles null counts, distinct counts and value lengths of the columns, see db_profile.profile_table.
+
+        Returns
+        -------
+        result : dict
+            column name -> ColumnProfile
+        """
+        return profile_table(self, table_name, columns, sample_percent)
+
+    def bulk_insert(self, table_name, columns, rows):
+        """Inserts the rows into the table with pyodbc fast_executemany, the batch is committed once.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the target table.
+        columns : list
+            column names, in the order of the values of each row.
+        rows : list
+            rows as tuples.
+
+        Returns
+        -------
+        result : int
+            number of rows inserted.
+        """
+        return self.load_rows(table_name, rows, columns, batch_size=max(len(rows), 1))['rows']
+
+    def input_sizes(self, table_name, columns):
+        """ODBC parameter types of the columns, from fetch_table_details, for cursor.setinputsizes."""
+        _, name = split_table_name(table_name)
+        details = {each['column_name']: each for each in self.fetch_table_details(name)}
+        return [odbc_input_size(details.get(column)) for column in columns]
+
+    def load_rows(self, table_name, rows, columns=None, key_columns=None, batch_size=10000):
+        """Inserts or upserts rows with fast_executemany, committing after every batch.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the target table.
+        rows : iterable
+            rows as tuples, consumed batch by batch.
+        columns : list
+            column names in the order of the values, by default every column of the table.
+        key_columns : list
+            when given the batches are upserted: loaded into a temp table and merged on these columns.
+        batch_size : int
+            rows sent and committed together.
+
+        Returns
+        -------
+        result : dict
+            rows and batches loaded.
+        """
+        if columns is None:
+            _, name = split_table_name(table_name)
+            columns = [each['column_name'] for each in self.fetch_table_details(name)]
+        input_sizes = self.input_sizes(table_name, columns)
+        target = table_name
+        if key_columns:
+            target = '#stage_load'
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {target}")
+                cursor.execute(stage_table_statement(target, table_name, columns))
+        placeholders = ', '.join(['?'] * len(columns))
+        sql_query = f"INSERT INTO {target} ({', '.join(columns)}) VALUES ({placeholders})"
+        row_count = 0
+        batch_count = 0
+        with self.connection.cursor() as cursor:
+            cursor.fast_executemany = True
+            for batch in batched(rows, batch_size):
+                cursor.setinputsizes(input_sizes)
+                cursor.executemany(sql_query, batch)
+                if key_columns:
+                    cursor.execute(merge_statement(table_name, target, columns, key_columns))
+                    cursor.execute(f"TRUNCATE TABLE {target}")
+                self.connection.commit()
+                row_count += len(batch)
+                batch_count += 1
+            if key_columns:
+                cursor.execute(f"DROP TABLE {target}")
+                self.connection.commit()
+        return {'rows': row_count, 'batches': batch_count}
@@ -0,0 +1,85 @@
+import queue
+import threading
+import time
+
+from db_stats import batched
+
+
+class TableCopy:
+    """
+    this class streams the rows of a table from a source manager into a target manager.
+
+    A reader thread fetches batches from the source into a bounded queue while the writer loads
+    the previous batches with the bulk_insert of the target, so extraction and loading overlap
+    and at most queue_size batches are held in memory.
+    """
+
+    def __init__(self, source, target, table_name, target_table_name=None, columns=None,
+                 batch_size=10000, queue_size=4, where_clause=None) -> None:
+        """
+        source and target are connection managers, columns defaults to every column of the source table.
+        """
+        self.source = source
+        self.target = target
+        self.table_name = table_name
+        self.target_table_name = target_table_name or table_name
+        if columns is None:
+            columns = [each['column_name'] for each in source.fetch_table_details(table_name)]
+        self.columns = columns
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.where_clause = where_clause
+
+    def _read(self, batches, errors, stop):
+        sql_query = f"SELECT {', '.join(self.columns)} FROM {self.table_name}"
+        if self.where_clause is not None:
+            sql_query = sql_query + f"\n {self.where_clause}"
+        try:
+            for batch in batched(self.source.iter_rows(sql_query, self.batch_size), self.batch_size):
+                if stop.is_set():
+                    return
+                batches.put(batch)
+        except Exception as err:
+            errors.append(err)
+        finally:
+            batches.put(None)
+
+    def run(self):
+        """Copies the table.
+
+        Returns
+        -------
+        result : dict
+            rows, batches, elapsed_seconds and rows_per_sec.
+        """
+        start_time = time.perf_counter()
+        batches = queue.Queue(maxsize=self.queue_size)
+        errors = []
+        stop = threading.Event()
+        reader = threading.Thread(target=self._read, args=(batches, errors, stop), daemon=True)
+        reader.start()
+        row_count = 0
+        batch_count = 0
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                row_count += self.target.bulk_insert(self.target_table_name, self.columns, batch)
+                batch_count += 1
+        except Exception:
+            # stop the reader and drain the queue so it is not blocked on a full queue
+            stop.set()
+            while batches.get() is not None:
+                pass
+            raise
+        finally:
+            reader.join()
+        if errors:
+            raise errors[0]
+        elapsed = time.perf_counter() - start_time
+        print(f"copied {row_count} rows of {self.table_name} in {elapsed:.2f} seconds")
+        return {'rows': row_count,
+                'batches': batch_count,
+                'elapsed_seconds': elapsed,
+                'rows_per_sec': row_count / elapsed if elapsed else None}
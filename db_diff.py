@@ -0,0 +1,150 @@
+import math
+
+
+def null_marker(column):
+    """'N' when the column is null, 'V' otherwise, so (NULL, 'a') and ('a', NULL) hash differently."""
+    return f"CASE WHEN {column} IS NULL THEN 'N' ELSE 'V' END"
+
+
+def row_text_expression(dialect, columns):
+    """SQL expression concatenating the null marker and value of every column of a row with '|' in the given dialect."""
+    if dialect == 'oracle':
+        return " || '|' || ".join(f"{null_marker(column)} || {column}" for column in columns)
+    if dialect == 'db2':
+        return " || '|' || ".join(f"{null_marker(column)} || COALESCE(VARCHAR({column}), '')" for column in columns)
+    # CONCAT_WS skips null arguments, the marker keeps the position of every column
+    return f"CONCAT_WS('|', {', '.join(f'{null_marker(column)}, {column}' for column in columns)})"
+
+
+def row_hash_expression(dialect, columns):
+    """SQL expression hashing the columns of a row into a 32 bit integer in the given dialect.
+
+    The hash functions differ between engines, when source and target are different engines
+    MerkleTableDiff needs an explicit expression for each side that yields the same value.
+    """
+    text = row_text_expression(dialect, columns)
+    if dialect == 'oracle':
+        return f"ORA_HASH({text})"
+    if dialect == 'postgres':
+        return f"('x' || substr(md5({text}), 1, 8))::bit(32)::bigint"
+    if dialect == 'mysql':
+        return f"CRC32({text})"
+    if dialect in ('mssql', 'azure_sql'):
+        return f"CAST(BINARY_CHECKSUM({text}) AS BIGINT)"
+    if dialect == 'db2':
+        return f"BIGINT(HASH4({text}))"
+    raise ValueError(f"no row hash for dialect {dialect}")
+
+
+class MerkleTableDiff:
+    """
+    this class locates the rows that differ between a source and a target table.
+
+    Both tables are split into key ranges whose row count and hash sum are computed on the
+    server, only the ranges that do not match are split again, down to ranges small enough
+    to compare row by row. The key column must be an integer.
+    """
+
+    def __init__(self, source, target, table_name, key_column=None, columns=None, target_table_name=None,
+                 fanout=16, leaf_rows=1000, source_hash_expression=None, target_hash_expression=None) -> None:
+        """
+        source and target are connection managers, columns defaults to every column of the source table.
+        """
+        self.source = source
+        self.target = target
+        self.source_table = table_name
+        self.target_table = target_table_name or table_name
+        self.key_column = key_column or self.find_key_column()
+        if columns is None:
+            columns = [each['column_name'] for each in source.fetch_table_details(table_name)]
+        self.columns = columns
+        self.fanout = max(fanout, 2)
+        self.leaf_rows = leaf_rows
+        if source.dialect != target.dialect and not (source_hash_expression and target_hash_expression):
+            # each engine has its own hash function, every bucket would mismatch
+            raise ValueError(f"source ({source.dialect}) and target ({target.dialect}) are different engines, "
+                             f"pass source_hash_expression and target_hash_expression computing the same hash")
+        self.source_hash = source_hash_expression or row_hash_expression(source.dialect, columns)
+        self.target_hash = target_hash_expression or row_hash_expression(target.dialect, columns)
+        self.query_count = 0
+
+    def find_key_column(self):
+        """single column primary key of the source table, from fetch_primary_key_constraint."""
+        if not hasattr(self.source, 'fetch_primary_key_constraint'):
+            raise ValueError("key_column is required, the source manager does not expose its primary key")
+        key_columns = [each['column_name'] for each in self.source.fetch_primary_key_constraint(self.source_table)
+                       if each['constraint_type'] == 'P']
+        if len(key_columns) != 1:
+            raise ValueError(f"key_column is required, {self.source_table} has primary key {key_columns}")
+        return key_columns[0]
+
+    def _fetch(self, manager, sql_query):
+        self.query_count += 1
+        return manager.fetch_rows(sql_query)
+
+    def _key_range(self, manager, table_name):
+        row = self._fetch(manager, f"SELECT MIN({self.key_column}), MAX({self.key_column}) FROM {table_name}")[0]
+        if row[0] is None:
+            return None
+        try:
+            return int(row[0]), int(row[1])
+        except (TypeError, ValueError):
+            raise ValueError(f"key column {self.key_column} must be an integer column")
+
+    def _bucket_hashes(self, manager, table_name, hash_expression, low, high, step):
+        bucket = f"FLOOR(({self.key_column} - {low}) / {step})"
+        sql_query = f"""SELECT {bucket}, COUNT(*), SUM({hash_expression}) FROM {table_name}
+                        WHERE {self.key_column} >= {low} AND {self.key_column} < {high}
+                        GROUP BY {bucket}"""
+        return {int(row[0]): (int(row[1]), int(row[2] or 0)) for row in self._fetch(manager, sql_query)}
+
+    def _row_hashes(self, manager, table_name, hash_expression, low, high):
+        sql_query = f"""SELECT {self.key_column}, {hash_expression} FROM {table_name}
+                        WHERE {self.key_column} >= {low} AND {self.key_column} < {high}"""
+        return {int(row[0]): row[1] for row in self._fetch(manager, sql_query)}
+
+    def _diff_leaf(self, low, high, result):
+        source_rows = self._row_hashes(self.source, self.source_table, self.source_hash, low, high)
+        target_rows = self._row_hashes(self.target, self.target_table, self.target_hash, low, high)
+        for key, row_hash in source_rows.items():
+            if key not in target_rows:
+                result['missing_in_target'].append(key)
+            elif target_rows[key] != row_hash:
+                result['mismatched'].append(key)
+        for key in target_rows:
+            if key not in source_rows:
+                result['missing_in_source'].append(key)
+
+    def _diff_range(self, low, high, result):
+        step = math.ceil((high - low) / self.fanout)
+        source_buckets = self._bucket_hashes(self.source, self.source_table, self.source_hash, low, high, step)
+        target_buckets = self._bucket_hashes(self.target, self.target_table, self.target_hash, low, high, step)
+        for bucket in sorted(set(source_buckets) | set(target_buckets)):
+            source_bucket = source_buckets.get(bucket, (0, 0))
+            target_bucket = target_buckets.get(bucket, (0, 0))
+            if source_bucket == target_bucket:
+                continue
+            bucket_low = low + bucket * step
+            bucket_high = min(bucket_low + step, high)
+            if step == 1 or max(source_bucket[0], target_bucket[0]) <= self.leaf_rows:
+                self._diff_leaf(bucket_low, bucket_high, result)
+            else:
+                self._diff_range(bucket_low, bucket_high, result)
+
+    def run(self):
+        """Compares the two tables.
+
+        Returns
+        -------
+        result : dict
+            missing_in_target, missing_in_source and mismatched key lists and the number of queries run.
+        """
+        result = {'missing_in_target': [], 'missing_in_source': [], 'mismatched': []}
+        ranges = [each for each in (self._key_range(self.source, self.source_table),
+                                    self._key_range(self.target, self.target_table)) if each]
+        if ranges:
+            low = min(each[0] for each in ranges)
+            high = max(each[1] for each in ranges) + 1
+            self._diff_range(low, high, result)
+        result['queries'] = self.query_count
+        return result
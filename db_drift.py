@@ -0,0 +1,155 @@
+from db_metadata import to_plain
+
+
+PARTITION_KEYS = ('partition_name', 'PartitionNumber', 'partition_id')
+# partition fields that move when another partition is added / flagged, not a change of the partition itself
+PARTITION_IGNORED = ('selected', 'dropped', 'partition_count', 'partition_position')
+
+
+def snapshot_tables(snapshot, ignore_case=True):
+    """table name -> table metadata of a metadata_details list or of a MetadataCache.load() dict."""
+    if isinstance(snapshot, dict):
+        snapshot = snapshot['tables'].values()
+    return {_name(each['table_name'], ignore_case): each for each in snapshot}
+
+
+def _name(value, ignore_case):
+    return value.lower() if ignore_case and isinstance(value, str) else value
+
+
+def _entries(value):
+    # several managers put {} instead of an empty list in constraint_details / index_details / partition_json
+    return value if isinstance(value, (list, tuple)) else []
+
+
+def _same(old, new):
+    if old == new:
+        return True
+    if old in (None, 'null') and new in (None, 'null'):
+        return True
+    # cached snapshots hold dates and decimals as str
+    return str(old) == str(new)
+
+
+def _changed_fields(old, new, ignored=()):
+    return {key: [old[key], new[key]] for key in old.keys()
+            if key in new and key not in ignored and not _same(old[key], new[key])}
+
+
+def _position(column):
+    # positions come back as int from the catalog and as str from a cached snapshot, 10 sorts after 2
+    try:
+        return 0, float(column[0]), ''
+    except (TypeError, ValueError):
+        return 1, 0, str(column[0])
+
+
+def _signatures(entries, name_key, type_key, ignore_case):
+    """signature -> description of constraints / indexes, one entry per column grouped by name.
+
+    The signature is the type, the columns in order and the referenced table, names are left out
+    because generated names (SYS_C..., PK__...) differ between databases.
+    """
+    groups = {}
+    for entry in entries:
+        group = groups.setdefault(entry.get(name_key), {'name': entry.get(name_key), 'type': entry.get(type_key),
+                                                        'columns': [], 'r_table_name': entry.get('r_table_name')})
+        group['columns'].append((entry.get('position') or 0, _name(entry.get('column_name'), ignore_case)))
+    signatures = {}
+    for group in groups.values():
+        group['columns'] = [column for _, column in sorted(group['columns'], key=_position)]
+        signature = (group['type'], tuple(group['columns']), _name(group['r_table_name'], ignore_case))
+        signatures[signature] = group
+    return signatures
+
+
+def _diff_signatures(old_entries, new_entries, name_key, type_key, ignore_case):
+    old = _signatures(old_entries, name_key, type_key, ignore_case)
+    new = _signatures(new_entries, name_key, type_key, ignore_case)
+    return ([new[key] for key in new if key not in old],
+            [old[key] for key in old if key not in new])
+
+
+def _partition_key(entry):
+    for key in PARTITION_KEYS:
+        if key in entry:
+            return str(entry[key])
+    return None
+
+
+def table_drift(old, new, ignore_case=True):
+    """Changes of one table between two snapshots, empty dict when nothing changed.
+
+    Returns
+    -------
+    drift : dict
+        only the non empty ones of columns_added / columns_removed (column names), columns_retyped
+        (column -> [old type, new type]), columns_changed (column -> field -> [old, new]),
+        constraints_added / constraints_removed, indexes_added / indexes_removed,
+        partitions_added / partitions_removed (partition keys) and partitions_changed.
+    """
+    old_columns = {_name(each['column_name'], ignore_case): each for each in _entries(old.get('column_detail'))}
+    new_columns = {_name(each['column_name'], ignore_case): each for each in _entries(new.get('column_detail'))}
+    drift = {
+        'columns_added': [name for name in new_columns if name not in old_columns],
+        'columns_removed': [name for name in old_columns if name not in new_columns],
+        'columns_retyped': {},
+        'columns_changed': {},
+    }
+    for name, column in old_columns.items():
+        if name not in new_columns:
+            continue
+        changed = _changed_fields(column, new_columns[name], ignored=('column_name',))
+        if 'DATA_TYPE' in changed:
+            drift['columns_retyped'][name] = changed['DATA_TYPE']
+        if changed:
+            drift['columns_changed'][name] = changed
+
+    drift['constraints_added'], drift['constraints_removed'] = _diff_signatures(
+        _entries(old.get('constraint_details')), _entries(new.get('constraint_details')),
+        'constraint_name', 'constraint_type', ignore_case)
+    drift['indexes_added'], drift['indexes_removed'] = _diff_signatures(
+        _entries(old.get('index_details')), _entries(new.get('index_details')),
+        'index_name', 'index_type', ignore_case)
+
+    old_partitions = {_partition_key(each): each for each in _entries(old.get('partition_json'))}
+    new_partitions = {_partition_key(each): each for each in _entries(new.get('partition_json'))}
+    drift['partitions_added'] = [key for key in new_partitions if key not in old_partitions]
+    drift['partitions_removed'] = [key for key in old_partitions if key not in new_partitions]
+    drift['partitions_changed'] = {}
+    for key, partition in old_partitions.items():
+        if key in new_partitions:
+            changed = _changed_fields(partition, new_partitions[key], ignored=PARTITION_IGNORED)
+            if changed:
+                drift['partitions_changed'][key] = changed
+    return {key: to_plain(value) for key, value in drift.items() if value}
+
+
+def schema_drift(old_snapshot, new_snapshot, ignore_case=True):
+    """Structured change set between two metadata snapshots (source vs target, yesterday vs today).
+
+    Parameters
+    ----------
+    old_snapshot, new_snapshot : list or dict
+        metadata_details results (dicts or compact descriptors) or MetadataCache.load() dicts.
+    ignore_case : bool
+        match table / column names case insensitively, e.g. Oracle against Postgres.
+
+    Returns
+    -------
+    drift : dict
+        tables_added, tables_removed and tables (table name -> table_drift, changed tables only).
+        Every table, column, constraint and partition is looked up by key, the cost is linear in
+        the size of the snapshots.
+    """
+    old_tables = snapshot_tables(old_snapshot, ignore_case)
+    new_tables = snapshot_tables(new_snapshot, ignore_case)
+    tables = {}
+    for name, table in old_tables.items():
+        if name in new_tables:
+            drift = table_drift(table, new_tables[name], ignore_case)
+            if drift:
+                tables[name] = drift
+    return {'tables_added': [name for name in new_tables if name not in old_tables],
+            'tables_removed': [name for name in old_tables if name not in new_tables],
+            'tables': tables}
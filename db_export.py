@@ -0,0 +1,154 @@
+import decimal
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from db_arrow import arrow_values, column_arrow_type
+from db_stats import batched
+
+
+class ParquetExporter:
+    """
+    this class snapshots a table to local Parquet files, one file per slice, slices exported in parallel.
+
+    Slices are the partitions of the table when the manager knows them (partition_slices), else
+    key_column ranges between its min and max, else the whole table. Every slice is read on its
+    own pooled connection. The slice plan and the finished slices are recorded in _progress.json
+    so an interrupted export only redoes the missing slices of the same plan.
+    """
+
+    def __init__(self, manager, table_name, output_dir, key_column=None, slice_count=8, max_workers=4,
+                 row_group_size=100000, columns=None) -> None:
+        self.manager = manager
+        self.table_name = table_name
+        self.table_dir = os.path.join(output_dir, table_name)
+        self.key_column = key_column
+        self.slice_count = slice_count
+        self.max_workers = max_workers
+        self.row_group_size = row_group_size
+        self.column_details = manager.fetch_table_details(table_name.split('.')[-1])
+        if columns is None:
+            columns = [each['column_name'] for each in self.column_details]
+        self.columns = columns
+        self.progress_path = os.path.join(self.table_dir, '_progress.json')
+        self._lock = threading.Lock()
+        self._schema = None
+
+    def slices(self):
+        """slice name -> (from clause, where clause)"""
+        if hasattr(self.manager, 'partition_slices'):
+            slices = self.manager.partition_slices(self.table_name)
+            if slices:
+                return {str(name): value for name, value in slices.items()}
+        if self.key_column:
+            low, high = self.manager.fetch_rows(
+                f"SELECT MIN({self.key_column}), MAX({self.key_column}) FROM {self.table_name}")[0]
+            if self._is_integral(low) and self._is_integral(high):
+                low, high = int(low), int(high) + 1
+                step = max(1, -(-(high - low) // self.slice_count))
+                return {f"range_{index:04d}": (self.table_name,
+                                               f"{self.key_column} >= {start} AND {self.key_column} < {min(start + step, high)}")
+                        for index, start in enumerate(range(low, high, step))}
+            if low is not None:
+                print(f"key column {self.key_column} of {self.table_name} is not an integer, exported as one slice")
+        return {'full': (self.table_name, None)}
+
+    @staticmethod
+    def _is_integral(value):
+        """int, or a float / Decimal without fraction (NUMBER keys come back as Decimal on some drivers)."""
+        if isinstance(value, bool) or not isinstance(value, (int, float, decimal.Decimal)):
+            return False
+        try:
+            return value == int(value)
+        except (OverflowError, ValueError):
+            return False
+
+    def _load_progress(self):
+        """saved slice plan (None before the first run) and rows of every finished slice."""
+        if not os.path.exists(self.progress_path):
+            return {'slices': None, 'done': {}}
+        with open(self.progress_path, 'r') as file:
+            return json.load(file)
+
+    def _save_progress(self, progress):
+        with open(self.progress_path + '.tmp', 'w') as file:
+            json.dump(progress, file)
+        os.replace(self.progress_path + '.tmp', self.progress_path)
+
+    def _mark_done(self, slice_name, row_count):
+        with self._lock:
+            progress = self._load_progress()
+            progress['done'][slice_name] = row_count
+            self._save_progress(progress)
+
+    def _build_schema(self):
+        """Arrow schema of the exported columns from the catalog types, precision and scale (see db_arrow.column_arrow_type)."""
+        import pyarrow
+
+        details = {str(each['column_name']).lower(): each for each in self.column_details}
+        self._schema = pyarrow.schema([
+            pyarrow.field(column, column_arrow_type(self.manager.dialect, details.get(str(column).lower(), {})))
+            for column in self.columns])
+
+    def _to_arrow(self, batch):
+        import pyarrow
+
+        arrays = []
+        for index, values in enumerate(zip(*batch) if batch else [[] for _ in self.columns]):
+            arrow_type = self._schema.field(index).type
+            arrays.append(pyarrow.array(arrow_values(values, arrow_type), type=arrow_type))
+        return pyarrow.Table.from_arrays(arrays, schema=self._schema)
+
+    def _export_slice(self, slice_name, from_clause, where_clause):
+        import pyarrow.parquet
+
+        sql_query = f"SELECT {', '.join(self.columns)} FROM {from_clause}"
+        if where_clause:
+            sql_query = sql_query + f" WHERE {where_clause}"
+        path = os.path.join(self.table_dir, f"{slice_name}.parquet")
+        # a LazyManager from get_manager forwards to the class of its dialect
+        manager_class = getattr(self.manager, 'manager_class', self.manager.__class__)
+        manager = manager_class(dict(self.manager.connection_info, use_pool=True))
+        row_count = 0
+        try:
+            with pyarrow.parquet.ParquetWriter(path + '.tmp', self._schema) as writer:
+                for batch in batched(manager.iter_rows(sql_query, self.row_group_size), self.row_group_size):
+                    writer.write_table(self._to_arrow(batch), row_group_size=self.row_group_size)
+                    row_count += len(batch)
+        finally:
+            manager.connection_close()
+        os.replace(path + '.tmp', path)
+        self._mark_done(slice_name, row_count)
+        print(f"exported {row_count} rows of {self.table_name} slice {slice_name}")
+        return row_count
+
+    def run(self):
+        """Exports the slices not exported yet.
+
+        Returns
+        -------
+        result : dict
+            slices (slice name -> rows, for every finished slice), skipped (slices already done
+            by a previous run) and rows (total of all finished slices).
+        """
+        os.makedirs(self.table_dir, exist_ok=True)
+        progress = self._load_progress()
+        if progress['slices'] is None:
+            # the plan is saved before any slice is exported, a resumed run reuses it instead of
+            # slicing again from the current MIN / MAX of the key column
+            progress['slices'] = self.slices()
+            self._save_progress(progress)
+        slices = progress['slices']
+        done = progress['done']
+        skipped = [name for name in slices
+                   if name in done and os.path.exists(os.path.join(self.table_dir, f"{name}.parquet"))]
+        pending = {name: value for name, value in slices.items() if name not in skipped}
+        if pending:
+            self._build_schema()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {name: executor.submit(self._export_slice, name, *value) for name, value in pending.items()}
+            exported = {name: future.result() for name, future in futures.items()}
+        result = {name: done[name] for name in skipped}
+        result.update(exported)
+        return {'slices': result, 'skipped': skipped, 'rows': sum(result.values())}
@@ -0,0 +1,163 @@
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+import threading
+
+
+# dialect -> (module, class) of its connection manager
+MANAGER_CLASSES = {
+    'oracle': ('db_oracle', 'OracleConectionManger'),
+    'postgres': ('db_postgres', 'PostgresConectionManger'),
+    'mysql': ('db_mysql', 'MySqlConectionManger'),
+    'mssql': ('db_mssql', 'MsSqlConectionManger'),
+    'azure_sql': ('db_azure_sql', 'AzureSqlConectionManger'),
+    'db2': ('db_ibmdb2', 'Db2ConnectionManager'),
+}
+
+# driver modules of each dialect, what an eager import used to cost at DAG parse time
+DRIVER_MODULES = {
+    'oracle': ('oracledb',),
+    'postgres': ('psycopg2', 'tantor.logs.t_logging'),
+    'mysql': ('mysql.connector',),
+    'mssql': ('pymssql',),
+    'azure_sql': ('pyodbc',),
+    'db2': ('ibm_db', 'ibm_db_dbi'),
+}
+
+
+class LazyModule:
+    """
+    this class stands for a module (or one attribute of it) that is imported on first attribute access.
+
+    The manager modules bind their driver with lazy_import, so importing a manager (e.g. from an
+    Airflow DAG file) costs nothing until that dialect connects for the first time.
+    """
+
+    def __init__(self, module_name, attribute=None) -> None:
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+
+    def _load(self):
+        if self._target is None:
+            target = importlib.import_module(self._module_name)
+            if self._attribute is not None:
+                target = getattr(target, self._attribute)
+            self._target = target
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __repr__(self):
+        state = 'loaded' if self._target is not None else 'not loaded'
+        return f"<lazy {self._module_name}{'.' + self._attribute if self._attribute else ''} ({state})>"
+
+
+def lazy_import(module_name, attribute=None):
+    """module_name (or module_name.attribute) imported on first use."""
+    return LazyModule(module_name, attribute)
+
+
+def manager_class(dialect):
+    """connection manager class of the dialect, its module is imported on the first call."""
+    if dialect not in MANAGER_CLASSES:
+        raise ValueError(f"unknown dialect {dialect}, expected one of {', '.join(MANAGER_CLASSES)}")
+    module_name, class_name = MANAGER_CLASSES[dialect]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class LazyManager:
+    """
+    this class holds the connection details of a manager and connects on the first query.
+
+    Every attribute other than dialect, connection_info and manager_class is forwarded to the real
+    manager, which is created (driver import and physical connect) on first use.
+    """
+
+    def __init__(self, dialect, connection_info) -> None:
+        self.dialect = dialect
+        self.connection_info = connection_info
+        self.manager_class = manager_class(dialect)
+        self._manager = None
+        self._lock = threading.Lock()
+
+    @property
+    def manager(self):
+        if self._manager is None:
+            with self._lock:
+                if self._manager is None:
+                    self._manager = self.manager_class(self.connection_info)
+        return self._manager
+
+    @property
+    def connected(self):
+        return self._manager is not None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.manager, name)
+
+    def connection_close(self):
+        """close (or return to the pool) the connection if one was opened."""
+        with self._lock:
+            if self._manager is not None:
+                self._manager.connection_close()
+                self._manager = None
+
+
+def get_manager(dialect, connection_info, lazy_connect=True):
+    """Connection manager of a dialect.
+
+    Parameters
+    ----------
+    dialect : str
+        oracle, postgres, mysql, mssql, azure_sql or db2.
+    connection_info : dict
+        connection details passed to the manager.
+    lazy_connect : bool
+        return a LazyManager that connects on the first query, otherwise connect now.
+
+    Returns
+    -------
+    manager : LazyManager or the *ConectionManger of the dialect
+    """
+    if lazy_connect:
+        return LazyManager(dialect, connection_info)
+    return manager_class(dialect)(connection_info)
+
+
+def _import_seconds(statement, runs):
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        if output.returncode != 0:
+            return None
+        timings.append(float(output.stdout.strip()))
+    return statistics.median(timings)
+
+
+def import_benchmark(runs=5):
+    """Median seconds to import in a fresh interpreter, the cost a DAG file pays at every parse.
+
+    Returns
+    -------
+    result : dict
+        managers (all manager modules, drivers lazy), and per dialect the eager import of its
+        driver modules, None when the driver is not installed.
+    """
+    modules = ', '.join(module for module, _ in MANAGER_CLASSES.values())
+    result = {'managers': _import_seconds(f"import {modules}", runs)}
+    for dialect, driver_modules in DRIVER_MODULES.items():
+        result[dialect] = _import_seconds(f"import {', '.join(driver_modules)}", runs)
+    return result
+
+
+if __name__ == '__main__':
+    for name, seconds in import_benchmark().items():
+        print(f"{name:<10} {'not installed' if seconds is None else f'{seconds * 1000:.1f} ms'}")
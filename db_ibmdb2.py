@@ -1,315 +1,590 @@
-import socket
-import ibm_db
-
-
-class Db2ConnectionManager():
-    """A simple class that manages a Db2 server or database connection."""
-    def __init__(self,connection_info):
-        """Initialize Db2 server or database name, user ID, and password attributes."""
-
-        self.ds_type = connection_info.get('dsType', 'DB')
-        self.host_address=connection_info.get('host_address','')
-        self.port_number=connection_info.get('port_number',50000)
-        self.database_name=connection_info.get('database_name','')
-        self.schema_name=connection_info.get('schema_name','')
-        self.username=connection_info.get('username','')
-        self.password=connection_info.get('password','')
-        self.source_schema=connection_info.get('source_schema','')
-        err, self.connection = self.create_connection()
-        if self.connection is None :
-             raise Exception(err)
-        
-    def create_connection(self):
-        """Attempt to establish a Db2 server or database connection."""
-        # Define And Initialize The Appropriate Local Variables
-        conn_string = "DRIVER={IBM DB2 ODBC DRIVER}"
-        connectionID=None
-        msg_string=''
-        conn_string += ";DATABASE=" + self.database_name  # Only Used To Connect To A Database
-        conn_string += ";HOSTNAME=" + str(self.host_address)  # Only Used To Connect To A Server
-        conn_string += ";PORT=" + str(self.port_number)  # Only Used To Connect To A Server
-        conn_string += ";PROTOCOL=TCPIP"
-        conn_string += ";UID=" + self.username
-        conn_string += ";PWD=" + self.password
-        print(conn_string)
-        try:
-            connectionID = ibm_db.connect(conn_string, self.username, self.password)
-        except Exception:
-            pass
-        if connectionID is None:
-            msg_string = ibm_db.conn_errormsg()
-        return msg_string, connectionID
-    
-
-    def connection_close(self):
-        """Attempt to close a Db2 server or database connection."""
-        msg_string = ""
-        return_code = True
-        if self.connection is not None:
-            try:
-                return_code = ibm_db.close(self.connection)
-            except Exception:
-                pass
-            if return_code is False:
-                msg_string = ibm_db.conn_errormsg(self.connection)
-                return_code = False
-            else:
-                return_code = True
-        return return_code, msg_string
-
-
-    def metadata_details(self, table_name=None):
-        meta_data_Details=[]
-        if table_name is None:
-            sql_table = f"SELECT TABNAME AS table_name FROM SYSCAT.TABLES WHERE TABSCHEMA='{self.username.upper()}'"
-            print(sql_table)
-            
-            res_table=ibm_db.exec_immediate(self.connection, sql_table)
-            result = ibm_db.fetch_both(res_table)
-            while result:
-                temp={'table_schema': self.username.lower(),
-                      'table_name': result['TABLE_NAME'], 
-                      'column_detail':self.fetch_table_details( result['TABLE_NAME']),
-                      'constraint_details':{},
-                      'index_details':{},
-                      'partition_json':self.fetch_partition_details(result['TABLE_NAME'])
-                }
-                meta_data_Details.append(temp)
-                result= ibm_db.fetch_both(res_table)            
-        else:
-            temp={'table_schema': self.username.lower(),
-                  'table_name': table_name, 
-                  'column_detail':self.fetch_table_details(table_name),
-                  'constraint_details':{},
-                  'index_details':{}, 
-                  'partition_json':self.fetch_partition_details(table_name)
-                  }
-            meta_data_Details.append(temp)
-        return meta_data_Details
-
-    def fetch_table_details(self, table_name):
-        temp_col = []
-        sql_col_detail=f''' SELECT 
-                                col.COLNAME AS column_name, 
-                                dt.TYPENAME AS data_type,
-                                col.LENGTH AS data_length,
-                                dt.LENGTH AS DATA_PRECISION, 
-                                col.SCALE AS DATA_SCALE 
-                            FROM SYSCAT.COLUMNS AS col 
-                            JOIN SYSCAT.DATATYPES AS dt 
-                            ON col.TYPENAME = dt.TYPENAME  
-                            WHERE col.TABNAME = '{table_name}' '''
-        res_table_col_det=ibm_db.exec_immediate(self.connection, sql_col_detail)
-        result2 = ibm_db.fetch_both(res_table_col_det)
-        while result2:
-            temp_col.append({"column_name":result2['COLUMN_NAME'],
-                             "DATA_TYPE":result2['DATA_TYPE'],
-                             "DATA_LENGTH":result2['DATA_LENGTH'],
-                             "DATA_PRECISION":result2['DATA_PRECISION'],
-                             "DATA_SCALE":result2['DATA_SCALE']})
-            result2 = ibm_db.fetch_both(res_table_col_det)
-        return temp_col
-    
-    def fetch_partition_details(self, table_name):
-        temp_col = []
-        sql_part_details = f'''
-                    SELECT
-                        dp.DATAPARTITIONNAME AS partiton_name,
-                        dp.DATAPARTITIONID,
-                        dp.LOWVALUE AS min_value,
-                        dp.HIGHVALUE AS max_value,
-                        dpe.DATAPARTITIONEXPRESSION AS column_name
-                    FROM
-                        SYSCAT.DATAPARTITIONS dp
-                    JOIN
-                        SYSCAT.DATAPARTITIONEXPRESSION dpe
-                    ON
-                        dp.TABSCHEMA = dpe.TABSCHEMA
-                        AND dp.TABNAME = dpe.TABNAME
-                    WHERE
-                        dp.TABNAME = '{table_name}'
-                        AND dp.TABSCHEMA = '{self.username.upper()}'
-        '''
-        stmt = ibm_db.exec_immediate(self.connection, sql_part_details)
-        temp_col = []
-        result = ibm_db.fetch_both(stmt)
-        while result:
-            temp_col.append({
-                "partition_name": result[0],
-                "partition_id": result[1],
-                "min_value": result[2],
-                "max_value": result[3],
-                "column_name": result[4],
-	            "table_name": table_name,
-                "partition_type": "RANGE",
-                "selected":False,
-                "dropped":False
-            })
-            result = ibm_db.fetch_both(stmt)
-        return temp_col
-    
-    
-    def table_count_db2(self, table_name):
-    
-        new_sql = f"select /*+ parallel(16)*/ count(1) from {table_name}"
-        try:
-            prepare_statement = ibm_db.prepare(self.connection, new_sql)
-        except Exception:
-            pass
-        if prepare_statement is False:
-            print("\nERROR: Unable to prepare the SQL statement specified.")
-            return False,0
-        else:
-            print("Executing the prepared SQL statement ... ", end="")
-            try:
-                return_code = ibm_db.execute(prepare_statement)
-            except Exception:
-                pass
-            if return_code is False:
-                print("\nERROR: Unable to execute the SQL statement specified.")
-                return False, 0
-            else:
-                try:
-                    dataRecord = ibm_db.fetch_tuple(prepare_statement)
-                except:
-                    pass
-                if dataRecord is False:
-                    return False, 0
-                else:
-                    return True, dataRecord[0]
-     
-     
-    def find_table(self, table_name):
-        sql_query = f"SELECT COUNT(1) FROM SYSCAT.TABLES WHERE TABNAME = '{table_name}' AND TABSCHEMA = '{self.username.upper()}'"
-        table_count = 0
-        try:
-            prepare_statement = ibm_db.prepare(self.connection, sql_query)
-            return_code = ibm_db.execute(prepare_statement)
-            if not return_code:
-                print("\nERROR: Unable to execute the SQL statement specified.")
-                return None
-            
-            dataRecord = ibm_db.fetch_tuple(prepare_statement)
-            if dataRecord is not False:
-                table_count = dataRecord[0]
-        except Exception as e:
-            print(f"Error in create table: {e}")
-            print("Exception details:", e.__class__.__name__, str(e))
-        return table_count == 0
-
-    
-    def calculate_checksum(self, sql_query):
-        result = []
-        print("---------------------Sql Query:", sql_query)        
-        try:
-            stmt = ibm_db.prepare(self.connection, sql_query)
-            return_code = ibm_db.execute(stmt)
-            if return_code:
-                row = ibm_db.fetch_assoc(stmt)
-                while row:
-                    result.append(row['SHA1_HASH'])  
-                    row = ibm_db.fetch_assoc(stmt)
-            else:
-                print("Error executing the query")
-        
-        except Exception as e:
-            print(f"An error occurred: {e}")
-        
-        return result
-    
-
-    def create_table(self, sql_query, table_create=False):
-        result = None
-        print("Connection object:", self.connection)
-        print(sql_query)
-        try:
-            if isinstance(sql_query, str):
-                prepare_statement = ibm_db.prepare(self.connection, sql_query)
-                return_code = ibm_db.execute(prepare_statement)
-                if not return_code:
-                    print("\nERROR: Unable to execute the SQL statement specified.")
-                    return None
-                if not table_create:
-                    dataRecord = ibm_db.fetch_tuple(prepare_statement)
-                    if dataRecord:
-                        result = dataRecord[0]
-
-            elif isinstance(sql_query, list):
-                for query in sql_query:
-                    try:
-                        prepare_statement = ibm_db.prepare(self.connection, query)
-                        return_code = ibm_db.execute(prepare_statement)
-                        if not return_code:
-                            print(f"\nERROR: Unable to execute the SQL statement specified for query: {query.strip()}")
-                        print(f"Executed: {query.strip()}")
-                    except Exception as e:
-                        print(f"An error occurred while executing: {query.strip()}")
-                        print(f"Error: {e}")
-            return result
-
-        except Exception as e:
-            print(f"Error in create table: {e}")
-            print("Exception details:", e.__class__.__name__, str(e))
-            return result
-
-    def delete_table(self, sql_query):
-        result = None
-        print("Connection object:", self.connection)  
-        print(sql_query)
-        try:
-            prepare_statement = ibm_db.prepare(self.connection, sql_query)
-            return_code = ibm_db.execute(prepare_statement)
-            if not return_code:
-                print("\nERROR: Unable to execute the SQL statement specified.")
-                return None
-        except Exception as e:
-            print(f"Error in create table: {e}")
-            print("Exception details:", e.__class__.__name__, str(e))
-        return result
-    
-
-    def table_space(self, table_name):
-        """
-        
-        """
-        sql_query = f"""
-                    SELECT (DATA_OBJECT_P_SIZE + INDEX_OBJECT_P_SIZE + LONG_OBJECT_P_SIZE + LOB_OBJECT_P_SIZE + XML_OBJECT_P_SIZE) AS TOTAL_SIZE_IN_KB 
-                    FROM SYSIBMADM.ADMINTABINFO 
-                    WHERE tabname='{table_name}';
-                    """
-        table_space = 0
-        try:
-            prepare_statement = ibm_db.prepare(self.connection, sql_query)
-            return_code = ibm_db.execute(prepare_statement)
-            if not return_code:
-                print("\nERROR: Unable to execute the SQL statement specified.")
-                return None
-            
-            dataRecord = ibm_db.fetch_tuple(prepare_statement)
-            if dataRecord is not False:
-                table_space = dataRecord[0]
-        except Exception as e:
-            print(f"Error in create table: {e}")
-            print("Exception details:", e.__class__.__name__, str(e))
-        return table_space 
-
-    def find_min_max_value(self, table_name, column_name):
-        sql_query=f'SELECT min({column_name}) AS min_value, max({column_name}) AS max_value FROM {table_name}'
-        result={}
-        try:
-            prepare_statement = ibm_db.prepare(self.connection, sql_query)
-            return_code = ibm_db.execute(prepare_statement)
-            if not return_code:
-                print("\nERROR: Unable to execute the SQL statement specified.")
-            else:    
-                dataRecord = ibm_db.fetch_tuple(prepare_statement)
-                if dataRecord is not False:
-                    table_space = dataRecord[0]
-                    for each in table_space:
-                        temp = ['null' if e is None else e for e in each ]
-                        result={"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
-
-        except Exception as e:
-            print(f"Error in create table: {e}")
-            print("Exception details:", e.__class__.__name__, str(e))
-        return result
\ No newline at end of file
+import socket
+from db_arrow import cursor_to_arrow
+from db_factory import lazy_import
+from db_metadata import compact_record
+from db_profile import profile_table
+from db_pool import pool_registry, run_with_pool
+from db_queries import bind_query, query_registry, update_table_index
+from db_stats import checksum_stream, count_estimate, split_table_name, table_min_max, add_segment_size, table_spaces_result
+
+ibm_db = lazy_import('ibm_db')
+ibm_db_dbi = lazy_import('ibm_db_dbi')
+
+
+# rows per fetchmany of read_rows, large enough to amortize the round trip of SYSCAT and data queries
+DB2_BLOCK_SIZE = 1000
+
+
+class Db2ConnectionManager():
+    """A simple class that manages a Db2 server or database connection."""
+
+    dialect = 'db2'
+
+    def __init__(self,connection_info):
+        """Initialize Db2 server or database name, user ID, and password attributes."""
+
+        self.ds_type = connection_info.get('dsType', 'DB')
+        self.host_address=connection_info.get('host_address','')
+        self.port_number=connection_info.get('port_number',50000)
+        self.database_name=connection_info.get('database_name','')
+        self.schema_name=connection_info.get('schema_name','')
+        self.username=connection_info.get('username','')
+        self.password=connection_info.get('password','')
+        self.source_schema=connection_info.get('source_schema','')
+        self.connection_info = connection_info
+        self._dbi_connection = None
+        self._table_index = None
+        self.use_pool = connection_info.get('use_pool', False)
+        if self.use_pool:
+            self.pool = pool_registry.get_pool(self.__class__.__name__, connection_info, self.create_connection,
+                                               close_connection=ibm_db.close, reset_connection=ibm_db.rollback)
+            err, self.connection = self.pool.acquire()
+        else:
+            err, self.connection = self.create_connection()
+        if self.connection is None :
+             raise Exception(err)
+        
+    def create_connection(self):
+        """Attempt to establish a Db2 server or database connection."""
+        # Define And Initialize The Appropriate Local Variables
+        conn_string = "DRIVER={IBM DB2 ODBC DRIVER}"
+        connectionID=None
+        msg_string=''
+        conn_string += ";DATABASE=" + self.database_name  # Only Used To Connect To A Database
+        conn_string += ";HOSTNAME=" + str(self.host_address)  # Only Used To Connect To A Server
+        conn_string += ";PORT=" + str(self.port_number)  # Only Used To Connect To A Server
+        conn_string += ";PROTOCOL=TCPIP"
+        conn_string += ";UID=" + self.username
+        conn_string += ";PWD=" + self.password
+        print(conn_string)
+        try:
+            # plain connect in pooled mode too: ibm_db.close does not close a pconnect connection,
+            # so the pool could never discard or evict one
+            connectionID = ibm_db.connect(conn_string, self.username, self.password)
+        except Exception:
+            pass
+        if connectionID is None:
+            msg_string = ibm_db.conn_errormsg()
+        return msg_string, connectionID
+    
+
+    def connection_pool(self):
+        """pool used for parallel work, the registry pool of this connection even when use_pool is off."""
+        if self.use_pool:
+            return self.pool
+        return pool_registry.get_pool(self.__class__.__name__, self.connection_info, self.create_connection,
+                                       close_connection=ibm_db.close, reset_connection=ibm_db.rollback)
+
+    def connection_close(self):
+        """Attempt to close a Db2 server or database connection."""
+        msg_string = ""
+        return_code = True
+        if self.connection is not None and self.use_pool:
+            self.pool.release(self.connection)
+        elif self.connection is not None:
+            try:
+                return_code = ibm_db.close(self.connection)
+            except Exception:
+                pass
+            if return_code is False:
+                msg_string = ibm_db.conn_errormsg(self.connection)
+                return_code = False
+            else:
+                return_code = True
+        self.connection = None
+        self._dbi_connection = None
+        return return_code, msg_string
+
+
+    def metadata_details(self, table_name=None, compact=False):
+        meta_data_Details=[]
+        if table_name is None:
+            sql_table = f"SELECT TABNAME AS table_name FROM SYSCAT.TABLES WHERE TABSCHEMA='{self.username.upper()}'"
+            print(sql_table)
+            
+            for result in list(self.read_rows(sql_table)):
+                temp={'table_schema': self.username.lower(),
+                      'table_name': result[0], 
+                      'column_detail':self.fetch_table_details(result[0]),
+                      'constraint_details':{},
+                      'index_details':{},
+                      'partition_json':self.fetch_partition_details(result[0])
+                }
+                meta_data_Details.append(compact_record(temp) if compact else temp)
+        else:
+            temp={'table_schema': self.username.lower(),
+                  'table_name': table_name, 
+                  'column_detail':self.fetch_table_details(table_name),
+                  'constraint_details':{},
+                  'index_details':{}, 
+                  'partition_json':self.fetch_partition_details(table_name)
+                  }
+            meta_data_Details.append(compact_record(temp) if compact else temp)
+        return meta_data_Details
+
+    def ddl_markers(self):
+        """table name -> DDL change marker (SYSCAT.TABLES.ALTER_TIME), one catalog query for the whole schema."""
+        sql = "SELECT TABNAME, ALTER_TIME FROM SYSCAT.TABLES WHERE TABSCHEMA = $schema"
+        return {name: str(marker) for name, marker in self.execute_bound(sql, {'schema': self.username.upper()})}
+
+    def execute_bound(self, sql_query, values=None):
+        """Runs a select written with $name markers, the values are sent as bind variables.
+
+        The rows are fetched in blocks through read_rows. The plan of the statement text is
+        reused by the dynamic statement cache of the server, so no statement is kept prepared here.
+
+        Parameters
+        ----------
+        sql_query : str
+            select with $name (or '$name') where a value goes, table and column names can not be bound.
+        values : dict
+            value of every marker.
+
+        Returns
+        -------
+        rows : list
+            tuples of the result.
+        """
+        sql_query, params = bind_query(sql_query, self.dialect, values or {})
+        return list(self.read_rows(sql_query, params=params))
+
+    def catalog_rows(self, query_name, **values):
+        """rows of a catalog query of the registry, values are sent as bind variables."""
+        return self.execute_bound(query_registry.template(self.dialect, query_name), values)
+
+    def fetch_table_details(self, table_name):
+        temp_col = []
+        for result2 in self.catalog_rows('table_columns', table_name=table_name):
+            temp_col.append({"column_name":result2[0],
+                             "DATA_TYPE":result2[1],
+                             "DATA_LENGTH":result2[2],
+                             "DATA_PRECISION":result2[3],
+                             "DATA_SCALE":result2[4]})
+        return temp_col
+    
+    def fetch_partition_details(self, table_name):
+        temp_col = []
+        for result in self.catalog_rows('partitions', table_name=table_name, owner=self.username.upper()):
+            temp_col.append({
+                "partition_name": result[0],
+                "partition_id": result[1],
+                "min_value": result[2],
+                "max_value": result[3],
+                "column_name": result[4],
+	            "table_name": table_name,
+                "partition_type": "RANGE",
+                "selected":False,
+                "dropped":False
+            })
+        return temp_col
+    
+    
+    def table_count_db2(self, table_name, estimate=False, max_stats_age_days=7):
+        if estimate:
+            result = self.table_count_estimate(table_name, max_stats_age_days)
+            return result['row_count'] is not None, result['row_count'] or 0
+
+        new_sql = f"select /*+ parallel(16)*/ count(1) from {table_name}"
+        try:
+            prepare_statement = ibm_db.prepare(self.connection, new_sql)
+        except Exception:
+            pass
+        if prepare_statement is False:
+            print("\nERROR: Unable to prepare the SQL statement specified.")
+            return False,0
+        else:
+            print("Executing the prepared SQL statement ... ", end="")
+            try:
+                return_code = ibm_db.execute(prepare_statement)
+            except Exception:
+                pass
+            if return_code is False:
+                print("\nERROR: Unable to execute the SQL statement specified.")
+                return False, 0
+            else:
+                try:
+                    dataRecord = ibm_db.fetch_tuple(prepare_statement)
+                except:
+                    pass
+                if dataRecord is False:
+                    return False, 0
+                else:
+                    return True, dataRecord[0]
+     
+     
+    def table_count_by_partition(self, table_name, max_workers=4):
+        """Counts the rows of a partitioned table with one count per data partition run in parallel.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table, optionally prefixed by the schema.
+        max_workers : int
+            number of partitions counted at the same time, each on its own pooled connection.
+
+        Returns
+        -------
+        result : dict
+            row_count (sum of all partitions) and partitions (partition name -> count),
+            partitions is empty when the table is not partitioned.
+        """
+        slices = self.partition_slices(table_name)
+        if not slices:
+            status, records_count = self.table_count_db2(table_name)
+            return {'row_count': records_count if status else None, 'partitions': {}}
+
+        def count_partition(connection, partition_name):
+            from_clause, where_clause = slices[partition_name]
+            stmt = ibm_db.exec_immediate(connection, f"SELECT COUNT(1) FROM {from_clause} WHERE {where_clause}")
+            return ibm_db.fetch_tuple(stmt)[0]
+
+        partitions = run_with_pool(self.connection_pool(), count_partition, list(slices), max_workers)
+        return {'row_count': sum(partitions.values()), 'partitions': partitions}
+
+    def partition_slices(self, table_name):
+        """Splits a partitioned table into one slice per data partition with DATAPARTITIONNUM.
+
+        Returns
+        -------
+        slices : dict
+            partition name -> (from clause, where clause), empty when the table is not partitioned.
+        """
+        schema, name = split_table_name(table_name, self.username)
+        # DATAPARTITIONNUM returns SEQNO, which fetch_partition_details does not carry
+        sql_query = f'''SELECT dp.DATAPARTITIONNAME, dp.SEQNO, dpe.DATAPARTITIONEXPRESSION
+                        FROM SYSCAT.DATAPARTITIONS dp
+                        JOIN SYSCAT.DATAPARTITIONEXPRESSION dpe
+                        ON dp.TABSCHEMA = dpe.TABSCHEMA AND dp.TABNAME = dpe.TABNAME AND dpe.DATAPARTITIONKEYSEQ = 1
+                        WHERE dp.TABSCHEMA = '{schema.upper()}' AND dp.TABNAME = '{name.upper()}'
+                        ORDER BY dp.SEQNO'''
+        return {each[0]: (table_name, f"DATAPARTITIONNUM({each[2]}) = {each[1]}") for each in self.read_rows(sql_query)}
+
+    def table_count_estimate(self, table_name, max_stats_age_days=7):
+        """Returns the row count of the table from the RUNSTATS statistics (SYSCAT.TABLES.CARD).
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table, optionally prefixed by the schema.
+        max_stats_age_days : float
+            statistics older than this (STATS_TIME), or CARD = -1, fall back to an exact count.
+
+        Returns
+        -------
+        result : dict
+            row_count, estimated (False when count(1) was used), last_analyzed, stats_age_days, stale.
+        """
+        schema, name = split_table_name(table_name, self.username)
+        sql_query = f"SELECT CARD, STATS_TIME FROM SYSCAT.TABLES WHERE TABSCHEMA = '{schema.upper()}' AND TABNAME = '{name.upper()}'"
+        dataRecord = False
+        try:
+            stmt = ibm_db.exec_immediate(self.connection, sql_query)
+            dataRecord = ibm_db.fetch_tuple(stmt)
+        except Exception as e:
+            print(f"Error in table count estimate: {e}")
+        if dataRecord is False:
+            result = count_estimate(None, None, max_stats_age_days)
+        else:
+            result = count_estimate(dataRecord[0], dataRecord[1], max_stats_age_days)
+        if result['stale']:
+            status, records_count = self.table_count_db2(table_name)
+            result['row_count'] = records_count if status else None
+            result['estimated'] = False
+        return result
+
+    def find_table(self, table_name):
+        sql_query = "SELECT COUNT(1) FROM SYSCAT.TABLES WHERE TABNAME = $table_name AND TABSCHEMA = $schema"
+        table_count = 0
+        try:
+            rows = self.execute_bound(sql_query, {'table_name': table_name, 'schema': self.username.upper()})
+            if rows:
+                table_count = rows[0][0]
+        except Exception as e:
+            print(f"Error in create table: {e}")
+            print("Exception details:", e.__class__.__name__, str(e))
+        return table_count == 0
+
+    
+    def table_names(self, refresh=False):
+        """Names of the tables of the user schema in SYSCAT.TABLES, where find_table looks.
+
+        Read with one query on first use (or refresh=True), then kept up to date by create_table and
+        delete_table of this manager.
+        """
+        if self._table_index is None or refresh:
+            sql = "SELECT TABNAME FROM SYSCAT.TABLES WHERE TABSCHEMA = $schema"
+            self._table_index = {row[0] for row in self.execute_bound(sql, {'schema': self.username.upper()})}
+        return self._table_index
+
+    def find_tables(self, names, refresh=False):
+        """Checks the existence of any number of tables with at most one catalog query.
+
+        Parameters
+        ----------
+        names : list
+            table names.
+        refresh : bool
+            read the catalog again instead of the names known to this manager.
+
+        Returns
+        -------
+        result : dict
+            table name -> True when the table exists (unlike find_table, which returns True when it is missing).
+        """
+        table_index = self.table_names(refresh)
+        return {name: name in table_index for name in names}
+
+    def calculate_checksum(self, sql_query):
+        result = []
+        print("---------------------Sql Query:", sql_query)        
+        try:
+            columns = []
+            for row in self.read_rows(sql_query, columns=columns):
+                result.append(row[columns.index('SHA1_HASH')])
+        except Exception as e:
+            print(f"An error occurred: {e}")
+        
+        return result
+    
+
+    def iter_checksum(self, sql_query, block_size=DB2_BLOCK_SIZE):
+        """Yields the row hashes of the checksum query one by one instead of building a list.
+
+        Parameters
+        ----------
+        sql_query : str
+            checksum query, the hash is the SHA1_HASH column (the first column when there is none).
+        block_size : int
+            rows fetched per block, see read_rows.
+        """
+        print("---------------------Sql Query:", sql_query)
+        columns = []
+        hash_index = None
+        for row in self.read_rows(sql_query, block_size, columns):
+            if hash_index is None:
+                hash_index = columns.index('SHA1_HASH') if 'SHA1_HASH' in columns else 0
+            yield row[hash_index]
+
+    def calculate_checksum_stream(self, sql_query):
+        """Folds the row hashes of the checksum query into one running sha256, see db_stats.checksum_stream."""
+        return checksum_stream(self.iter_checksum(sql_query))
+
+    def create_table(self, sql_query, table_create=False):
+        result = None
+        print("Connection object:", self.connection)
+        print(sql_query)
+        try:
+            if isinstance(sql_query, str):
+                prepare_statement = ibm_db.prepare(self.connection, sql_query)
+                return_code = ibm_db.execute(prepare_statement)
+                if not return_code:
+                    print("\nERROR: Unable to execute the SQL statement specified.")
+                    return None
+                self._table_index = update_table_index(self._table_index, sql_query, fold=str.upper,
+                                                       schema=self.username.upper())
+                if not table_create:
+                    dataRecord = ibm_db.fetch_tuple(prepare_statement)
+                    if dataRecord:
+                        result = dataRecord[0]
+
+            elif isinstance(sql_query, list):
+                for query in sql_query:
+                    try:
+                        prepare_statement = ibm_db.prepare(self.connection, query)
+                        return_code = ibm_db.execute(prepare_statement)
+                        if not return_code:
+                            print(f"\nERROR: Unable to execute the SQL statement specified for query: {query.strip()}")
+                        else:
+                            self._table_index = update_table_index(self._table_index, query, fold=str.upper,
+                                                                   schema=self.username.upper())
+                        print(f"Executed: {query.strip()}")
+                    except Exception as e:
+                        print(f"An error occurred while executing: {query.strip()}")
+                        print(f"Error: {e}")
+            return result
+
+        except Exception as e:
+            print(f"Error in create table: {e}")
+            print("Exception details:", e.__class__.__name__, str(e))
+            return result
+
+    def delete_table(self, sql_query):
+        result = None
+        print("Connection object:", self.connection)  
+        print(sql_query)
+        try:
+            prepare_statement = ibm_db.prepare(self.connection, sql_query)
+            return_code = ibm_db.execute(prepare_statement)
+            if not return_code:
+                print("\nERROR: Unable to execute the SQL statement specified.")
+                return None
+            self._table_index = update_table_index(self._table_index, sql_query, fold=str.upper,
+                                                   schema=self.username.upper())
+        except Exception as e:
+            print(f"Error in create table: {e}")
+            print("Exception details:", e.__class__.__name__, str(e))
+        return result
+    
+
+    def table_space(self, table_name):
+        """
+        
+        """
+        sql_query = """
+                    SELECT (DATA_OBJECT_P_SIZE + INDEX_OBJECT_P_SIZE + LONG_OBJECT_P_SIZE + LOB_OBJECT_P_SIZE + XML_OBJECT_P_SIZE) AS TOTAL_SIZE_IN_KB 
+                    FROM SYSIBMADM.ADMINTABINFO 
+                    WHERE tabname = $table_name
+                    """
+        table_space = 0
+        try:
+            rows = self.execute_bound(sql_query, {'table_name': table_name})
+            if rows:
+                table_space = rows[0][0]
+        except Exception as e:
+            print(f"Error in create table: {e}")
+            print("Exception details:", e.__class__.__name__, str(e))
+        return table_space 
+
+    def table_spaces(self):
+        """Size in bytes of every table of the schema from one SYSIBMADM.ADMINTABINFO query.
+
+        ADMINTABINFO reports KB per data partition (and per member), the rows are summed per
+        partition and named from SYSCAT.DATAPARTITIONS.
+
+        Returns
+        -------
+        result : dict
+            table name -> table_bytes (data, long and XML objects), index_bytes, lob_bytes, total_bytes
+            and partitions (partition name -> bytes, empty when the table is not partitioned).
+        """
+        sql = """SELECT a.TABNAME, COALESCE(d.DATAPARTITIONNAME, TRIM(CHAR(a.DATA_PARTITION_ID))),
+                        SUM(a.DATA_OBJECT_P_SIZE + a.LONG_OBJECT_P_SIZE + a.XML_OBJECT_P_SIZE) * 1024,
+                        SUM(a.INDEX_OBJECT_P_SIZE) * 1024,
+                        SUM(a.LOB_OBJECT_P_SIZE) * 1024
+                 FROM SYSIBMADM.ADMINTABINFO a
+                 LEFT JOIN SYSCAT.DATAPARTITIONS d
+                   ON d.TABSCHEMA = a.TABSCHEMA AND d.TABNAME = a.TABNAME
+                  AND d.DATAPARTITIONID = a.DATA_PARTITION_ID
+                 WHERE a.TABSCHEMA = $schema AND a.TABTYPE = 'T'
+                 GROUP BY a.TABNAME, COALESCE(d.DATAPARTITIONNAME, TRIM(CHAR(a.DATA_PARTITION_ID)))"""
+        spaces = {}
+        for table_name, partition_name, table_bytes, index_bytes, lob_bytes in self.execute_bound(
+                sql, {'schema': self.username.upper()}):
+            add_segment_size(spaces, table_name, 'table', table_bytes, partition_name)
+            add_segment_size(spaces, table_name, 'index', index_bytes, partition_name)
+            add_segment_size(spaces, table_name, 'lob', lob_bytes, partition_name)
+        return table_spaces_result(spaces)
+
+    def find_min_max_value(self, table_name, column_name):
+        sql_query=f'SELECT min({column_name}) AS min_value, max({column_name}) AS max_value FROM {table_name}'
+        result={}
+        try:
+            prepare_statement = ibm_db.prepare(self.connection, sql_query)
+            return_code = ibm_db.execute(prepare_statement)
+            if not return_code:
+                print("\nERROR: Unable to execute the SQL statement specified.")
+            else:    
+                dataRecord = ibm_db.fetch_tuple(prepare_statement)
+                if dataRecord is not False:
+                    table_space = dataRecord[0]
+                    for each in table_space:
+                        temp = ['null' if e is None else e for e in each ]
+                        result={"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
+
+        except Exception as e:
+            print(f"Error in create table: {e}")
+            print("Exception details:", e.__class__.__name__, str(e))
+        return result
+
+    def find_min_max_values(self, table_name, columns=None):
+        """min and max of several columns with a single scan of the table, see db_stats.table_min_max."""
+        return table_min_max(self, table_name, columns)
+
+    def dbi_connection(self):
+        """DB-API wrapper (ibm_db_dbi) around the ibm_db connection of the manager, used by read_rows."""
+        if self._dbi_connection is None:
+            self._dbi_connection = ibm_db_dbi.Connection(self.connection)
+        return self._dbi_connection
+
+    def read_rows(self, sql_query, block_size=DB2_BLOCK_SIZE, columns=None, params=None):
+        """Runs a select and yields its rows as plain tuples, fetched block_size rows at a time.
+
+        Parameters
+        ----------
+        sql_query : str
+            select to run.
+        block_size : int
+            rows per fetchmany call (cursor arraysize).
+        columns : list
+            when given it is filled with the column names of the result before the first row is yielded.
+        params : tuple
+            values of the ? parameter markers of sql_query.
+        """
+        cursor = self.dbi_connection().cursor()
+        try:
+            cursor.arraysize = block_size
+            cursor.execute(sql_query, params)
+            if columns is not None:
+                columns.extend(each[0].upper() for each in cursor.description or [])
+            while True:
+                rows = cursor.fetchmany(block_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield tuple(row)
+        finally:
+            cursor.close()
+
+    def fetch_rows(self, sql_query):
+        """run a select and return all rows as tuples."""
+        return list(self.read_rows(sql_query))
+
+    def iter_rows(self, sql_query, batch_size=10000):
+        """run a select and yield its rows, fetched batch_size rows per block, see read_rows."""
+        return self.read_rows(sql_query, batch_size)
+
+    def query_arrow(self, sql_query, batch_size=DB2_BLOCK_SIZE):
+        """Runs a select and returns its result as a pyarrow.Table built column wise block by block."""
+        cursor = self.dbi_connection().cursor()
+        try:
+            cursor.arraysize = batch_size
+            cursor.execute(sql_query)
+            return cursor_to_arrow(cursor, batch_size)
+        finally:
+            cursor.close()
+
+    def profile_columns(self, table_name, columns=None, sample_percent=None):
+        """Profiles null counts, distinct counts and value lengths of the columns, see db_profile.profile_table.
+
+        Returns
+        -------
+        result : dict
+            column name -> ColumnProfile
+        """
+        return profile_table(self, table_name, columns, sample_percent)
+
+    def bulk_insert(self, table_name, columns, rows):
+        """Inserts the rows into the table with an array insert (execute_many), the batch is committed once.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the target table.
+        columns : list
+            column names, in the order of the values of each row.
+        rows : list
+            rows as tuples.
+
+        Returns
+        -------
+        result : int
+            number of rows inserted.
+        """
+        placeholders = ', '.join(['?'] * len(columns))
+        sql_query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        stmt = ibm_db.prepare(self.connection, sql_query)
+        result = ibm_db.execute_many(stmt, tuple(tuple(row) for row in rows))
+        if result is False:
+            raise Exception(ibm_db.stmt_errormsg(stmt))
+        ibm_db.commit(self.connection)
+        return len(rows)
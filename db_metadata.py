@@ -0,0 +1,205 @@
+import json
+import keyword
+import os
+import sys
+
+from db_pool import connection_fingerprint
+
+
+# strings longer than this (default values, search conditions, high values) are rarely repeated
+INTERN_MAX_LENGTH = 128
+
+_record_types = {}
+
+
+class MetadataRecord:
+    """
+    base of the compact metadata descriptors.
+
+    A descriptor holds the values of one metadata dict in __slots__, its keys live once on the
+    class, and reads like the dict it replaces (record['column_name'], record.get(...)).
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        if isinstance(other, MetadataRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return make_record, (self.__slots__, tuple(self.values()))
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self):
+        return list(self.__slots__)
+
+    def values(self):
+        return [getattr(self, name) for name in self.__slots__]
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.__slots__]
+
+    def to_dict(self):
+        """plain dict (nested descriptors included) for json and the existing consumers."""
+        return {name: to_plain(getattr(self, name)) for name in self.__slots__}
+
+
+def record_type(keys):
+    """__slots__ descriptor class for the given dict keys, one class per key tuple, None if a key can not be a slot."""
+    keys = tuple(keys)
+    if keys not in _record_types:
+        if all(isinstance(key, str) and key.isidentifier() and not keyword.iskeyword(key)
+               and not key.startswith('__') for key in keys):
+            _record_types[keys] = type('MetadataRecord', (MetadataRecord,), {'__slots__': keys})
+        else:
+            _record_types[keys] = None
+    return _record_types[keys]
+
+
+def make_record(keys, values):
+    record = record_type(keys).__new__(record_type(keys))
+    for key, value in zip(keys, values):
+        setattr(record, key, value)
+    return record
+
+
+def compact_value(value):
+    """interned string / descriptor / list of descriptors in place of a metadata value."""
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= INTERN_MAX_LENGTH else value
+    if isinstance(value, dict):
+        return compact_record(value)
+    if isinstance(value, list):
+        return [compact_value(each) for each in value]
+    return value
+
+
+def compact_record(details):
+    """Compact descriptor of a metadata dict (a table of metadata_details, a column, a partition...).
+
+    Dicts whose keys can not be slots are kept as dicts with compacted values.
+    """
+    record_class = record_type(details.keys())
+    if record_class is None:
+        return {key: compact_value(value) for key, value in details.items()}
+    record = record_class.__new__(record_class)
+    for key, value in details.items():
+        setattr(record, key, compact_value(value))
+    return record
+
+
+def to_plain(value):
+    """the metadata value with every descriptor turned back into a dict."""
+    if isinstance(value, MetadataRecord):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: to_plain(each) for key, each in value.items()}
+    if isinstance(value, list):
+        return [to_plain(each) for each in value]
+    return value
+
+
+class MetadataCache:
+    """
+    this class keeps the metadata_details of a connection on disk between runs.
+
+    One catalog query (ddl_markers of the manager) gives a DDL change marker per table; a cached
+    table is reused while its marker is unchanged, only new or altered tables are fetched again
+    and dropped tables are forgotten. One json file per connection / schema in cache_dir.
+    """
+
+    def __init__(self, manager, cache_dir, bulk_fraction=0.2) -> None:
+        """
+        when more than bulk_fraction of the tables are new or changed (or the cache is empty) the whole
+        schema is fetched with one metadata_details(None) call instead of one call per table.
+        """
+        self.manager = manager
+        self.cache_dir = cache_dir
+        self.bulk_fraction = bulk_fraction
+        fingerprint = connection_fingerprint(manager.dialect, manager.connection_info)
+        self.cache_path = os.path.join(cache_dir, f"metadata_{manager.dialect}_{fingerprint[:16]}.json")
+
+    def load(self):
+        """cached {'markers': {table: marker}, 'tables': {table: metadata}}, empty when there is no cache."""
+        if not os.path.exists(self.cache_path):
+            return {'markers': {}, 'tables': {}}
+        with open(self.cache_path, 'r') as file:
+            return json.load(file)
+
+    def save(self, cache):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.cache_path + '.tmp', 'w') as file:
+            json.dump(cache, file, default=str)
+        os.replace(self.cache_path + '.tmp', self.cache_path)
+
+    def metadata_details(self, compact=False):
+        """Metadata of every table of the schema, the same list as manager.metadata_details(None).
+
+        Parameters
+        ----------
+        compact : bool
+            return compact descriptors, see compact_record.
+
+        Returns
+        -------
+        meta_data_details : list
+            one entry per table; dates and other non json values of cached tables come back as str.
+        """
+        markers = self.manager.ddl_markers()
+        cache = self.load()
+        changed = {table_name for table_name, marker in markers.items()
+                   if cache['markers'].get(table_name) != marker or table_name not in cache['tables']}
+        fetched = {}
+        if changed and (not cache['tables'] or len(changed) > self.bulk_fraction * len(markers)):
+            # set based harvest of the whole schema, its order is kept for the output
+            for each in self.manager.metadata_details(None):
+                fetched[each['table_name']] = to_plain(each)
+        # cached order first (the order of the last full harvest), then the tables seen for the first time
+        order = list(fetched) + [name for name in cache['tables'] if name not in fetched]
+        order += [name for name in markers if name not in fetched and name not in cache['tables']]
+        tables = {}
+        refreshed = 0
+        for table_name in order:
+            if table_name not in markers:
+                continue
+            if table_name in fetched:
+                tables[table_name] = fetched[table_name]
+                refreshed += table_name in changed
+            elif table_name in changed:
+                details = self.manager.metadata_details(table_name)
+                if not details:
+                    # dropped after ddl_markers was read, the next run sees it gone
+                    del markers[table_name]
+                    continue
+                tables[table_name] = to_plain(details[0])
+                refreshed += 1
+            else:
+                tables[table_name] = cache['tables'][table_name]
+        dropped = len(set(cache['tables']) - set(markers))
+        if refreshed or dropped or not os.path.exists(self.cache_path):
+            self.save({'markers': markers, 'tables': tables})
+        print(f"metadata cache: {len(tables) - refreshed} tables reused, {refreshed} fetched, {dropped} dropped")
+        meta_data_details = list(tables.values())
+        if compact:
+            return [compact_record(each) for each in meta_data_details]
+        return meta_data_details
@@ -1,242 +1,528 @@
-import pymssql
-import datetime
-class MsSqlConectionManger:
-    """
-    this class for MsSQL the connection and detail of databse.
-    """
-
-    def __init__(self, connection_info) -> None:
-        """
-        initalize value connection details and create the connection with mssql database
-        """
-        self.host_address = connection_info.get('host_address', '')
-        self.port_number = connection_info.get('port_number', '1433')
-        self.database_name = connection_info.get('database_name', '')
-        self.username=connection_info.get('username','')
-        self.schema_name = connection_info.get('schema_name', '')
-        self.password = connection_info.get('password', '')
-        self.source_schema = connection_info.get('source_schema', None)
-        err, self.connection = self.create_connection()
-        if self.connection is None:
-            print("Connection is failed ")
-            raise Exception(err)
-        else:
-            print("Connection is establish ")
-
-    def create_connection(self):
-        """ Connect to the MSSQL server """
-        con = None
-        err = None
-        try:
-            params = {
-                'server': self.host_address,
-                'user': self.username,
-                'password': self.password,
-                'database': self.database_name,
-                'port': self.port_number
-            }
-            con = pymssql.connect(**params)
-        except Exception as err:
-            return err, con
-        return err, con
-
-    def connection_close(self):
-        self.connection.close()
-        print("Connection has been successfully closed")
-
-    def metadata_details(self, table_name=None):
-        meta_data_details = []
-        if table_name is None:
-            sql_table = f"SELECT TABLE_NAME FROM information_schema.tables where TABLE_CATALOG ='{self.database_name.upper()}' and TABLE_SCHEMA='DBO' "
-            with self.connection.cursor() as cursor:
-                cursor.execute(sql_table)
-                for result in cursor.fetchall():
-                    temp = {'table_schema': 'dbo',
-                            'table_name': result[0], 
-                            'column_detail': self.fetch_table_details(result[0]),
-                            'constraint_details':{},
-                            'index_details':{}, 
-                            'partition_json':self.fetch_partition_details(result[0])}
-                    meta_data_details.append(temp)
-        else:
-            temp = {'table_schema': 'dbo',
-                    'table_name': table_name, 
-                    'column_detail': self.fetch_table_details(table_name),
-                    'constraint_details':{},
-                    'index_details':{}, 
-                    'partition_json':self.fetch_partition_details(table_name)}
-            meta_data_details.append(temp)
-        return meta_data_details
-
-
-    def fetch_table_details(self, table_name):
-        temp_col = []
-        with self.connection.cursor() as cursor_tbl:
-            sql_col_detail = f'''
-                           SELECT 
-                               COLUMN_NAME, DATA_TYPE, IS_NULLABLE, column_default,
-                               CASE 
-                                   WHEN DATA_TYPE IN ('decimal', 'numeric') THEN NUMERIC_PRECISION
-                                   WHEN DATA_TYPE IN ('datetime2', 'time', 'datetimeoffset') THEN DATETIME_PRECISION
-                                   ELSE CHARACTER_MAXIMUM_LENGTH
-                               END AS Length,
-                               NUMERIC_PRECISION AS Precision,
-                               NUMERIC_SCALE AS Scale
-
-                           FROM INFORMATION_SCHEMA.COLUMNS
-                           WHERE TABLE_NAME = '{table_name}' '''
-            cursor_tbl.execute(sql_col_detail)
-            column_details_list = cursor_tbl.fetchall()
-            for column_details in column_details_list:
-                column_details = [ 'null' if each is None else each for each in column_details ]
-                temp_col.append({"column_name": column_details[0], "DATA_TYPE": column_details[1],
-                                 "is_nullable": column_details[2], "COLUMN_DEFAULT": column_details[3],
-                                 "DATA_LENGTH": column_details[4], "DATA_PRECISION": column_details[5],
-                                 "DATA_SCALE": column_details[6]})
-        return temp_col
-
-    def find_table(self, table_name):
-        """it check the table is exits or Not 
-        Parameters
-        ----------
-        table_name : str
-            it contain the name Of Table Name 
-
-        Returns
-        -------
-        result :  bool
-            it return the true/false based on table is exits or not. 
-        """
-        sql_table = f"SELECT count(1) FROM information_schema.tables where TABLE_CATALOG ='{self.database_name.upper()}' and TABLE_NAME='{table_name}'"
-
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_table)
-            data = cursor.fetchone()
-            table_count = data[0]
-        if table_count == 0:
-            return True
-        else:
-            return False
-
-    def fetch_partition_details(self, table_name):
-        temp_col = []
-        sql_query = f'''WITH DistinctHighValues AS (
-                            SELECT
-                                t.name AS TableName,
-                                ps.name AS PartitionSchemeName,
-                                pf.name AS PartitionFunctionName,
-                                pf.function_id AS PartitionFunctionID,
-                                pf.type_desc AS PartitionFunctionType,
-                                p.partition_number AS PartitionNumber,
-                                prv.value AS HighValue,
-                                c.name AS PartitionColumnName,
-                                ty.name AS PartitionColumnType
-                            FROM sys.tables t
-                            JOIN sys.indexes i ON t.object_id = i.object_id
-                            JOIN sys.partition_schemes ps ON i.data_space_id = ps.data_space_id
-                            JOIN sys.partition_functions pf ON ps.function_id = pf.function_id
-                            JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id = i.index_id
-                            JOIN sys.partition_range_values prv ON pf.function_id = prv.function_id AND prv.boundary_id = p.partition_number - 1
-                            JOIN sys.index_columns ic ON i.object_id = ic.object_id AND i.index_id = ic.index_id
-                            JOIN sys.columns c ON ic.object_id = c.object_id AND ic.column_id = c.column_id
-                            JOIN sys.types ty ON c.user_type_id = ty.user_type_id
-                            WHERE t.name = '{table_name}'
-                        )
-                        SELECT
-                            TableName,
-                            PartitionSchemeName,
-                            PartitionFunctionName,
-                            PartitionFunctionID,
-                            PartitionFunctionType,
-                            PartitionNumber,
-                            CAST(HighValue AS VARCHAR(MAX)) AS HighValue,  -- Casting HighValue to VARCHAR
-                            PartitionColumnName,  
-                            PartitionColumnType
-                        FROM
-                            DistinctHighValues
-                        ORDER BY
-                            PartitionNumber
-                        '''
-
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            partition_details_list = cursor.fetchall()
-            for partition_details in partition_details_list:
-                partition_details = ['null' if each is None else each for each in partition_details]
-
-                try:
-                    high_value = datetime.datetime.strptime(partition_details[6].strip(), '%b %d %Y').strftime('%Y-%m-%d')
-                except ValueError:
-                    high_value = partition_details[6] 
-                
-                temp_col.append({
-                    "TableName": partition_details[0],
-                    "PartitionSchemeName": partition_details[1],
-                    'PartitionFunctionName': partition_details[2],
-                    'PartitionFunctionID': partition_details[3],
-                    'PartitionFunctionType': partition_details[4],
-                    'PartitionNumber': partition_details[5],
-                    'highValue': high_value,
-                    'PartitionColumnName': partition_details[7],
-                    'PartitionColumnType': partition_details[8]
-                })
-            return temp_col
-        
-
-    def create_table(self, sql_query, table_create=False):
-        result = None
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            if table_create:
-                self.connection.commit()
-            else:
-                data = cursor.fetchone()
-                result = data[0]
-        return result
-
-    def delete_table(self, sql_query):
-        result = None
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            self.connection.commit()
-        return result
-    
-    def table_space(self, table_name):
-        table_space=0
-        sql_table = f'''
-                        SELECT 
-                            SUM(a.total_pages) TotalSpaceKb
-                        FROM 
-                            sys.tables t
-                        INNER JOIN      
-                            sys.indexes i ON t.object_id = i.object_id
-                        INNER JOIN 
-                            sys.partitions p ON i.object_id = p.object_id AND i.index_id = p.index_id
-                        INNER JOIN 
-                            sys.allocation_units a ON p.partition_id = a.container_id
-                        LEFT OUTER JOIN 
-                            sys.schemas s ON t.schema_id = s.schema_id
-                        WHERE 
-                            t.name = '{table_name}'
-                            AND t.is_ms_shipped = 0
-                            AND i.object_id > 255 
-                        GROUP BY 
-                            t.name, s.name, p.rows
-                     
-                        '''
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_table)
-            data = cursor.fetchone()
-            table_space= data[0]
-        return table_space
-
-    def find_min_max_value(self, table_name, column_name):
-        sql_query=f'SELECT min({column_name}) AS min_value, max({column_name}) AS max_value FROM {table_name}'
-        result={}
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            temp_result = cursor.fetchall()
-            for each in temp_result:
-                temp = ['null' if e is None else e for e in each ]
-                result={"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
-        return result
\ No newline at end of file
+import datetime
+import decimal
+from db_arrow import cursor_to_arrow
+from db_factory import lazy_import
+from db_metadata import compact_record
+from db_profile import profile_table
+from db_pool import pool_registry, run_with_pool
+from db_queries import bind_query, query_registry, update_table_index
+from db_sqlserver import merge_statement, stage_table_statement
+from db_stats import batched, count_estimate, split_table_name, table_min_max, add_segment_size, table_spaces_result
+
+pymssql = lazy_import('pymssql')
+
+
+def sql_server_parameter_type(value):
+    """sp_executesql declaration of a bind value."""
+    if isinstance(value, bool):
+        return 'bit'
+    if isinstance(value, int):
+        return 'bigint'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, decimal.Decimal):
+        return 'decimal(38, 10)'
+    if isinstance(value, datetime.datetime):
+        return 'datetime2'
+    if isinstance(value, datetime.date):
+        return 'date'
+    if isinstance(value, (bytes, bytearray)):
+        return 'varbinary(max)'
+    return 'nvarchar(max)' if len(str(value)) > 4000 else 'nvarchar(4000)'
+
+
+class MsSqlConectionManger:
+    """
+    this class for MsSQL the connection and detail of databse.
+    """
+
+    dialect = 'mssql'
+
+    def __init__(self, connection_info) -> None:
+        """
+        initalize value connection details and create the connection with mssql database
+        """
+        self.host_address = connection_info.get('host_address', '')
+        self.port_number = connection_info.get('port_number', '1433')
+        self.database_name = connection_info.get('database_name', '')
+        self.username=connection_info.get('username','')
+        self.schema_name = connection_info.get('schema_name', '')
+        self.password = connection_info.get('password', '')
+        self.source_schema = connection_info.get('source_schema', None)
+        self.connection_info = connection_info
+        self._table_index = None
+        self.use_pool = connection_info.get('use_pool', False)
+        if self.use_pool:
+            self.pool = pool_registry.get_pool(self.__class__.__name__, connection_info, self.create_connection)
+            err, self.connection = self.pool.acquire()
+        else:
+            err, self.connection = self.create_connection()
+        if self.connection is None:
+            print("Connection is failed ")
+            raise Exception(err)
+        else:
+            print("Connection is establish ")
+
+    def create_connection(self):
+        """ Connect to the MSSQL server """
+        con = None
+        err = None
+        try:
+            params = {
+                'server': self.host_address,
+                'user': self.username,
+                'password': self.password,
+                'database': self.database_name,
+                'port': self.port_number
+            }
+            con = pymssql.connect(**params)
+        except Exception as err:
+            return err, con
+        return err, con
+
+    def connection_pool(self):
+        """pool used for parallel work, the registry pool of this connection even when use_pool is off."""
+        if self.use_pool:
+            return self.pool
+        return pool_registry.get_pool(self.__class__.__name__, self.connection_info, self.create_connection)
+
+    def connection_close(self):
+        """Closes the connection or returns it to the pool.
+
+        There is no statement cache to clear, execute_bound relies on the plan cache of
+        sp_executesql on the server.
+        """
+        if self.connection is None:
+            return
+        if self.use_pool:
+            self.pool.release(self.connection)
+        else:
+            self.connection.close()
+        self.connection = None
+        print("Connection has been successfully closed")
+
+    def metadata_details(self, table_name=None, compact=False):
+        meta_data_details = []
+        if table_name is None:
+            sql_table = f"SELECT TABLE_NAME FROM information_schema.tables where TABLE_CATALOG ='{self.database_name.upper()}' and TABLE_SCHEMA='DBO' "
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql_table)
+                for result in cursor.fetchall():
+                    temp = {'table_schema': 'dbo',
+                            'table_name': result[0], 
+                            'column_detail': self.fetch_table_details(result[0]),
+                            'constraint_details':{},
+                            'index_details':{}, 
+                            'partition_json':self.fetch_partition_details(result[0])}
+                    meta_data_details.append(compact_record(temp) if compact else temp)
+        else:
+            temp = {'table_schema': 'dbo',
+                    'table_name': table_name, 
+                    'column_detail': self.fetch_table_details(table_name),
+                    'constraint_details':{},
+                    'index_details':{}, 
+                    'partition_json':self.fetch_partition_details(table_name)}
+            meta_data_details.append(compact_record(temp) if compact else temp)
+        return meta_data_details
+
+
+    def ddl_markers(self):
+        """table name -> DDL change marker (sys.objects.modify_date), one catalog query for the whole schema."""
+        sql = """SELECT o.name, CONVERT(varchar(33), o.modify_date, 126)
+                 FROM sys.objects o
+                 WHERE o.type = 'U' AND SCHEMA_NAME(o.schema_id) = 'dbo'"""
+        return {name: str(marker) for name, marker in self.fetch_rows(sql)}
+
+    def execute_bound(self, sql_query, values=None):
+        """Runs a select written with $name markers, the values are sent as bind variables.
+
+        Parameters
+        ----------
+        sql_query : str
+            select with $name (or '$name') where a value goes, table and column names can not be bound.
+        values : dict
+            value of every marker.
+
+        Returns
+        -------
+        rows : list
+            tuples of the result.
+        """
+        sql_query, params = bind_query(sql_query, self.dialect, values or {})
+        with self.connection.cursor() as cursor:
+            if params:
+                # pymssql formats parameters on the client, sp_executesql keeps the statement text
+                # constant so SQL Server reuses one cached plan for every value
+                declarations = ', '.join(f"@{name} {sql_server_parameter_type(value)}" for name, value in params.items())
+                assignments = ', '.join(f"@{name} = %({name})s" for name in params)
+                statement = sql_query.replace("'", "''").replace('%', '%%')
+                cursor.execute(f"EXEC sp_executesql N'{statement}', N'{declarations}', {assignments}", params)
+            else:
+                cursor.execute(sql_query)
+            return cursor.fetchall()
+
+    def catalog_rows(self, query_name, **values):
+        """rows of a catalog query of the registry, values are sent as bind variables."""
+        return self.execute_bound(query_registry.template(self.dialect, query_name), values)
+
+    def fetch_table_details(self, table_name):
+        temp_col = []
+        for column_details in self.catalog_rows('table_columns', table_name=table_name):
+            column_details = [ 'null' if each is None else each for each in column_details ]
+            temp_col.append({"column_name": column_details[0], "DATA_TYPE": column_details[1],
+                             "is_nullable": column_details[2], "COLUMN_DEFAULT": column_details[3],
+                             "DATA_LENGTH": column_details[4], "DATA_PRECISION": column_details[5],
+                             "DATA_SCALE": column_details[6]})
+        return temp_col
+
+    def table_count(self, table_name, where_clause=None, estimate=False, max_stats_age_days=7):
+        if estimate and where_clause is None:
+            return self.table_count_estimate(table_name, max_stats_age_days)['row_count']
+        records_count = 0
+        sql = f"select count(1) from {table_name}"
+        if where_clause is not None:
+            sql = sql + f"\n {where_clause}"
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+            data = cursor.fetchone()
+            records_count = data[0]
+        return records_count
+
+    def table_count_by_partition(self, table_name, max_workers=4):
+        """Counts the rows of a partitioned table with one count per partition run in parallel.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table, optionally prefixed by the schema.
+        max_workers : int
+            number of partitions counted at the same time, each on its own pooled connection.
+
+        Returns
+        -------
+        result : dict
+            row_count (sum of all partitions) and partitions (partition number -> count),
+            partitions is empty when the table is not partitioned.
+        """
+        slices = self.partition_slices(table_name)
+        if not slices:
+            return {'row_count': self.table_count(table_name), 'partitions': {}}
+
+        def count_partition(connection, partition_number):
+            from_clause, where_clause = slices[partition_number]
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(1) FROM {from_clause} WHERE {where_clause}")
+                return cursor.fetchone()[0]
+
+        partitions = run_with_pool(self.connection_pool(), count_partition, list(slices), max_workers)
+        return {'row_count': sum(partitions.values()), 'partitions': partitions}
+
+    def partition_slices(self, table_name):
+        """Splits a partitioned table into one slice per partition with the $PARTITION function.
+
+        Returns
+        -------
+        slices : dict
+            partition number -> (from clause, where clause), empty when the table is not partitioned.
+        """
+        # fetch_partition_details only lists partitions having a boundary value, the slices need all of them
+        sql_query = f'''SELECT DISTINCT pf.name, c.name, p.partition_number
+                        FROM sys.indexes i
+                        JOIN sys.partition_schemes ps ON i.data_space_id = ps.data_space_id
+                        JOIN sys.partition_functions pf ON ps.function_id = pf.function_id
+                        JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+                            AND ic.partition_ordinal = 1
+                        JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+                        JOIN sys.partitions p ON p.object_id = i.object_id AND p.index_id = i.index_id
+                        WHERE i.object_id = OBJECT_ID('{table_name}') AND i.index_id IN (0, 1)
+                        ORDER BY p.partition_number'''
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            partition_list = cursor.fetchall()
+        return {each[2]: (table_name, f"$PARTITION.{each[0]}({each[1]}) = {each[2]}") for each in partition_list}
+
+    def table_count_estimate(self, table_name, max_stats_age_days=7):
+        """Returns the row count of the table from the storage metadata (sys.partitions.rows).
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table, optionally prefixed by the schema.
+        max_stats_age_days : float
+            kept for the same signature as the other managers, sys.partitions is maintained by the
+            engine so it is never stale; a missing table falls back to an exact count.
+
+        Returns
+        -------
+        result : dict
+            row_count, estimated (False when count(1) was used), last_analyzed, stats_age_days, stale.
+        """
+        schema, name = split_table_name(table_name, 'dbo')
+        sql = f"""SELECT SUM(p.rows)
+                  FROM sys.partitions p
+                  JOIN sys.tables t ON p.object_id = t.object_id
+                  WHERE t.name = '{name}' AND SCHEMA_NAME(t.schema_id) = '{schema}' AND p.index_id IN (0, 1)"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+            data = cursor.fetchone()
+        result = count_estimate(data[0] if data else None, None, max_stats_age_days)
+        if result['stale']:
+            result['row_count'] = self.table_count(table_name)
+            result['estimated'] = False
+        return result
+
+    def find_table(self, table_name):
+        """it check the table is exits or Not 
+        Parameters
+        ----------
+        table_name : str
+            it contain the name Of Table Name 
+
+        Returns
+        -------
+        result :  bool
+            it return the true/false based on table is exits or not. 
+        """
+        sql_table = "SELECT count(1) FROM information_schema.tables where TABLE_CATALOG = $catalog and TABLE_NAME = $table_name"
+        table_count = self.execute_bound(sql_table, {'catalog': self.database_name.upper(), 'table_name': table_name})[0][0]
+        if table_count == 0:
+            return True
+        else:
+            return False
+
+    def table_names(self, refresh=False):
+        """Names of the tables of the database, lower cased as the default collation ignores case.
+
+        Read with one query on first use (or refresh=True), then kept up to date by create_table and
+        delete_table of this manager.
+        """
+        if self._table_index is None or refresh:
+            sql = "SELECT TABLE_NAME FROM information_schema.tables WHERE TABLE_CATALOG = $catalog"
+            self._table_index = {row[0].lower() for row in self.execute_bound(sql, {'catalog': self.database_name.upper()})}
+        return self._table_index
+
+    def find_tables(self, names, refresh=False):
+        """Checks the existence of any number of tables with at most one catalog query.
+
+        Parameters
+        ----------
+        names : list
+            table names.
+        refresh : bool
+            read the catalog again instead of the names known to this manager.
+
+        Returns
+        -------
+        result : dict
+            table name -> True when the table exists (unlike find_table, which returns True when it is missing).
+        """
+        table_index = self.table_names(refresh)
+        return {name: name.lower() in table_index for name in names}
+
+    def fetch_partition_details(self, table_name):
+        temp_col = []
+        for partition_details in self.catalog_rows('partitions', table_name=table_name):
+            partition_details = ['null' if each is None else each for each in partition_details]
+
+            try:
+                high_value = datetime.datetime.strptime(partition_details[6].strip(), '%b %d %Y').strftime('%Y-%m-%d')
+            except ValueError:
+                high_value = partition_details[6] 
+            
+            temp_col.append({
+                "TableName": partition_details[0],
+                "PartitionSchemeName": partition_details[1],
+                'PartitionFunctionName': partition_details[2],
+                'PartitionFunctionID': partition_details[3],
+                'PartitionFunctionType': partition_details[4],
+                'PartitionNumber': partition_details[5],
+                'highValue': high_value,
+                'PartitionColumnName': partition_details[7],
+                'PartitionColumnType': partition_details[8]
+            })
+        return temp_col
+        
+
+    def create_table(self, sql_query, table_create=False):
+        result = None
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            if table_create:
+                self.connection.commit()
+                self._table_index = update_table_index(self._table_index, sql_query, normalize=str.lower)
+            else:
+                data = cursor.fetchone()
+                result = data[0]
+        return result
+
+    def delete_table(self, sql_query):
+        result = None
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            self.connection.commit()
+        self._table_index = update_table_index(self._table_index, sql_query, normalize=str.lower)
+        return result
+    
+    def table_space(self, table_name):
+        table_space=0
+        sql_table = '''
+                        SELECT 
+                            SUM(a.total_pages) TotalSpaceKb
+                        FROM 
+                            sys.tables t
+                        INNER JOIN      
+                            sys.indexes i ON t.object_id = i.object_id
+                        INNER JOIN 
+                            sys.partitions p ON i.object_id = p.object_id AND i.index_id = p.index_id
+                        INNER JOIN 
+                            sys.allocation_units a ON p.partition_id = a.container_id
+                        LEFT OUTER JOIN 
+                            sys.schemas s ON t.schema_id = s.schema_id
+                        WHERE 
+                            t.name = $table_name
+                            AND t.is_ms_shipped = 0
+                            AND i.object_id > 255 
+                        GROUP BY 
+                            t.name, s.name, p.rows
+                     
+                        '''
+        data = self.execute_bound(sql_table, {'table_name': table_name})[0]
+        table_space= data[0]
+        return table_space
+
+    def table_spaces(self):
+        """Size in bytes of every table of the schema from one sys.allocation_units query.
+
+        Returns
+        -------
+        result : dict
+            table name -> table_bytes (heap / clustered index), index_bytes, lob_bytes, total_bytes
+            and partitions (partition number -> bytes, empty when the table is not partitioned).
+        """
+        spaces = {}
+        rows = self.catalog_rows('table_spaces', schema=self.schema_name or 'dbo')
+        for table_name, partition_number, kind, size in rows:
+            add_segment_size(spaces, table_name, kind, size, str(partition_number))
+        return table_spaces_result(spaces)
+
+    def find_min_max_value(self, table_name, column_name):
+        sql_query=f'SELECT min({column_name}) AS min_value, max({column_name}) AS max_value FROM {table_name}'
+        result={}
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            temp_result = cursor.fetchall()
+            for each in temp_result:
+                temp = ['null' if e is None else e for e in each ]
+                result={"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
+        return result
+
+    def find_min_max_values(self, table_name, columns=None):
+        """min and max of several columns with a single scan of the table, see db_stats.table_min_max."""
+        return table_min_max(self, table_name, columns)
+
+    def fetch_rows(self, sql_query):
+        """run a select and return all rows as tuples."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            return cursor.fetchall()
+
+    def iter_rows(self, sql_query, batch_size=10000):
+        """run a select and yield its rows, fetched batch_size rows per round trip."""
+        with self.connection.cursor() as cursor:
+            cursor.arraysize = batch_size
+            cursor.execute(sql_query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def query_arrow(self, sql_query, batch_size=10000):
+        """Runs a select and returns its result as a pyarrow.Table built column wise batch by batch."""
+        with self.connection.cursor() as cursor:
+            cursor.arraysize = batch_size
+            cursor.execute(sql_query)
+            return cursor_to_arrow(cursor, batch_size)
+
+    def profile_columns(self, table_name, columns=None, sample_percent=None):
+        """Profiles null counts, distinct counts and value lengths of the columns, see db_profile.profile_table.
+
+        Returns
+        -------
+        result : dict
+            column name -> ColumnProfile
+        """
+        return profile_table(self, table_name, columns, sample_percent)
+
+    def bulk_insert(self, table_name, columns, rows):
+        """Inserts the rows into the table with multi row INSERT statements (see load_rows), the batch is committed once.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the target table.
+        columns : list
+            column names, in the order of the values of each row.
+        rows : list
+            rows as tuples.
+
+        Returns
+        -------
+        result : int
+            number of rows inserted.
+        """
+        return self.load_rows(table_name, rows, columns, batch_size=max(len(rows), 1))['rows']
+
+    def load_rows(self, table_name, rows, columns=None, key_columns=None, batch_size=10000):
+        """Inserts or upserts rows with multi row INSERT statements, committing after every batch.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the target table.
+        rows : iterable
+            rows as tuples, consumed batch by batch.
+        columns : list
+            column names in the order of the values, by default every column of the table.
+        key_columns : list
+            when given the batches are upserted: loaded into a temp table and merged on these columns.
+        batch_size : int
+            rows sent and committed together.
+
+        Returns
+        -------
+        result : dict
+            rows and batches loaded.
+        """
+        if columns is None:
+            _, name = split_table_name(table_name)
+            columns = [each['column_name'] for each in self.fetch_table_details(name)]
+        target = table_name
+        if key_columns:
+            target = '#stage_load'
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"IF OBJECT_ID('tempdb..{target}') IS NOT NULL DROP TABLE {target}")
+                cursor.execute(stage_table_statement(target, table_name, columns))
+        # SQL Server accepts at most 1000 rows per VALUES list. pymssql formats the values into
+        # the statement text on the client, so the 2100 parameter limit of RPC calls does not apply.
+        rows_per_statement = 1000
+        row_placeholder = f"({', '.join(['%s'] * len(columns))})"
+        row_count = 0
+        batch_count = 0
+        with self.connection.cursor() as cursor:
+            for batch in batched(rows, batch_size):
+                for start in range(0, len(batch), rows_per_statement):
+                    chunk = batch[start:start + rows_per_statement]
+                    sql_query = (f"INSERT INTO {target} ({', '.join(columns)}) VALUES "
+                                 + ', '.join([row_placeholder] * len(chunk)))
+                    cursor.execute(sql_query, tuple(value for row in chunk for value in row))
+                if key_columns:
+                    cursor.execute(merge_statement(table_name, target, columns, key_columns))
+                    cursor.execute(f"TRUNCATE TABLE {target}")
+                self.connection.commit()
+                row_count += len(batch)
+                batch_count += 1
+            if key_columns:
+                cursor.execute(f"DROP TABLE {target}")
+                self.connection.commit()
+        return {'rows': row_count, 'batches': batch_count}
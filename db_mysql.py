@@ -1,166 +1,386 @@
-import mysql.connector
-
-
-class MySqlConectionManger:
-    """
-    this class for MySQL the connection and detail of database.
-    """
-    def __init__(self, connection_info):
-        """
-        initialize value connection details and create the connection with mssql database
-        """
-        self.host_address = connection_info.get('host_address', '')
-        self.port_number = connection_info.get('port_number', '')
-        self.database_name = connection_info.get('database_name', '')
-        self.schema_name = connection_info.get('schema_name', '')
-        self.username = connection_info.get('username', '')
-        self.password = connection_info.get('password', '')
-        self.source_schema = connection_info.get('source_schema', None)
-        err, self.connection = self.create_connection()
-        if self.connection is None:
-            print("Connection not created ")
-            raise Exception(err)
-        else:
-            print("Conenction had been created successfully")
-            
-    def create_connection(self):
-        """ Connect to the oracle Server database server """
-        con = None
-        err = None
-        try:
-            params = {
-                'host': self.host_address,
-                'user': self.username,
-                'password': self.password,
-                'database': self.database_name,
-                'port': self.port_number,
-                'raise_on_warnings': True
-            }
-            con = mysql.connector.connect(**params)
-        except Exception as err:
-            return err, con
-        return err, con
-
-    def connection_close(self):
-        self.connection.close()
-        print("Connection has been successfully closed ")
-
-    def metadata_details(self, table_name=None):
-        meta_data_details = []
-        if table_name is None:
-            sql_table = f"SELECT TABLE_NAME FROM information_schema.tables where TABLE_SCHEMA ='{self.database_name}'"
-            with self.connection.cursor() as cursor:
-                cursor.execute(sql_table)
-                for result in cursor.fetchall():
-                    #print("result ---------", result)
-                    temp = {'table_schema': self.database_name,'table_name': result[0], 'column_detail': self.fetch_table_details(result[0]),  'constraint_details':{}, 'index_details':{}, 'partition_json':{}}
-                    meta_data_details.append(temp)
-        else:
-            temp = {'table_schema': self.database_name,'table_name': table_name, 'column_detail': self.fetch_table_details(table_name),'constraint_details':{}, 'index_details':{}, 'partition_json':{}}
-            meta_data_details.append(temp)
-
-        return meta_data_details
-
-    def fetch_table_details(self, table_name):
-        temp_col = []
-        with self.connection.cursor() as cursor_tbl:
-            sql_col_detail = f"SELECT column_name, data_type,is_nullable,COLUMN_DEFAULT, character_maximum_length, numeric_precision, numeric_scale, COLUMN_KEY FROM INFORMATION_SCHEMA.COLUMNS WHERE table_name = '{table_name}'"
-            #print(sql_col_detail)
-            cursor_tbl.execute(sql_col_detail)
-            column_details_list = cursor_tbl.fetchall()
-            for column_details in column_details_list:
-                column_details = ['null' if each is None else each for each in column_details]
-                temp_col.append({"column_name": column_details[0], "DATA_TYPE": column_details[1],
-                                 "is_nullable": column_details[2], "COLUMN_DEFAULT": column_details[3],
-                                 "DATA_LENGTH": column_details[4], "DATA_PRECISION": column_details[5],
-                                 "DATA_SCALE": column_details[6], "COLUMN_KEY": column_details[7]})
-        return temp_col
-
-    def create_table(self, sql_query, table_create=False):
-        result = None
-        #print(sql_query)
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            if table_create:
-                self.connection.commit()
-            else:
-                data = cursor.fetchone()
-                result = data[0]
-        return result
-
-    def delete_table(self, sql_query):
-        """Used to delete the table based On query
-        Parameters
-        ----------
-        sql_query : str
-            it contain the query to delete the table 
-
-        Returns
-        -------
-        result :  bool
-            it return the true/false based on table is deleted or Not. 
-        """
-        
-        result = True
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            self.connection.commit()
-        return result
-
-    def find_table(self,table_name):
-        """it check the table is exits or Not 
-        Parameters
-        ----------
-        table_name : str
-            it contain the name Of Table Name 
-
-        Returns
-        -------
-        result :  bool
-            it return the true/false based on table is exits or not. 
-        """
-
-        sql_query=f"SELECT count(1) FROM information_schema.tables where  TABLE_SCHEMA ='{self.database_name}' and table_name='{table_name}'"
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            data = cursor.fetchone()
-            table_count = data[0]
-        if table_count == 0:
-            return True
-        else:
-            return False
-        
-    def find_min_max_value(self, table_name, column_name):
-        sql_query=f'SELECT min({column_name}) AS min_value, max({column_name}) AS max_value FROM {table_name}'
-        result={}
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            temp_result = cursor.fetchall()
-            for each in temp_result:
-                temp = ['null' if e is None else e for e in each ]
-                result={"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
-        return result
-    
-    def table_space(self, table_name):
-        """it used to check the table space in Kbs 
-        Parameters
-        ----------
-        table_name : str
-            it contain the name Of Table Name 
-
-        Returns
-        -------
-        result :  integer
-            it return the integer value related to table space in kbs."""
-        
-        table_space_kb=0
-        sql_query=f'''SELECT ROUND((DATA_LENGTH + INDEX_LENGTH) / 1024) AS `size_kb` 
-                      FROM information_schema.TABLES 
-                      WHERE TABLE_SCHEMA = '{self.database_name}' AND TABLE_NAME = '{table_name}'
-                      ORDER BY (DATA_LENGTH + INDEX_LENGTH) DESC'''
-        print("Sql_query-------------", sql_query)
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            result = cursor.fetchone()
-            table_space_kb=result[0]
-        return table_space_kb             
\ No newline at end of file
+from db_arrow import cursor_to_arrow
+from db_factory import lazy_import
+from db_metadata import compact_record
+from db_profile import profile_table
+from db_pool import pool_registry
+from db_queries import StatementCache, bind_query, query_registry, update_table_index
+from db_stats import count_estimate, split_table_name, table_min_max, add_segment_size, table_spaces_result
+
+mysql_connector = lazy_import('mysql.connector')
+
+
+class MySqlConectionManger:
+    """
+    this class for MySQL the connection and detail of database.
+    """
+
+    dialect = 'mysql'
+
+    def __init__(self, connection_info):
+        """
+        initialize value connection details and create the connection with mssql database
+        """
+        self.host_address = connection_info.get('host_address', '')
+        self.port_number = connection_info.get('port_number', '')
+        self.database_name = connection_info.get('database_name', '')
+        self.schema_name = connection_info.get('schema_name', '')
+        self.username = connection_info.get('username', '')
+        self.password = connection_info.get('password', '')
+        self.source_schema = connection_info.get('source_schema', None)
+        self.connection_info = connection_info
+        self.statements = StatementCache(self.prepare_statement, lambda cursor: cursor.close(),
+                                         int(connection_info.get('statement_cache_size', 64)))
+        self._table_index = None
+        self.use_pool = connection_info.get('use_pool', False)
+        if self.use_pool:
+            self.pool = pool_registry.get_pool(self.__class__.__name__, connection_info, self.create_connection)
+            err, self.connection = self.pool.acquire()
+        else:
+            err, self.connection = self.create_connection()
+        if self.connection is None:
+            print("Connection not created ")
+            raise Exception(err)
+        else:
+            print("Conenction had been created successfully")
+            
+    def create_connection(self):
+        """ Connect to the oracle Server database server """
+        con = None
+        err = None
+        try:
+            params = {
+                'host': self.host_address,
+                'user': self.username,
+                'password': self.password,
+                'database': self.database_name,
+                'port': self.port_number,
+                'raise_on_warnings': True
+            }
+            con = mysql_connector.connect(**params)
+        except Exception as err:
+            return err, con
+        return err, con
+
+    def connection_close(self):
+        if self.connection is None:
+            return
+        self.statements.clear()
+        if self.use_pool:
+            self.pool.release(self.connection)
+        else:
+            self.connection.close()
+        self.connection = None
+        print("Connection has been successfully closed ")
+
+    def metadata_details(self, table_name=None, compact=False):
+        meta_data_details = []
+        if table_name is None:
+            sql_table = f"SELECT TABLE_NAME FROM information_schema.tables where TABLE_SCHEMA ='{self.database_name}'"
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql_table)
+                for result in cursor.fetchall():
+                    #print("result ---------", result)
+                    temp = {'table_schema': self.database_name,'table_name': result[0], 'column_detail': self.fetch_table_details(result[0]),  'constraint_details':{}, 'index_details':{}, 'partition_json':{}}
+                    meta_data_details.append(compact_record(temp) if compact else temp)
+        else:
+            temp = {'table_schema': self.database_name,'table_name': table_name, 'column_detail': self.fetch_table_details(table_name),'constraint_details':{}, 'index_details':{}, 'partition_json':{}}
+            meta_data_details.append(compact_record(temp) if compact else temp)
+
+        return meta_data_details
+
+    def ddl_markers(self):
+        """table name -> DDL change marker (information_schema.tables create_time and update_time, update_time also moves on DML so the marker errs on re-fetching), one catalog query for the whole schema."""
+        sql = """SELECT TABLE_NAME, CONCAT_WS('|', CREATE_TIME, UPDATE_TIME)
+                 FROM information_schema.tables
+                 WHERE TABLE_SCHEMA = $schema"""
+        return {name: str(marker) for name, marker in self.execute_bound(sql, {'schema': self.database_name})}
+
+    def prepare_statement(self, sql_query):
+        """server side prepared cursor for one statement text, kept in self.statements."""
+        return self.connection.cursor(prepared=True)
+
+    def execute_bound(self, sql_query, values=None):
+        """Runs a select written with $name markers, the values are sent as bind variables.
+
+        Parameters
+        ----------
+        sql_query : str
+            select with $name (or '$name') where a value goes, table and column names can not be bound.
+        values : dict
+            value of every marker.
+
+        Returns
+        -------
+        rows : list
+            tuples of the result.
+        """
+        sql_query, params = bind_query(sql_query, self.dialect, values or {})
+        # the prepared cursor only sends COM_STMT_PREPARE the first time it sees the text
+        cursor = self.statements.get(sql_query)
+        cursor.execute(sql_query, params)
+        return cursor.fetchall()
+
+    def catalog_rows(self, query_name, **values):
+        """rows of a catalog query of the registry, values are sent as bind variables."""
+        return self.execute_bound(query_registry.template(self.dialect, query_name), values)
+
+    def fetch_table_details(self, table_name):
+        temp_col = []
+        for column_details in self.catalog_rows('table_columns', table_name=table_name):
+            column_details = ['null' if each is None else each for each in column_details]
+            temp_col.append({"column_name": column_details[0], "DATA_TYPE": column_details[1],
+                             "is_nullable": column_details[2], "COLUMN_DEFAULT": column_details[3],
+                             "DATA_LENGTH": column_details[4], "DATA_PRECISION": column_details[5],
+                             "DATA_SCALE": column_details[6], "COLUMN_KEY": column_details[7]})
+        return temp_col
+
+    def create_table(self, sql_query, table_create=False):
+        result = None
+        #print(sql_query)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            if table_create:
+                self.connection.commit()
+                self._table_index = update_table_index(self._table_index, sql_query, schema=self.database_name)
+            else:
+                data = cursor.fetchone()
+                result = data[0]
+        return result
+
+    def delete_table(self, sql_query):
+        """Used to delete the table based On query
+        Parameters
+        ----------
+        sql_query : str
+            it contain the query to delete the table 
+
+        Returns
+        -------
+        result :  bool
+            it return the true/false based on table is deleted or Not. 
+        """
+        
+        result = True
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            self.connection.commit()
+        self._table_index = update_table_index(self._table_index, sql_query, schema=self.database_name)
+        return result
+
+    def table_count(self, table_name, where_clause=None, estimate=False, max_stats_age_days=7):
+        if estimate and where_clause is None:
+            return self.table_count_estimate(table_name, max_stats_age_days)['row_count']
+        records_count = 0
+        sql = f"select count(1) from {table_name}"
+        if where_clause is not None:
+            sql = sql + f"\n {where_clause}"
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+            data = cursor.fetchone()
+            records_count = data[0]
+        return records_count
+
+    def table_count_estimate(self, table_name, max_stats_age_days=7):
+        """Returns the row count of the table from the InnoDB statistics (information_schema.tables.table_rows).
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table, optionally prefixed by the database.
+        max_stats_age_days : float
+            statistics older than this (mysql.innodb_table_stats.last_update) fall back to an exact count.
+
+        Returns
+        -------
+        result : dict
+            row_count, estimated (False when count(1) was used), last_analyzed, stats_age_days, stale.
+        """
+        schema, name = split_table_name(table_name, self.database_name)
+        sql = f"""SELECT t.TABLE_ROWS, s.last_update
+                  FROM information_schema.tables t
+                  LEFT JOIN mysql.innodb_table_stats s
+                    ON s.database_name = t.TABLE_SCHEMA AND s.table_name = t.TABLE_NAME
+                  WHERE t.TABLE_SCHEMA = '{schema}' AND t.TABLE_NAME = '{name}'"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql)
+                data = cursor.fetchone()
+        except Exception as err:
+            print(f"table statistics are not readable: {err}")
+            data = None
+        if data is None:
+            result = count_estimate(None, None, max_stats_age_days)
+        else:
+            result = count_estimate(data[0], data[1], max_stats_age_days)
+        if result['stale']:
+            result['row_count'] = self.table_count(table_name)
+            result['estimated'] = False
+        return result
+
+    def find_table(self,table_name):
+        """it check the table is exits or Not 
+        Parameters
+        ----------
+        table_name : str
+            it contain the name Of Table Name 
+
+        Returns
+        -------
+        result :  bool
+            it return the true/false based on table is exits or not. 
+        """
+
+        sql_query="SELECT count(1) FROM information_schema.tables where  TABLE_SCHEMA = $schema and table_name = $table_name"
+        table_count = self.execute_bound(sql_query, {'schema': self.database_name, 'table_name': table_name})[0][0]
+        if table_count == 0:
+            return True
+        else:
+            return False
+        
+    def table_names(self, refresh=False):
+        """Names of the tables of the database in information_schema.tables, where find_table looks.
+
+        Read with one query on first use (or refresh=True), then kept up to date by create_table and
+        delete_table of this manager.
+        """
+        if self._table_index is None or refresh:
+            sql = "SELECT table_name FROM information_schema.tables WHERE TABLE_SCHEMA = $schema"
+            self._table_index = {row[0] for row in self.execute_bound(sql, {'schema': self.database_name})}
+        return self._table_index
+
+    def find_tables(self, names, refresh=False):
+        """Checks the existence of any number of tables with at most one catalog query.
+
+        Parameters
+        ----------
+        names : list
+            table names.
+        refresh : bool
+            read the catalog again instead of the names known to this manager.
+
+        Returns
+        -------
+        result : dict
+            table name -> True when the table exists (unlike find_table, which returns True when it is missing).
+        """
+        table_index = self.table_names(refresh)
+        return {name: name in table_index for name in names}
+
+    def find_min_max_value(self, table_name, column_name):
+        sql_query=f'SELECT min({column_name}) AS min_value, max({column_name}) AS max_value FROM {table_name}'
+        result={}
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            temp_result = cursor.fetchall()
+            for each in temp_result:
+                temp = ['null' if e is None else e for e in each ]
+                result={"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
+        return result
+    
+    def table_space(self, table_name):
+        """it used to check the table space in Kbs 
+        Parameters
+        ----------
+        table_name : str
+            it contain the name Of Table Name 
+
+        Returns
+        -------
+        result :  integer
+            it return the integer value related to table space in kbs."""
+        
+        table_space_kb=0
+        sql_query='''SELECT ROUND((DATA_LENGTH + INDEX_LENGTH) / 1024) AS `size_kb` 
+                     FROM information_schema.TABLES 
+                     WHERE TABLE_SCHEMA = $schema AND TABLE_NAME = $table_name
+                     ORDER BY (DATA_LENGTH + INDEX_LENGTH) DESC'''
+        print("Sql_query-------------", sql_query)
+        result = self.execute_bound(sql_query, {'schema': self.database_name, 'table_name': table_name})[0]
+        table_space_kb=result[0]
+        return table_space_kb
+
+    def table_spaces(self):
+        """Size in bytes of every table of the database from one information_schema.PARTITIONS query.
+
+        PARTITIONS has one row per partition and a single row (PARTITION_NAME null) for a plain table.
+
+        Returns
+        -------
+        result : dict
+            table name -> table_bytes, index_bytes, lob_bytes (always 0), total_bytes and partitions
+            (partition name -> bytes, empty when the table is not partitioned).
+        """
+        sql = """SELECT p.TABLE_NAME, p.PARTITION_NAME, SUM(p.DATA_LENGTH), SUM(p.INDEX_LENGTH)
+                 FROM information_schema.PARTITIONS p
+                 JOIN information_schema.TABLES t
+                   ON t.TABLE_SCHEMA = p.TABLE_SCHEMA AND t.TABLE_NAME = p.TABLE_NAME
+                 WHERE p.TABLE_SCHEMA = $schema AND t.TABLE_TYPE = 'BASE TABLE'
+                 GROUP BY p.TABLE_NAME, p.PARTITION_NAME"""
+        spaces = {}
+        for table_name, partition_name, table_bytes, index_bytes in self.execute_bound(
+                sql, {'schema': self.database_name}):
+            add_segment_size(spaces, table_name, 'table', table_bytes, partition_name)
+            add_segment_size(spaces, table_name, 'index', index_bytes, partition_name)
+        return table_spaces_result(spaces)
+
+    def find_min_max_values(self, table_name, columns=None):
+        """min and max of several columns with a single scan of the table, see db_stats.table_min_max."""
+        return table_min_max(self, table_name, columns)
+
+    def fetch_rows(self, sql_query):
+        """run a select and return all rows as tuples."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            return cursor.fetchall()
+
+    def iter_rows(self, sql_query, batch_size=10000):
+        """run a select and yield its rows, fetched batch_size rows per round trip."""
+        with self.connection.cursor() as cursor:
+            cursor.arraysize = batch_size
+            cursor.execute(sql_query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def query_arrow(self, sql_query, batch_size=10000):
+        """Runs a select and returns its result as a pyarrow.Table built column wise batch by batch."""
+        with self.connection.cursor() as cursor:
+            cursor.arraysize = batch_size
+            cursor.execute(sql_query)
+            return cursor_to_arrow(cursor, batch_size)
+
+    def profile_columns(self, table_name, columns=None, sample_percent=None):
+        """Profiles null counts, distinct counts and value lengths of the columns, see db_profile.profile_table.
+
+        Returns
+        -------
+        result : dict
+            column name -> ColumnProfile
+        """
+        return profile_table(self, table_name, columns, sample_percent)
+
+    def bulk_insert(self, table_name, columns, rows):
+        """Inserts the rows into the table with a multi row INSERT (executemany), the batch is committed once.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the target table.
+        columns : list
+            column names, in the order of the values of each row.
+        rows : list
+            rows as tuples.
+
+        Returns
+        -------
+        result : int
+            number of rows inserted.
+        """
+        placeholders = ', '.join(['%s'] * len(columns))
+        sql_query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        with self.connection.cursor() as cursor:
+            cursor.executemany(sql_query, rows)
+        self.connection.commit()
+        return len(rows)
@@ -1,468 +1,768 @@
-import oracledb
-
-class OracleConectionManger:
-    """
-    this class for oracle database.
-    """
-
-    def __init__(self, connection_info) -> None:
-        print("=====db======", connection_info)
-        """
-        initialize value connection details and create the connection with oracle database
-        """
-        self.host_address = connection_info.get('host_address', None)
-        self.port_number = connection_info.get('port_number', None)
-        self.database_name = connection_info.get('database_name', None)
-        self.schema_name = connection_info.get('schema_name', None)
-        self.username = connection_info.get('username', None)
-        self.password = connection_info.get('password', None)
-        self.source_schema = connection_info.get('source_schema', None)
-        err, self.connection = self.create_connection()
-        if self.connection is None:
-            print(f"Connection creation geting error {err}")
-            raise Exception(err)
-        else:
-            print("Connection has been created")
-            
-    def create_connection(self):
-        """ Connect to the oracle Server database server """
-        con = None
-        err = None
-        try:
-            params = {
-                'dsn': f'{self.host_address}:{self.port_number}/{self.database_name}',
-                'user': self.username,
-                'password': self.password}
-            con = oracledb.connect(**params)
-        except Exception as err:
-            return err, con
-        return err, con
-
-    def metadata_details(self, table_name=None):
-        """Fetches the metadata for a particular connection.
-        
-        Parameters
-        ----------
-        table_name : str
-            Name of the table.
-        
-        Returns
-        -------
-        meta_data_details : list
-            List containing all the details related to the table.
-        """
-        meta_data_details = []
-        if table_name is None:
-            if self.source_schema:
-                sql_table = f"SELECT table_name FROM all_tables WHERE owner ='{self.source_schema.upper()}'"
-            else:
-                sql_table = "SELECT table_name FROM USER_TABLES"
-            with self.connection.cursor() as cursor:
-                cursor.execute(sql_table)
-                for result in cursor.fetchall():
-                    temp = {
-                        'table_schema': self.source_schema.lower() if self.source_schema else self.username.lower(),
-                        'table_name': result[0],
-                        'column_detail': self.fetch_table_details(result[0]),
-                        'constraint_details': self.fetch_primary_key_constraint(result[0]),
-                        'index_details': self.fetch_index_constraint(result[0]),
-                        'partition_json': self.fetch_partition_information(result[0])
-                    }
-                    meta_data_details.append(temp)
-        else:
-            temp = {
-                'table_schema': self.source_schema.lower() if self.source_schema else self.username.lower(),
-                'table_name': table_name,
-                'column_detail': self.fetch_table_details(table_name),
-                'constraint_details': self.fetch_primary_key_constraint(table_name),
-                'index_details': self.fetch_index_constraint(table_name),
-                'partition_json': self.fetch_partition_information(table_name)
-            }
-            meta_data_details.append(temp)
-        return meta_data_details
-
-    def fetch_table_details(self, table_name):
-        temp_col = []
-        with self.connection.cursor() as cursor_tbl:
-            if self.source_schema:
-                sql_col_detail = f"""
-                SELECT column_name, DATA_TYPE, NULLABLE, DATA_DEFAULT, DATA_LENGTH, DATA_PRECISION, DATA_SCALE
-                FROM all_tab_columns
-                WHERE TABLE_NAME='{table_name}' AND OWNER='{self.source_schema.upper()}'
-                """
-            else:
-                sql_col_detail = f"""
-                SELECT column_name, DATA_TYPE, NULLABLE, DATA_DEFAULT, DATA_LENGTH, DATA_PRECISION, DATA_SCALE
-                FROM user_tab_columns
-                WHERE TABLE_NAME='{table_name}'
-                """
-            cursor_tbl.execute(sql_col_detail)
-            column_details_list = cursor_tbl.fetchall()
-            for column_details in column_details_list:
-                column_details = ['null' if each is None else each for each in column_details]
-                temp_col.append({
-                    "column_name": column_details[0],
-                    "DATA_TYPE": column_details[1],
-                    "is_nullable": column_details[2],
-                    "COLUMN_DEFAULT": column_details[3],
-                    "DATA_LENGTH": column_details[4],
-                    "DATA_PRECISION": column_details[5],
-                    "DATA_SCALE": column_details[6]
-                })
-                # if column_details[1] == 'DATE':
-                #     if self.source_schema:
-                #         min_max_query = f"""
-                #                         SELECT MIN({column_details[0]}), MAX({column_details[0]}) FROM {self.source_schema}.{table_name}
-                #                         """
-                #     else:
-                #         min_max_query = f"""
-                #         SELECT MIN({column_details[0]}), MAX({column_details[0]}) FROM {table_name}
-                #         """
-                #     cursor_tbl.execute(min_max_query)
-
-                #     min_max_result = cursor_tbl.fetchall()
-                #     min_date_str = min_max_result[0][0].strftime('%Y-%m-%d %H:%M:%S') if min_max_result[0][0] else None
-                #     max_date_str = min_max_result[0][1].strftime('%Y-%m-%d %H:%M:%S') if min_max_result[0][1] else None
-                #     temp_col.append({
-                #         "extra_info": {
-                #             "MIN_DATE": min_date_str,
-                #             "MAX_DATE": max_date_str
-                #         }
-                #     })
-        return temp_col
-
-    def fetch_primary_key_constraint(self, table_name):
-        temp_col = []
-        with self.connection.cursor() as cursor_tbl:
-            if self.source_schema:
-                sql_col_detail = f'''SELECT cols.table_name,
-                                            cols.column_name, 
-                                            cols.position, 
-                                            cons.status, 
-                                            cons.owner, 
-                                            cons.CONSTRAINT_NAME , 
-                                            cons.CONSTRAINT_TYPE,
-                                            CASE WHEN cons.SEARCH_CONDITION IS NULL THEN ''  END AS SEARCH_CONDITION
-                                    FROM all_constraints cons, all_cons_columns cols
-                                    WHERE  cons.constraint_name = cols.constraint_name
-                                        AND cons.owner=cols.owner
-                                        AND cons.owner='{self.source_schema.upper()}'
-                                        AND cons.table_name='{table_name}'
-                                        AND cons.CONSTRAINT_TYPE != 'R'
-                                        ORDER BY cols.table_name, cols.position '''
-            else:
-                sql_col_detail = f'''SELECT cols.table_name,
-                                            cols.column_name, 
-                                            cols.position, 
-                                            cons.status, 
-                                            cons.owner, 
-                                            cons.CONSTRAINT_NAME , 
-                                            cons.CONSTRAINT_TYPE,
-                                            CASE WHEN cons.SEARCH_CONDITION IS NULL THEN ''  END AS SEARCH_CONDITION
-                                    FROM all_constraints cons, all_cons_columns cols
-                                    WHERE  cons.constraint_name = cols.constraint_name
-                                        AND cons.owner=cols.owner
-                                        AND cons.owner='{self.username.upper()}'
-                                        AND cons.table_name='{table_name}'
-                                        AND cons.CONSTRAINT_TYPE != 'R'
-                                        ORDER BY cols.table_name, cols.position '''
-            cursor_tbl.execute(sql_col_detail)
-            column_details_list = cursor_tbl.fetchall()
-            for column_details in column_details_list:
-                column_details = ['null' if each is None else each for each in column_details]
-                temp_col.append({"table_name": column_details[0], "column_name": column_details[1],
-                                 "position": column_details[2], "status": column_details[3],
-                                 "owner": column_details[4], "constraint_name": column_details[5],
-                                 "constraint_type": column_details[6], 'search_condition': column_details[7]})
-
-        return temp_col + self.fetch_foreign_key_constraint(table_name)
-
-    def fetch_foreign_key_constraint(self, table_name):
-        temp_col = []
-        with self.connection.cursor() as cursor_tbl:
-            if self.source_schema:
-                sql_col_detail = f'''SELECT a.constraint_name,
-                                            a.table_name, 
-                                            a.column_name,  
-                                            c.owner, 
-                                            c_pk.table_name r_table_name,  
-                                            b.column_name r_column_name,
-                                            c_pk.owner r_owner,
-                                            c.constraint_type 
-                                    FROM user_cons_columns a
-                                    JOIN user_constraints c ON a.owner = c.owner
-                                        AND a.constraint_name = c.constraint_name
-                                    JOIN user_constraints c_pk ON c.r_owner = c_pk.owner
-                                        AND c.r_constraint_name = c_pk.constraint_name
-                                    JOIN user_cons_columns b ON C_PK.owner = b.owner
-                                        AND  C_PK.CONSTRAINT_NAME = b.constraint_name AND b.POSITION = a.POSITION     
-                                    WHERE c.constraint_type = 'R' AND  c.owner ='{self.source_schema.upper()}' AND a.table_name='{table_name}' '''
-            else:
-                sql_col_detail = f'''SELECT a.constraint_name,
-                                            a.table_name, 
-                                            a.column_name,  
-                                            c.owner, 
-                                            c_pk.table_name r_table_name,  
-                                            b.column_name r_column_name,
-                                            c_pk.owner r_owner,
-                                            c.constraint_type 
-                                    FROM user_cons_columns a
-                                    JOIN user_constraints c ON a.owner = c.owner
-                                        AND a.constraint_name = c.constraint_name
-                                    JOIN user_constraints c_pk ON c.r_owner = c_pk.owner
-                                        AND c.r_constraint_name = c_pk.constraint_name
-                                    JOIN user_cons_columns b ON C_PK.owner = b.owner
-                                        AND  C_PK.CONSTRAINT_NAME = b.constraint_name AND b.POSITION = a.POSITION     
-                                    WHERE c.constraint_type = 'R' AND  c.owner ='{self.username.upper()}' AND a.table_name='{table_name}' '''
-            # print(sql_col_detail)
-            cursor_tbl.execute(sql_col_detail)
-            column_details_list = cursor_tbl.fetchall()
-            for column_details in column_details_list:
-                column_details = ['null' if each is None else each for each in column_details]
-                temp_col.append({"constraint_name": column_details[0], "table_name": column_details[1],
-                                 "column_name": column_details[2],
-                                 "owner": column_details[3], "r_table_name": column_details[4],
-                                 "r_column_name": column_details[5], "r_owner": column_details[6],
-                                 "constraint_type": column_details[7]})
-        return temp_col
-
-    def fetch_index_constraint(self, table_name):
-        temp_col = []
-        with self.connection.cursor() as cursor_tbl:
-            if self.source_schema:
-                sql_col_detail = f'''select ind.table_owner, 
-                                            ind.table_name,
-                                            ind_col.column_name,
-                                            ind.index_name,
-                                            ind.index_type,
-                                            ind.table_type 
-                                from sys.all_indexes ind
-                                inner join sys.all_ind_columns ind_col
-                                        on ind.owner = ind_col.index_owner
-                                        and ind.index_name = ind_col.index_name
-                                where ind.uniqueness = 'UNIQUE' AND ind.owner ='{self.source_schema.upper()}' AND ind.table_name= '{table_name}' '''
-            else:
-                sql_col_detail = f'''select ind.table_owner, 
-                                            ind.table_name,
-                                            ind_col.column_name,
-                                            ind.index_name,
-                                            ind.index_type,
-                                            ind.table_type 
-                                from sys.all_indexes ind
-                                inner join sys.all_ind_columns ind_col
-                                        on ind.owner = ind_col.index_owner
-                                        and ind.index_name = ind_col.index_name
-                                where ind.uniqueness = 'UNIQUE' AND ind.owner ='{self.username.upper()}' AND ind.table_name= '{table_name}' '''
-            # print(sql_col_detail)
-            cursor_tbl.execute(sql_col_detail)
-            column_details_list = cursor_tbl.fetchall()
-            for column_details in column_details_list:
-                temp_col.append({"table_owner": column_details[0], "table_name": column_details[1],
-                                 "column_name": column_details[2],
-                                 "index_name": column_details[3], "index_type": column_details[4]})
-        return temp_col
-
-    def fetch_partition_information(self, table_name):
-        if self.source_schema:
-            sql_query = f'''
-                            SELECT
-                                p1.table_owner AS table_owner,
-                                p1.table_name AS table_name,
-                                p1.high_value AS high_value,
-                                p1.partition_name AS partition_name,
-                                c.column_name AS column_name,
-                                p1.tablespace_name AS tablespace_name,
-                                t.partitioning_type AS partition_type,
-                                (SELECT COUNT(*)
-                                FROM all_tab_partitions apt
-                                WHERE apt.table_owner = p1.table_owner
-                                AND apt.table_name = p1.table_name
-                                ) AS partition_count,
-                                p2.high_value AS min_value,
-                                p1.high_value AS max_value,
-                                p1.partition_position AS partition_position
-                            FROM
-                                all_tab_partitions p1
-                            LEFT JOIN
-                                all_tab_partitions p2
-                            ON p1.PARTITION_position = p2.PARTITION_position + 1
-                                AND p1.table_owner = p2.table_owner
-                                AND p1.table_name = p2.table_name
-                            JOIN
-                                all_part_key_columns c
-                            ON p1.table_owner = c.owner
-                                AND p1.table_name = c.name
-                            JOIN
-                                all_part_tables t
-                            ON p1.table_owner = t.owner
-                                AND p1.table_name = t.table_name
-                            WHERE
-                                p1.table_owner = '{self.source_schema.upper()}'
-                                AND p1.table_name = '{table_name}'
-                            ORDER BY
-                                p1.partition_position
-                            '''
-        else:
-            sql_query = f'''
-                           SELECT
-                                p1.table_owner AS table_owner,
-                                p1.table_name AS table_name,
-                                p1.high_value AS high_value,
-                                p1.partition_name AS partition_name,
-                                c.column_name AS column_name,
-                                p1.tablespace_name AS tablespace_name,
-                                t.partitioning_type AS partition_type,
-                                (SELECT COUNT(*)
-                                FROM all_tab_partitions apt
-                                WHERE apt.table_owner = p1.table_owner
-                                AND apt.table_name = p1.table_name
-                                ) AS partition_count,
-                                p2.high_value AS min_value,
-                                p1.high_value AS max_value,
-                                p1.partition_position AS partition_position
-                            FROM
-                                all_tab_partitions p1
-                            LEFT JOIN
-                                all_tab_partitions p2
-                            ON p1.PARTITION_position = p2.PARTITION_position + 1
-                                AND p1.table_owner = p2.table_owner
-                                AND p1.table_name = p2.table_name
-                            JOIN
-                                all_part_key_columns c
-                            ON p1.table_owner = c.owner
-                                AND p1.table_name = c.name
-                            JOIN
-                                all_part_tables t
-                            ON p1.table_owner = t.owner
-                                AND p1.table_name = t.table_name
-                            WHERE
-                                p1.table_owner = '{self.username.upper()}'
-                                AND p1.table_name = '{table_name}'
-                            ORDER BY
-                                p1.partition_position
-                            '''
-        
-        temp_col = []
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            all_records = cursor.fetchall()
-            for record in all_records:
-                record = ['null' if each is None else each for each in record]
-                temp_col.append({
-                    "table_owner": record[0],
-                    "table_name": record[1],
-                    "high_value": record[2],
-                    "partition_name": record[3],
-                    "column_name": record[4],
-                    "tablespace_name": record[5],
-                    "partition_type": record[6],
-                    "partition_count": record[7],
-                    "min_value":record[8],
-                    "max_value":record[9],
-                    "partition_position":record[10],
-                    "selected":False,
-                    "dropped":False
-                })
-        return temp_col
-
-    def table_count(self, table_name, where_clause=None):
-        try:
-            records_count = 0
-            if table_name is not None:
-                sql = f"select /*+ parallel(16)*/ count(1) from  {table_name}"
-                if where_clause is not None:
-                    sql = sql + f"\n {where_clause}"
-            with self.connection.cursor() as cursor:
-                cursor.execute(sql)
-                data = cursor.fetchone()
-                records_count = data[0]
-            return records_count
-        except Exception as err:
-            return None
-
-    def find_table(self, table_name):
-        """it check the table is exits or Not 
-        Parameters
-        ----------
-        table_name : str
-            it contain the name Of Table Name 
-
-        Returns
-        -------
-        result :  bool
-            it return the true/false based on table is exits or not. 
-        """
-        print(f"from oracle databse named '{self.database_name}', user try to find the table '{table_name}'", )
-        sql = f"SELECT count(1) FROM USER_TABLES where table_name = '{table_name.upper()}'"
-        table_count = 0
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql)
-            data = cursor.fetchone()
-            table_count = data[0]
-        if table_count == 0:
-            return True
-        else:
-            return False
-
-    def create_table(self, sql_query, table_create=False):
-        result = None
-        print("---------------------Sql Query", sql_query)
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            if table_create:
-                self.connection.commit()
-            else:
-                data = cursor.fetchone()
-                result = data[0]
-
-        return result
-    
-    def calculate_checksum(self, sql_query):
-        result = []
-        print("---------------------Sql Query", sql_query)
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            checksum_all = cursor.fetchall()
-            for each in checksum_all:
-                result.append(each[0])
-        return result
-    
-    def find_min_max_value(self, table_name, column_name):
-        print("table_name, --------------", table_name, "column_name+++++++",column_name)
-        sql_query=f'SELECT min({column_name}) AS min_value, max({column_name}) AS max_value FROM {table_name}'
-        result={}
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            temp_result = cursor.fetchall()
-
-            for each in temp_result:
-                temp = ['null' if e is None else e for e in each ]
-                result={"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
-                
-        return result
-
-    def delete_table(self, sql_query):
-        result = None
-        print("-----------delete_table----------------", sql_query)
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            self.connection.commit()
-        return result
-    
-    def connection_close(self):
-        self.connection.close()
-
-    def table_space(self, table_name):
-        try:
-            if table_name is not None:
-                sql = f"SELECT Nvl(SUM(bytes)/1024,0) FROM user_segments WHERE segment_name= '{table_name}'"
-                print(sql)
-            with self.connection.cursor() as cursor:
-                cursor.execute(sql)
-                data = cursor.fetchone()
-                print(data)
-                records_count = data[0]
-                print(records_count)
-            return records_count
-        except Exception as err:
-            raise err
+from db_arrow import cursor_to_arrow
+from db_factory import lazy_import
+from db_metadata import compact_record
+from db_profile import profile_table
+from db_pool import pool_registry, run_with_pool
+from db_queries import StatementCache, bind_query, query_registry, update_table_index
+from db_stats import checksum_stream, count_estimate, split_table_name, table_min_max, add_segment_size, table_spaces_result
+
+oracledb = lazy_import('oracledb')
+
+
+class OracleConectionManger:
+    """
+    this class for oracle database.
+    """
+
+    dialect = 'oracle'
+
+    def __init__(self, connection_info) -> None:
+        print("=====db======", connection_info)
+        """
+        initialize value connection details and create the connection with oracle database
+        """
+        self.host_address = connection_info.get('host_address', None)
+        self.port_number = connection_info.get('port_number', None)
+        self.database_name = connection_info.get('database_name', None)
+        self.schema_name = connection_info.get('schema_name', None)
+        self.username = connection_info.get('username', None)
+        self.password = connection_info.get('password', None)
+        self.source_schema = connection_info.get('source_schema', None)
+        self.connection_info = connection_info
+        self.statements = StatementCache(self.prepare_statement, lambda cursor: cursor.close(),
+                                         int(connection_info.get('statement_cache_size', 64)))
+        self._table_index = None
+        self.use_pool = connection_info.get('use_pool', False)
+        if self.use_pool:
+            self.pool = pool_registry.get_pool(self.__class__.__name__, connection_info, self.create_connection)
+            err, self.connection = self.pool.acquire()
+        else:
+            err, self.connection = self.create_connection()
+        if self.connection is None:
+            print(f"Connection creation geting error {err}")
+            raise Exception(err)
+        else:
+            print("Connection has been created")
+            
+    def create_connection(self):
+        """ Connect to the oracle Server database server """
+        con = None
+        err = None
+        try:
+            params = {
+                'dsn': f'{self.host_address}:{self.port_number}/{self.database_name}',
+                'user': self.username,
+                'password': self.password,
+                # client side cache of parsed statements, saves the soft parse of repeated texts
+                'stmtcachesize': int(self.connection_info.get('statement_cache_size', 64))}
+            con = oracledb.connect(**params)
+        except Exception as err:
+            return err, con
+        return err, con
+
+    def connection_pool(self):
+        """pool used for parallel work, the registry pool of this connection even when use_pool is off."""
+        if self.use_pool:
+            return self.pool
+        return pool_registry.get_pool(self.__class__.__name__, self.connection_info, self.create_connection)
+
+    def metadata_details(self, table_name=None, compact=False):
+        """Fetches the metadata for a particular connection.
+        
+        Parameters
+        ----------
+        table_name : str
+            Name of the table.
+        compact : bool
+            return db_metadata descriptors (__slots__ records, interned strings) instead of dicts,
+            to_dict() gives the dict back.
+        
+        Returns
+        -------
+        meta_data_details : list
+            List containing all the details related to the table.
+        """
+        meta_data_details = []
+        if table_name is None:
+            if self.source_schema:
+                sql_table = f"SELECT table_name FROM all_tables WHERE owner ='{self.source_schema.upper()}'"
+            else:
+                sql_table = "SELECT table_name FROM USER_TABLES"
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql_table)
+                table_names = [result[0] for result in cursor.fetchall()]
+            # harvest the whole owner once per catalog view instead of once per table
+            column_map = self.fetch_schema_table_details()
+            constraint_map = self.fetch_schema_primary_key_constraint()
+            foreign_key_map = self.fetch_schema_foreign_key_constraint()
+            index_map = self.fetch_schema_index_constraint()
+            partition_map = self.fetch_schema_partition_information()
+            for each_table in table_names:
+                temp = {
+                    'table_schema': self.source_schema.lower() if self.source_schema else self.username.lower(),
+                    'table_name': each_table,
+                    'column_detail': column_map.get(each_table, []),
+                    'constraint_details': constraint_map.get(each_table, []) + foreign_key_map.get(each_table, []),
+                    'index_details': index_map.get(each_table, []),
+                    'partition_json': partition_map.get(each_table, [])
+                }
+                meta_data_details.append(compact_record(temp) if compact else temp)
+        else:
+            temp = {
+                'table_schema': self.source_schema.lower() if self.source_schema else self.username.lower(),
+                'table_name': table_name,
+                'column_detail': self.fetch_table_details(table_name),
+                'constraint_details': self.fetch_primary_key_constraint(table_name),
+                'index_details': self.fetch_index_constraint(table_name),
+                'partition_json': self.fetch_partition_information(table_name)
+            }
+            meta_data_details.append(compact_record(temp) if compact else temp)
+        return meta_data_details
+
+    def ddl_markers(self):
+        """table name -> DDL change marker (all_objects.last_ddl_time of the table and its partitions), one catalog query for the whole schema."""
+        owner = self.source_schema.upper() if self.source_schema else self.username.upper()
+        sql = """SELECT object_name, TO_CHAR(MAX(last_ddl_time), 'YYYY-MM-DD HH24:MI:SS')
+                 FROM all_objects
+                 WHERE owner = $owner AND object_type IN ('TABLE', 'TABLE PARTITION')
+                 GROUP BY object_name"""
+        return {name: str(marker) for name, marker in self.execute_bound(sql, {'owner': owner})}
+
+    def prepare_statement(self, sql_query):
+        """cursor prepared for one statement text, kept in self.statements."""
+        cursor = self.connection.cursor()
+        cursor.prepare(sql_query)
+        return cursor
+
+    def execute_bound(self, sql_query, values=None):
+        """Runs a select written with $name markers, the values are sent as bind variables.
+
+        Parameters
+        ----------
+        sql_query : str
+            select with $name (or '$name') where a value goes, table and column names can not be bound.
+        values : dict
+            value of every marker.
+
+        Returns
+        -------
+        rows : list
+            tuples of the result.
+        """
+        sql_query, params = bind_query(sql_query, self.dialect, values or {})
+        cursor = self.statements.get(sql_query)
+        cursor.execute(None, params)
+        return cursor.fetchall()
+
+    def catalog_rows(self, query_name, **values):
+        """rows of a catalog query of the registry, values are sent as bind variables."""
+        return self.execute_bound(query_registry.template(self.dialect, query_name), values)
+
+    def fetch_table_details(self, table_name):
+        temp_col = []
+        owner = self.source_schema.upper() if self.source_schema else self.username.upper()
+        for column_details in self.catalog_rows('table_columns', owner=owner, table_name=table_name):
+            column_details = ['null' if each is None else each for each in column_details]
+            temp_col.append({
+                "column_name": column_details[0],
+                "DATA_TYPE": column_details[1],
+                "is_nullable": column_details[2],
+                "COLUMN_DEFAULT": column_details[3],
+                "DATA_LENGTH": column_details[4],
+                "DATA_PRECISION": column_details[5],
+                "DATA_SCALE": column_details[6]
+            })
+        return temp_col
+
+    def fetch_primary_key_constraint(self, table_name):
+        temp_col = []
+        owner = self.source_schema.upper() if self.source_schema else self.username.upper()
+        for column_details in self.catalog_rows('primary_key_constraints', owner=owner, table_name=table_name):
+            column_details = ['null' if each is None else each for each in column_details]
+            temp_col.append({"table_name": column_details[0], "column_name": column_details[1],
+                             "position": column_details[2], "status": column_details[3],
+                             "owner": column_details[4], "constraint_name": column_details[5],
+                             "constraint_type": column_details[6], 'search_condition': column_details[7]})
+
+        return temp_col + self.fetch_foreign_key_constraint(table_name)
+
+    def fetch_foreign_key_constraint(self, table_name):
+        temp_col = []
+        owner = self.source_schema.upper() if self.source_schema else self.username.upper()
+        for column_details in self.catalog_rows('foreign_key_constraints', owner=owner, table_name=table_name):
+            column_details = ['null' if each is None else each for each in column_details]
+            temp_col.append({"constraint_name": column_details[0], "table_name": column_details[1],
+                             "column_name": column_details[2],
+                             "owner": column_details[3], "r_table_name": column_details[4],
+                             "r_column_name": column_details[5], "r_owner": column_details[6],
+                             "constraint_type": column_details[7]})
+        return temp_col
+
+    def fetch_index_constraint(self, table_name):
+        temp_col = []
+        owner = self.source_schema.upper() if self.source_schema else self.username.upper()
+        for column_details in self.catalog_rows('unique_indexes', owner=owner, table_name=table_name):
+            temp_col.append({"table_owner": column_details[0], "table_name": column_details[1],
+                             "column_name": column_details[2],
+                             "index_name": column_details[3], "index_type": column_details[4]})
+        return temp_col
+
+    def fetch_partition_information(self, table_name, owner=None):
+        temp_col = []
+        owner = (owner or self.source_schema or self.username).upper()
+        for record in self.catalog_rows('partitions', owner=owner, table_name=table_name):
+            record = ['null' if each is None else each for each in record]
+            temp_col.append({
+                "table_owner": record[0],
+                "table_name": record[1],
+                "high_value": record[2],
+                "partition_name": record[3],
+                "column_name": record[4],
+                "tablespace_name": record[5],
+                "partition_type": record[6],
+                "partition_count": record[7],
+                "min_value":record[8],
+                "max_value":record[9],
+                "partition_position":record[10],
+                "selected":False,
+                "dropped":False
+            })
+        return temp_col
+
+    def fetch_schema_table_details(self):
+        """Fetches the column details of every table of the owner in one query.
+
+        Returns
+        -------
+        column_map : dict
+            table name -> list of column details, same shape as ``fetch_table_details``.
+        """
+        owner = self.source_schema.upper() if self.source_schema else self.username.upper()
+        sql_col_detail = f"""
+                SELECT table_name, column_name, DATA_TYPE, NULLABLE, DATA_DEFAULT, DATA_LENGTH, DATA_PRECISION, DATA_SCALE
+                FROM all_tab_columns
+                WHERE OWNER='{owner}'
+                ORDER BY table_name, column_id
+                """
+        column_map = {}
+        with self.connection.cursor() as cursor_tbl:
+            cursor_tbl.execute(sql_col_detail)
+            for column_details in cursor_tbl.fetchall():
+                column_details = ['null' if each is None else each for each in column_details]
+                column_map.setdefault(column_details[0], []).append({
+                    "column_name": column_details[1],
+                    "DATA_TYPE": column_details[2],
+                    "is_nullable": column_details[3],
+                    "COLUMN_DEFAULT": column_details[4],
+                    "DATA_LENGTH": column_details[5],
+                    "DATA_PRECISION": column_details[6],
+                    "DATA_SCALE": column_details[7]
+                })
+        return column_map
+
+    def fetch_schema_primary_key_constraint(self):
+        """Fetches the non foreign key constraints of every table of the owner in one query.
+
+        Returns
+        -------
+        constraint_map : dict
+            table name -> list of constraint details, same shape as ``fetch_primary_key_constraint``
+            without the foreign keys (see ``fetch_schema_foreign_key_constraint``).
+        """
+        owner = self.source_schema.upper() if self.source_schema else self.username.upper()
+        sql_col_detail = f'''SELECT cols.table_name,
+                                    cols.column_name, 
+                                    cols.position, 
+                                    cons.status, 
+                                    cons.owner, 
+                                    cons.CONSTRAINT_NAME , 
+                                    cons.CONSTRAINT_TYPE,
+                                    CASE WHEN cons.SEARCH_CONDITION IS NULL THEN ''  END AS SEARCH_CONDITION
+                            FROM all_constraints cons, all_cons_columns cols
+                            WHERE  cons.constraint_name = cols.constraint_name
+                                AND cons.owner=cols.owner
+                                AND cons.owner='{owner}'
+                                AND cons.CONSTRAINT_TYPE != 'R'
+                                ORDER BY cols.table_name, cols.position '''
+        constraint_map = {}
+        with self.connection.cursor() as cursor_tbl:
+            cursor_tbl.execute(sql_col_detail)
+            for column_details in cursor_tbl.fetchall():
+                column_details = ['null' if each is None else each for each in column_details]
+                constraint_map.setdefault(column_details[0], []).append({
+                    "table_name": column_details[0], "column_name": column_details[1],
+                    "position": column_details[2], "status": column_details[3],
+                    "owner": column_details[4], "constraint_name": column_details[5],
+                    "constraint_type": column_details[6], 'search_condition': column_details[7]})
+        return constraint_map
+
+    def fetch_schema_foreign_key_constraint(self):
+        """Fetches the foreign key constraints of every table of the owner in one query.
+
+        Returns
+        -------
+        constraint_map : dict
+            table name -> list of foreign key details, same shape as ``fetch_foreign_key_constraint``.
+        """
+        owner = self.source_schema.upper() if self.source_schema else self.username.upper()
+        sql_col_detail = f'''SELECT a.constraint_name,
+                                    a.table_name, 
+                                    a.column_name,  
+                                    c.owner, 
+                                    c_pk.table_name r_table_name,  
+                                    b.column_name r_column_name,
+                                    c_pk.owner r_owner,
+                                    c.constraint_type 
+                            FROM user_cons_columns a
+                            JOIN user_constraints c ON a.owner = c.owner
+                                AND a.constraint_name = c.constraint_name
+                            JOIN user_constraints c_pk ON c.r_owner = c_pk.owner
+                                AND c.r_constraint_name = c_pk.constraint_name
+                            JOIN user_cons_columns b ON C_PK.owner = b.owner
+                                AND  C_PK.CONSTRAINT_NAME = b.constraint_name AND b.POSITION = a.POSITION     
+                            WHERE c.constraint_type = 'R' AND  c.owner ='{owner}' '''
+        constraint_map = {}
+        with self.connection.cursor() as cursor_tbl:
+            cursor_tbl.execute(sql_col_detail)
+            for column_details in cursor_tbl.fetchall():
+                column_details = ['null' if each is None else each for each in column_details]
+                constraint_map.setdefault(column_details[1], []).append({
+                    "constraint_name": column_details[0], "table_name": column_details[1],
+                    "column_name": column_details[2],
+                    "owner": column_details[3], "r_table_name": column_details[4],
+                    "r_column_name": column_details[5], "r_owner": column_details[6],
+                    "constraint_type": column_details[7]})
+        return constraint_map
+
+    def fetch_schema_index_constraint(self):
+        """Fetches the unique indexes of every table of the owner in one query.
+
+        Returns
+        -------
+        index_map : dict
+            table name -> list of index details, same shape as ``fetch_index_constraint``.
+        """
+        owner = self.source_schema.upper() if self.source_schema else self.username.upper()
+        sql_col_detail = f'''select ind.table_owner, 
+                                    ind.table_name,
+                                    ind_col.column_name,
+                                    ind.index_name,
+                                    ind.index_type,
+                                    ind.table_type 
+                        from sys.all_indexes ind
+                        inner join sys.all_ind_columns ind_col
+                                on ind.owner = ind_col.index_owner
+                                and ind.index_name = ind_col.index_name
+                        where ind.uniqueness = 'UNIQUE' AND ind.owner ='{owner}' '''
+        index_map = {}
+        with self.connection.cursor() as cursor_tbl:
+            cursor_tbl.execute(sql_col_detail)
+            for column_details in cursor_tbl.fetchall():
+                index_map.setdefault(column_details[1], []).append({
+                    "table_owner": column_details[0], "table_name": column_details[1],
+                    "column_name": column_details[2],
+                    "index_name": column_details[3], "index_type": column_details[4]})
+        return index_map
+
+    def fetch_schema_partition_information(self):
+        """Fetches the partitions of every partitioned table of the owner in one query.
+
+        Returns
+        -------
+        partition_map : dict
+            table name -> list of partition details, same shape as ``fetch_partition_information``.
+        """
+        owner = self.source_schema.upper() if self.source_schema else self.username.upper()
+        sql_query = f'''
+                        SELECT
+                            p1.table_owner AS table_owner,
+                            p1.table_name AS table_name,
+                            p1.high_value AS high_value,
+                            p1.partition_name AS partition_name,
+                            c.column_name AS column_name,
+                            p1.tablespace_name AS tablespace_name,
+                            t.partitioning_type AS partition_type,
+                            COUNT(*) OVER (PARTITION BY p1.table_name, c.column_name) AS partition_count,
+                            p2.high_value AS min_value,
+                            p1.high_value AS max_value,
+                            p1.partition_position AS partition_position
+                        FROM
+                            all_tab_partitions p1
+                        LEFT JOIN
+                            all_tab_partitions p2
+                        ON p1.PARTITION_position = p2.PARTITION_position + 1
+                            AND p1.table_owner = p2.table_owner
+                            AND p1.table_name = p2.table_name
+                        JOIN
+                            all_part_key_columns c
+                        ON p1.table_owner = c.owner
+                            AND p1.table_name = c.name
+                        JOIN
+                            all_part_tables t
+                        ON p1.table_owner = t.owner
+                            AND p1.table_name = t.table_name
+                        WHERE
+                            p1.table_owner = '{owner}'
+                        ORDER BY
+                            p1.table_name, p1.partition_position
+                        '''
+        partition_map = {}
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            for record in cursor.fetchall():
+                record = ['null' if each is None else each for each in record]
+                partition_map.setdefault(record[1], []).append({
+                    "table_owner": record[0],
+                    "table_name": record[1],
+                    "high_value": record[2],
+                    "partition_name": record[3],
+                    "column_name": record[4],
+                    "tablespace_name": record[5],
+                    "partition_type": record[6],
+                    "partition_count": record[7],
+                    "min_value":record[8],
+                    "max_value":record[9],
+                    "partition_position":record[10],
+                    "selected":False,
+                    "dropped":False
+                })
+        return partition_map
+
+    def table_count(self, table_name, where_clause=None, estimate=False, max_stats_age_days=7):
+        if estimate and where_clause is None:
+            return self.table_count_estimate(table_name, max_stats_age_days)['row_count']
+        try:
+            records_count = 0
+            if table_name is not None:
+                sql = f"select /*+ parallel(16)*/ count(1) from  {table_name}"
+                if where_clause is not None:
+                    sql = sql + f"\n {where_clause}"
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql)
+                data = cursor.fetchone()
+                records_count = data[0]
+            return records_count
+        except Exception as err:
+            return None
+
+    def table_count_by_partition(self, table_name, max_workers=4):
+        """Counts the rows of a partitioned table with one count per partition run in parallel.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table, optionally prefixed by the owner.
+        max_workers : int
+            number of partitions counted at the same time, each on its own pooled connection.
+
+        Returns
+        -------
+        result : dict
+            row_count (sum of all partitions) and partitions (partition name -> count),
+            partitions is empty when the table is not partitioned.
+        """
+        slices = self.partition_slices(table_name)
+        if not slices:
+            return {'row_count': self.table_count(table_name), 'partitions': {}}
+
+        def count_partition(connection, partition_name):
+            with connection.cursor() as cursor:
+                cursor.execute(f"select count(1) from {slices[partition_name][0]}")
+                return cursor.fetchone()[0]
+
+        partitions = run_with_pool(self.connection_pool(), count_partition, list(slices), max_workers)
+        return {'row_count': sum(partitions.values()), 'partitions': partitions}
+
+    def partition_slices(self, table_name):
+        """Splits a partitioned table into one slice per partition, from fetch_partition_information.
+
+        Returns
+        -------
+        slices : dict
+            partition name -> (from clause, where clause), the where clause is None for Oracle;
+            empty when the table is not partitioned.
+        """
+        owner, name = split_table_name(table_name)
+        slices = {}
+        for partition in self.fetch_partition_information(name.upper(), owner):
+            slices[partition['partition_name']] = (f"{table_name} partition ({partition['partition_name']})", None)
+        return slices
+
+    def table_count_estimate(self, table_name, max_stats_age_days=7):
+        """Returns the row count of the table from the optimizer statistics (all_tab_statistics.num_rows).
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table, optionally prefixed by the owner.
+        max_stats_age_days : float
+            statistics older than this (or flagged STALE_STATS) fall back to an exact count.
+
+        Returns
+        -------
+        result : dict
+            row_count, estimated (False when count(1) was used), last_analyzed, stats_age_days, stale.
+        """
+        owner, name = split_table_name(table_name, self.source_schema or self.username)
+        sql = f"""SELECT num_rows, last_analyzed, stale_stats FROM all_tab_statistics
+                  WHERE owner = '{owner.upper()}' AND table_name = '{name.upper()}' AND object_type = 'TABLE'"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+            data = cursor.fetchone()
+        if data is None:
+            result = count_estimate(None, None, max_stats_age_days)
+        else:
+            result = count_estimate(data[0], data[1], max_stats_age_days, stale=data[2] == 'YES')
+        if result['stale']:
+            result['row_count'] = self.table_count(table_name)
+            result['estimated'] = False
+        return result
+
+    def find_table(self, table_name):
+        """it check the table is exits or Not 
+        Parameters
+        ----------
+        table_name : str
+            it contain the name Of Table Name 
+
+        Returns
+        -------
+        result :  bool
+            it return the true/false based on table is exits or not. 
+        """
+        print(f"from oracle databse named '{self.database_name}', user try to find the table '{table_name}'", )
+        sql = "SELECT count(1) FROM USER_TABLES where table_name = $table_name"
+        table_count = self.execute_bound(sql, {'table_name': table_name.upper()})[0][0]
+        if table_count == 0:
+            return True
+        else:
+            return False
+
+    def table_names(self, refresh=False):
+        """Names of the tables of USER_TABLES (upper case), where find_table looks.
+
+        Read with one query on first use (or refresh=True), then kept up to date by create_table and
+        delete_table of this manager.
+        """
+        if self._table_index is None or refresh:
+            sql = "SELECT table_name FROM USER_TABLES"
+            self._table_index = {row[0] for row in self.execute_bound(sql)}
+        return self._table_index
+
+    def find_tables(self, names, refresh=False):
+        """Checks the existence of any number of tables with at most one catalog query.
+
+        Parameters
+        ----------
+        names : list
+            table names.
+        refresh : bool
+            read the catalog again instead of the names known to this manager.
+
+        Returns
+        -------
+        result : dict
+            table name -> True when the table exists (unlike find_table, which returns True when it is missing).
+        """
+        table_index = self.table_names(refresh)
+        return {name: name.upper() in table_index for name in names}
+
+    def create_table(self, sql_query, table_create=False):
+        result = None
+        print("---------------------Sql Query", sql_query)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            if table_create:
+                self.connection.commit()
+                self._table_index = update_table_index(self._table_index, sql_query, fold=str.upper,
+                                                       schema=self.username.upper())
+            else:
+                data = cursor.fetchone()
+                result = data[0]
+
+        return result
+    
+    def calculate_checksum(self, sql_query):
+        result = []
+        print("---------------------Sql Query", sql_query)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            checksum_all = cursor.fetchall()
+            for each in checksum_all:
+                result.append(each[0])
+        return result
+    
+    def iter_checksum(self, sql_query, batch_size=10000):
+        """Yields the row hashes of the checksum query batch by batch instead of building a list.
+
+        Parameters
+        ----------
+        sql_query : str
+            checksum query, the hash is the first selected column.
+        batch_size : int
+            rows fetched per round trip (cursor arraysize / prefetchrows).
+        """
+        print("---------------------Sql Query", sql_query)
+        with self.connection.cursor() as cursor:
+            cursor.arraysize = batch_size
+            cursor.prefetchrows = batch_size + 1
+            cursor.execute(sql_query)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for each in rows:
+                    yield each[0]
+
+    def calculate_checksum_stream(self, sql_query, batch_size=10000):
+        """Folds the row hashes of the checksum query into one running sha256, see db_stats.checksum_stream."""
+        return checksum_stream(self.iter_checksum(sql_query, batch_size))
+
+    def find_min_max_value(self, table_name, column_name):
+        print("table_name, --------------", table_name, "column_name+++++++",column_name)
+        sql_query=f'SELECT min({column_name}) AS min_value, max({column_name}) AS max_value FROM {table_name}'
+        result={}
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            temp_result = cursor.fetchall()
+
+            for each in temp_result:
+                temp = ['null' if e is None else e for e in each ]
+                result={"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
+                
+        return result
+
+    def delete_table(self, sql_query):
+        result = None
+        print("-----------delete_table----------------", sql_query)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            self.connection.commit()
+        self._table_index = update_table_index(self._table_index, sql_query, fold=str.upper,
+                                               schema=self.username.upper())
+        return result
+    
+    def connection_close(self):
+        if self.connection is None:
+            return
+        self.statements.clear()
+        if self.use_pool:
+            self.pool.release(self.connection)
+        else:
+            self.connection.close()
+        self.connection = None
+
+    def table_space(self, table_name):
+        try:
+            if table_name is not None:
+                sql = "SELECT Nvl(SUM(bytes)/1024,0) FROM user_segments WHERE segment_name = $table_name"
+                print(sql)
+            data = self.execute_bound(sql, {'table_name': table_name})[0]
+            print(data)
+            records_count = data[0]
+            print(records_count)
+            return records_count
+        except Exception as err:
+            raise err
+
+    def table_spaces(self):
+        """Size of every table of the schema from one aggregated user_segments query.
+
+        Index segments are attributed to their table through user_indexes and LOB segments through
+        user_lobs; table, index and LOB partitions are summed per partition name.
+
+        Returns
+        -------
+        result : dict
+            table name -> table_bytes, index_bytes, lob_bytes, total_bytes and partitions
+            (partition name -> bytes, empty when the table is not partitioned).
+        """
+        sql = """SELECT table_name, kind, partition_name, SUM(bytes)
+                 FROM (SELECT COALESCE(i.table_name, l.table_name, s.segment_name) AS table_name,
+                              CASE WHEN s.segment_type LIKE 'INDEX%' THEN 'index'
+                                   WHEN s.segment_type LIKE 'LOB%' THEN 'lob'
+                                   ELSE 'table' END AS kind,
+                              COALESCE(lp.partition_name, s.partition_name) AS partition_name, s.bytes
+                       FROM user_segments s
+                       LEFT JOIN user_indexes i ON s.segment_type LIKE 'INDEX%' AND i.index_name = s.segment_name
+                       LEFT JOIN user_lobs l ON s.segment_type LIKE 'LOB%'
+                                            AND s.segment_name IN (l.segment_name, l.index_name)
+                       LEFT JOIN user_lob_partitions lp ON s.segment_type = 'LOB PARTITION'
+                                                       AND lp.lob_name = s.segment_name
+                                                       AND lp.lob_partition_name = s.partition_name
+                       WHERE s.segment_type NOT IN ('ROLLBACK', 'TYPE2 UNDO', 'CLUSTER', 'NESTED TABLE'))
+                 GROUP BY table_name, kind, partition_name"""
+        spaces = {}
+        for table_name, kind, partition_name, size in self.execute_bound(sql):
+            add_segment_size(spaces, table_name, kind, size, partition_name)
+        return table_spaces_result(spaces)
+
+    def find_min_max_values(self, table_name, columns=None):
+        """min and max of several columns with a single scan of the table, see db_stats.table_min_max."""
+        return table_min_max(self, table_name, columns)
+
+    def fetch_rows(self, sql_query):
+        """run a select and return all rows as tuples."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            return cursor.fetchall()
+
+    def iter_rows(self, sql_query, batch_size=10000):
+        """run a select and yield its rows, fetched batch_size rows per round trip."""
+        with self.connection.cursor() as cursor:
+            cursor.arraysize = batch_size
+            cursor.execute(sql_query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def query_arrow(self, sql_query, batch_size=10000):
+        """Runs a select and returns its result as a pyarrow.Table.
+
+        oracledb 2.5+ builds the Arrow columns natively (fetch_df_all), older versions fall back
+        to building them column wise batch by batch.
+        """
+        if hasattr(self.connection, 'fetch_df_all'):
+            import pyarrow
+            odf = self.connection.fetch_df_all(statement=sql_query, arraysize=batch_size)
+            return pyarrow.Table.from_arrays(odf.column_arrays(), names=odf.column_names())
+        with self.connection.cursor() as cursor:
+            cursor.arraysize = batch_size
+            cursor.execute(sql_query)
+            return cursor_to_arrow(cursor, batch_size)
+
+    def profile_columns(self, table_name, columns=None, sample_percent=None):
+        """Profiles null counts, distinct counts and value lengths of the columns, see db_profile.profile_table.
+
+        Returns
+        -------
+        result : dict
+            column name -> ColumnProfile
+        """
+        return profile_table(self, table_name, columns, sample_percent)
+
+    def bulk_insert(self, table_name, columns, rows):
+        """Inserts the rows into the table with array DML (executemany), the batch is committed once.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the target table.
+        columns : list
+            column names, in the order of the values of each row.
+        rows : list
+            rows as tuples.
+
+        Returns
+        -------
+        result : int
+            number of rows inserted.
+        """
+        placeholders = ', '.join(f":{index + 1}" for index in range(len(columns)))
+        sql_query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        with self.connection.cursor() as cursor:
+            cursor.executemany(sql_query, rows)
+        self.connection.commit()
+        return len(rows)
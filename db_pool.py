@@ -0,0 +1,240 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+POOL_CONFIG_KEYS = ('use_pool', 'pool_min_size', 'pool_max_size', 'pool_idle_timeout', 'pool_wait_timeout')
+
+
+def connection_fingerprint(dialect, connection_info):
+    """Build the registry key for a connection.
+
+    Parameters
+    ----------
+    dialect : str
+        name of the manager class (two dialects never share a pool).
+    connection_info : dict
+        connection details passed to the manager.
+
+    Returns
+    -------
+    fingerprint : str
+        sha256 of the dialect and the connection details, pool settings excluded.
+    """
+    details = {key: value for key, value in connection_info.items() if key not in POOL_CONFIG_KEYS}
+    raw = json.dumps({'dialect': dialect, 'connection_info': details}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ConnectionPool:
+    """
+    this class keeps physical connections of one database so managers can borrow and return them.
+    """
+
+    def __init__(self, create_connection, close_connection=None, reset_connection=None,
+                 min_size=0, max_size=5, idle_timeout=300, wait_timeout=30) -> None:
+        """
+        create_connection must follow the managers convention and return (err, connection).
+        """
+        self.create_connection = create_connection
+        self.close_connection = close_connection or (lambda con: con.close())
+        self.reset_connection = reset_connection or (lambda con: con.rollback())
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self._idle = []
+        self._size = 0
+        self._condition = threading.Condition()
+        self._stats = {'created': 0, 'borrowed': 0, 'returned': 0, 'evicted': 0, 'waits': 0, 'errors': 0}
+        for _ in range(self.min_size):
+            err, con = self.create_connection()
+            if con is None:
+                break
+            self._size += 1
+            self._stats['created'] += 1
+            self._idle.append((con, time.monotonic()))
+
+    def _evict_idle(self):
+        """close the connections idle for longer than idle_timeout, keeping min_size alive."""
+        if not self.idle_timeout:
+            return
+        now = time.monotonic()
+        keep = []
+        for con, released_at in self._idle:
+            if now - released_at > self.idle_timeout and self._size > self.min_size:
+                self._size -= 1
+                self._stats['evicted'] += 1
+                try:
+                    self.close_connection(con)
+                except Exception:
+                    pass
+            else:
+                keep.append((con, released_at))
+        self._idle = keep
+
+    def acquire(self):
+        """borrow a connection, opening a new one only when no idle connection is left.
+
+        Returns
+        -------
+        result : tuple
+            (err, connection), connection is None when it can not be created.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        with self._condition:
+            while True:
+                self._evict_idle()
+                if self._idle:
+                    con, _ = self._idle.pop()
+                    self._stats['borrowed'] += 1
+                    return None, con
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return Exception(f"connection pool exhausted, max_size is {self.max_size}"), None
+                self._stats['waits'] += 1
+                self._condition.wait(remaining)
+        err, con = self.create_connection()
+        with self._condition:
+            if con is None:
+                self._size -= 1
+                self._stats['errors'] += 1
+                self._condition.notify()
+            else:
+                self._stats['created'] += 1
+                self._stats['borrowed'] += 1
+        return err, con
+
+    def release(self, con):
+        """return a borrowed connection, it is rolled back and closed if it can not be reused."""
+        if con is None:
+            return
+        with self._condition:
+            if any(idle is con for idle, _ in self._idle):
+                # released twice, e.g. connection_close called again on the same manager
+                return
+        try:
+            self.reset_connection(con)
+        except Exception:
+            self.discard(con)
+            return
+        with self._condition:
+            self._idle.append((con, time.monotonic()))
+            self._stats['returned'] += 1
+            self._condition.notify()
+
+    def discard(self, con):
+        """close a borrowed connection instead of returning it, e.g. after a network error."""
+        try:
+            self.close_connection(con)
+        except Exception:
+            pass
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def close(self):
+        """close every idle connection of the pool."""
+        with self._condition:
+            for con, _ in self._idle:
+                self._size -= 1
+                try:
+                    self.close_connection(con)
+                except Exception:
+                    pass
+            self._idle = []
+
+    def stats(self):
+        with self._condition:
+            self._evict_idle()
+            result = dict(self._stats)
+            result.update({'size': self._size,
+                           'idle': len(self._idle),
+                           'in_use': self._size - len(self._idle),
+                           'min_size': self.min_size,
+                           'max_size': self.max_size})
+        return result
+
+
+def run_with_pool(pool, func, items, max_workers=4):
+    """run func(connection, item) for every item in parallel, each call on a connection borrowed from the pool.
+
+    Returns
+    -------
+    result : dict
+        item -> value returned by func.
+    """
+    def worker(item):
+        err, con = pool.acquire()
+        if con is None:
+            raise Exception(err)
+        try:
+            result = func(con, item)
+        except Exception:
+            pool.discard(con)
+            raise
+        pool.release(con)
+        return result
+
+    items = list(items)
+    # connections already borrowed (e.g. the one of the calling manager) are not available to the workers
+    available = pool.max_size - pool.stats()['in_use']
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, available))) as executor:
+        return dict(zip(items, executor.map(worker, items)))
+
+
+class PoolRegistry:
+    """
+    process wide registry of ConnectionPool keyed by the connection_info fingerprint.
+    """
+
+    def __init__(self) -> None:
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def get_pool(self, dialect, connection_info, create_connection, close_connection=None, reset_connection=None):
+        """return the pool of this connection, it is created on first use.
+
+        Parameters
+        ----------
+        dialect : str
+            name of the manager class.
+        connection_info : dict
+            connection details, pool_min_size / pool_max_size / pool_idle_timeout / pool_wait_timeout
+            configure the pool when it is created.
+        create_connection : callable
+            returns (err, connection).
+        """
+        fingerprint = connection_fingerprint(dialect, connection_info)
+        with self._lock:
+            pool = self._pools.get(fingerprint)
+            if pool is None:
+                pool = ConnectionPool(create_connection,
+                                      close_connection=close_connection,
+                                      reset_connection=reset_connection,
+                                      min_size=int(connection_info.get('pool_min_size', 0)),
+                                      max_size=int(connection_info.get('pool_max_size', 5)),
+                                      idle_timeout=float(connection_info.get('pool_idle_timeout', 300)),
+                                      wait_timeout=float(connection_info.get('pool_wait_timeout', 30)))
+                self._pools[fingerprint] = pool
+        return pool
+
+    def stats(self):
+        with self._lock:
+            pools = dict(self._pools)
+        return {fingerprint: pool.stats() for fingerprint, pool in pools.items()}
+
+    def close_all(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            pool.close()
+
+
+pool_registry = PoolRegistry()
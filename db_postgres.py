@@ -1,184 +1,496 @@
-import psycopg2
-from string import Template
-import os
-from tantor.logs.t_logging  import logger 
-
-class PostgresConectionManger:
-    """
-    this class for postgres database.
-    """
-
-    def __init__(self, connection_info) -> None:
-        """
-        initalize value connection details and create the connection with oracle database
-        """
-        self.host_address = connection_info.get('host_address', '')
-        self.port_number = connection_info.get('port_number', '5432')
-        self.database_name = connection_info.get('database_name', '')
-        self.user_name= connection_info.get('username','')
-        self.schema_name = connection_info.get('schema_name', 'public')
-        self.password = connection_info.get('password', '')
-        self.source_schema = connection_info.get('source_schema', None)
-        err, self.connection = self.create_connection()
-        if self.connection is None:
-            raise Exception(err)
-
-
-    def create_connection(self):
-        """ Connect to the oracle Server database server """
-        con = None
-        err = None
-        try:
-            params = {
-                "host": self.host_address,
-                "database": self.database_name,
-                "user": self.user_name,
-                "password": self.password,
-                "port": self.port_number,  # Default is 5432 for Postgres SQL
-                
-            }
-            con = psycopg2.connect(**params)
-        except Exception as err:
-            logger.error(f"can not connect to postgres beacuse of {err}")
-            return err, con
-        return err, con
-
-    def metadata_details(self, table_name):
-        meta_data_details = []
-        if table_name is None:
-            sql_table = f"SELECT table_name FROM information_schema.tables where TABLE_CATALOG ='{self.database_name.lower()}' and table_schema = 'public' and table_type = 'BASE TABLE'"
-            logger.info(f'sql query for List of Table: {sql_table}')
-            with self.connection.cursor() as cursor:
-                cursor.execute(sql_table)
-                for result in cursor.fetchall():
-                    temp = {'table_schema': 'public', 
-                            'table_name': result[0], 
-                            'column_detail':self.fetch_table_details(result[0]),
-                            'constraint_details':{},
-                            'constraint_details':{}, 
-                            'index_details':{}, 
-                            'partition_json':{}}
-                    meta_data_details.append(temp)
-        else:
-            logger.info(f"fetch the table info for table name is {table_name}")
-            temp = { 'table_schema': 'public', 
-                    'table_name': table_name, 
-                    'column_detail':self.fetch_table_details(table_name),
-                    'constraint_details':{},
-                    'constraint_details':{},
-                    'index_details':{}, 
-                    'partition_json':{}}
-            meta_data_details.append(temp)
-        return meta_data_details
-
-    def fetch_table_details(self, table_name):
-        temp_col = []
-        with self.connection.cursor() as cursor_tbl:
-            with open('/opt/airflow/dags/tantor/metadata_detail/postgres_sql', 'r') as file:
-                temp_sql = file.read()
-            template = Template(temp_sql)
-            sql_col_detail = template.safe_substitute({'schema_name': self.schema_name, 'table_name': table_name})
-            cursor_tbl.execute(sql_col_detail)
-            column_details_list = cursor_tbl.fetchall()
-            for column_details in column_details_list:
-                column_details = ['null' if each is None else each for each in column_details]
-                temp_col.append({"column_name": column_details[1], "DATA_TYPE": column_details[2],
-                                 "is_nullable": column_details[3], "COLUMN_DEFAULT": column_details[4],
-                                 "DATA_LENGTH": column_details[5], "DATA_PRECISION": column_details[6],
-                                 "DATA_SCALE": column_details[7], "COLUMN_KEY": column_details[8]})
-
-        return temp_col
-
-    def table_count(self, table_name, where_clause=None):
-        try:
-            records_count = 0
-            if table_name is not None:
-                sql = f"select /*+ parallel(16)*/ count(1) from  {table_name}"
-                if where_clause is not None:
-                    sql = sql + f"\n {where_clause}"
-            with self.connection.cursor() as cursor:
-                cursor.execute(sql)
-                data = cursor.fetchone()
-                records_count = data[0]
-            return records_count
-        except Exception as err:
-            raise err
-
-    def find_table(self, table_name):
-        """it check the table is exits or Not 
-        Parameters
-        ----------
-        table_name : str
-            it contain the name Of Table Name 
-
-        Returns
-        -------
-        result :  bool
-            it return the true/false based on table is exits or not. 
-        """
-        sql = f"SELECT count(1) FROM information_schema.tables where table_name = '{table_name}'"
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql)
-            data = cursor.fetchone()
-            table_count = data[0]
-        if table_count == 0:
-            return True
-        else:
-            return False
-
-    def create_table(self, sql_query, table_create=False):
-        result = None
-        print(sql_query)
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            if table_create:
-                self.connection.commit()
-            else:
-                data = cursor.fetchone()
-                result = data[0]
-        return result
-
-    def detete_table(self, sql_query):
-        result = None
-        print(sql_query)
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            self.connection.commit()
-        return result
-    
-    def connection_close(self):
-        self.connection.close()
-
-    def find_min_max_value(self, table_name, column_name):
-        sql_query=f'SELECT min({column_name}) AS min_value, max({column_name}) AS max_value FROM {table_name}'
-        result={}
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            temp_result = cursor.fetchall()
-            for each in temp_result:
-                temp = ['null' if e is None else e for e in each ]
-                result={"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
-        return result
-    
-    
-    def table_space(self, table_name):
-        """it used to check the table space in Kbs 
-        Parameters
-        ----------
-        table_name : str
-            it contain the name Of Table Name 
-
-        Returns
-        -------
-        result :  integer
-            it return the integer value related to table space in kbs. 
-        """
-        table_space_kb=0
-        sql_query = f"SELECT pg_size_pretty ( pg_total_relation_size ('{table_name}') ) size"
-        print("----sql_query-------", sql_query)
-        with self.connection.cursor() as cursor:
-            cursor.execute(sql_query)
-            data = cursor.fetchone()
-            table_space_kb = data[0]
-        print("table space -------", table_space_kb)    
-        return table_space_kb
\ No newline at end of file
+import hashlib
+import io
+import itertools
+import os
+from db_arrow import cursor_to_arrow
+from db_factory import lazy_import
+from db_metadata import compact_record
+from db_profile import profile_table
+from db_pool import pool_registry
+from db_queries import StatementCache, bind_query, query_registry, update_table_index
+from db_stats import count_estimate, split_table_name, table_min_max, add_segment_size, table_spaces_result
+
+psycopg2 = lazy_import('psycopg2')
+logger = lazy_import('tantor.logs.t_logging', 'logger')
+
+# catalog SQL of fetch_table_details, $table_name / $schema_name are bind variables
+POSTGRES_SQL_PATH = '/opt/airflow/dags/tantor/metadata_detail/postgres_sql'
+# suffix of the server side cursor names, two open iterators of one connection need different names
+CURSOR_NUMBERS = itertools.count(1)
+
+
+def copy_text_value(value):
+    """format a value for COPY text format, None is written as \\N."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return '\\\\x' + bytes(value).hex()
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+class PostgresConectionManger:
+    """
+    this class for postgres database.
+    """
+
+    dialect = 'postgres'
+
+    def __init__(self, connection_info) -> None:
+        """
+        initalize value connection details and create the connection with oracle database
+        """
+        self.host_address = connection_info.get('host_address', '')
+        self.port_number = connection_info.get('port_number', '5432')
+        self.database_name = connection_info.get('database_name', '')
+        self.user_name= connection_info.get('username','')
+        self.schema_name = connection_info.get('schema_name', 'public')
+        self.password = connection_info.get('password', '')
+        self.source_schema = connection_info.get('source_schema', None)
+        self.postgres_sql_path = connection_info.get('postgres_sql_path', POSTGRES_SQL_PATH)
+        self.connection_info = connection_info
+        self.statements = StatementCache(self.prepare_statement, self.deallocate_statement,
+                                         int(connection_info.get('statement_cache_size', 64)))
+        self._server_statements = None
+        self._table_index = None
+        self.use_pool = connection_info.get('use_pool', False)
+        if self.use_pool:
+            self.pool = pool_registry.get_pool(self.__class__.__name__, connection_info, self.create_connection)
+            err, self.connection = self.pool.acquire()
+        else:
+            err, self.connection = self.create_connection()
+        if self.connection is None:
+            raise Exception(err)
+
+
+    def create_connection(self):
+        """ Connect to the oracle Server database server """
+        con = None
+        err = None
+        try:
+            params = {
+                "host": self.host_address,
+                "database": self.database_name,
+                "user": self.user_name,
+                "password": self.password,
+                "port": self.port_number,  # Default is 5432 for Postgres SQL
+                
+            }
+            con = psycopg2.connect(**params)
+        except Exception as err:
+            logger.error(f"can not connect to postgres beacuse of {err}")
+            return err, con
+        return err, con
+
+    def metadata_details(self, table_name=None, compact=False):
+        meta_data_details = []
+        if table_name is None:
+            sql_table = f"SELECT table_name FROM information_schema.tables where TABLE_CATALOG ='{self.database_name.lower()}' and table_schema = 'public' and table_type = 'BASE TABLE'"
+            logger.info(f'sql query for List of Table: {sql_table}')
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql_table)
+                for result in cursor.fetchall():
+                    temp = {'table_schema': 'public', 
+                            'table_name': result[0], 
+                            'column_detail':self.fetch_table_details(result[0]),
+                            'constraint_details':{},
+                            'constraint_details':{}, 
+                            'index_details':{}, 
+                            'partition_json':{}}
+                    meta_data_details.append(compact_record(temp) if compact else temp)
+        else:
+            logger.info(f"fetch the table info for table name is {table_name}")
+            temp = { 'table_schema': 'public', 
+                    'table_name': table_name, 
+                    'column_detail':self.fetch_table_details(table_name),
+                    'constraint_details':{},
+                    'constraint_details':{},
+                    'index_details':{}, 
+                    'partition_json':{}}
+            meta_data_details.append(compact_record(temp) if compact else temp)
+        return meta_data_details
+
+    def ddl_markers(self):
+        """table name -> DDL change marker (pg_class xmin and relfilenode, both change on ALTER / TRUNCATE / rewrite), one catalog query for the whole schema."""
+        sql = """SELECT c.relname, c.xmin::text || ':' || c.relfilenode::text
+                 FROM pg_class c
+                 JOIN pg_namespace n ON n.oid = c.relnamespace
+                 WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p')"""
+        return {name: str(marker) for name, marker in self.fetch_rows(sql)}
+
+    def prepare_statement(self, sql_query):
+        """Name of the server side prepared statement of a text, PREPAREd on this session if needed.
+
+        Prepared statements live as long as the session, so a pooled connection keeps the ones of
+        the previous borrowers; they are listed once from pg_prepared_statements.
+        """
+        name = 'bound_' + hashlib.sha1(sql_query.encode('utf-8')).hexdigest()[:16]
+        with self.connection.cursor() as cursor:
+            if self._server_statements is None:
+                cursor.execute("SELECT name FROM pg_prepared_statements")
+                self._server_statements = {row[0] for row in cursor.fetchall()}
+            if name not in self._server_statements:
+                cursor.execute(f"PREPARE {name} AS {sql_query}")
+                self._server_statements.add(name)
+        return name
+
+    def deallocate_statement(self, name):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DEALLOCATE {name}")
+        self._server_statements.discard(name)
+
+    def execute_bound(self, sql_query, values=None):
+        """Runs a select written with $name markers, the values are sent as bind variables.
+
+        Parameters
+        ----------
+        sql_query : str
+            select with $name (or '$name') where a value goes, table and column names can not be bound.
+        values : dict
+            value of every marker.
+
+        Returns
+        -------
+        rows : list
+            tuples of the result.
+        """
+        sql_query, params = bind_query(sql_query, self.dialect, values or {})
+        name = self.statements.get(sql_query)
+        with self.connection.cursor() as cursor:
+            if params:
+                cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+            else:
+                cursor.execute(f"EXECUTE {name}")
+            return cursor.fetchall()
+
+    def catalog_rows(self, query_name, **values):
+        """rows of a catalog query of the registry, values are sent as bind variables."""
+        return self.execute_bound(query_registry.template(self.dialect, query_name), values)
+
+    def fetch_table_details(self, table_name):
+        temp_col = []
+        # the column query lives in the postgres_sql file, read once per process by the registry
+        query_registry.register_file(self.dialect, 'table_columns', self.postgres_sql_path)
+        for column_details in self.catalog_rows('table_columns', schema_name=self.schema_name, table_name=table_name):
+            column_details = ['null' if each is None else each for each in column_details]
+            temp_col.append({"column_name": column_details[1], "DATA_TYPE": column_details[2],
+                             "is_nullable": column_details[3], "COLUMN_DEFAULT": column_details[4],
+                             "DATA_LENGTH": column_details[5], "DATA_PRECISION": column_details[6],
+                             "DATA_SCALE": column_details[7], "COLUMN_KEY": column_details[8]})
+
+        return temp_col
+
+    def table_count(self, table_name, where_clause=None, estimate=False, max_stats_age_days=7):
+        if estimate and where_clause is None:
+            return self.table_count_estimate(table_name, max_stats_age_days)['row_count']
+        try:
+            records_count = 0
+            if table_name is not None:
+                sql = f"select /*+ parallel(16)*/ count(1) from  {table_name}"
+                if where_clause is not None:
+                    sql = sql + f"\n {where_clause}"
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql)
+                data = cursor.fetchone()
+                records_count = data[0]
+            return records_count
+        except Exception as err:
+            raise err
+
+    def table_count_estimate(self, table_name, max_stats_age_days=7):
+        """Returns the row count of the table from the planner statistics (pg_class.reltuples).
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table, optionally prefixed by the schema.
+        max_stats_age_days : float
+            statistics older than this, or a table never analyzed, fall back to an exact count.
+
+        Returns
+        -------
+        result : dict
+            row_count, estimated (False when count(1) was used), last_analyzed, stats_age_days, stale.
+        """
+        schema, name = split_table_name(table_name, self.schema_name)
+        sql = f"""SELECT c.reltuples::bigint, GREATEST(s.last_analyze, s.last_autoanalyze)
+                  FROM pg_class c
+                  JOIN pg_namespace n ON n.oid = c.relnamespace
+                  LEFT JOIN pg_stat_all_tables s ON s.relid = c.oid
+                  WHERE n.nspname = '{schema}' AND c.relname = '{name}'"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+            data = cursor.fetchone()
+        if data is None:
+            result = count_estimate(None, None, max_stats_age_days)
+        else:
+            result = count_estimate(data[0], data[1], max_stats_age_days, stale=data[1] is None)
+        if result['stale']:
+            result['row_count'] = self.table_count(table_name)
+            result['estimated'] = False
+        return result
+
+    def find_table(self, table_name):
+        """it check the table is exits or Not 
+        Parameters
+        ----------
+        table_name : str
+            it contain the name Of Table Name 
+
+        Returns
+        -------
+        result :  bool
+            it return the true/false based on table is exits or not. 
+        """
+        sql = "SELECT count(1) FROM information_schema.tables where table_name = $table_name"
+        table_count = self.execute_bound(sql, {'table_name': table_name})[0][0]
+        if table_count == 0:
+            return True
+        else:
+            return False
+
+    def table_names(self, refresh=False):
+        """Names of the tables of information_schema.tables, where find_table looks.
+
+        Read with one query on first use (or refresh=True), then kept up to date by create_table and
+        delete_table of this manager.
+        """
+        if self._table_index is None or refresh:
+            sql = "SELECT DISTINCT table_name FROM information_schema.tables"
+            self._table_index = {row[0] for row in self.execute_bound(sql)}
+        return self._table_index
+
+    def find_tables(self, names, refresh=False):
+        """Checks the existence of any number of tables with at most one catalog query.
+
+        Parameters
+        ----------
+        names : list
+            table names.
+        refresh : bool
+            read the catalog again instead of the names known to this manager.
+
+        Returns
+        -------
+        result : dict
+            table name -> True when the table exists (unlike find_table, which returns True when it is missing).
+        """
+        table_index = self.table_names(refresh)
+        return {name: name in table_index for name in names}
+
+    def create_table(self, sql_query, table_create=False):
+        result = None
+        print(sql_query)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            if table_create:
+                self.connection.commit()
+                self._table_index = update_table_index(self._table_index, sql_query, fold=str.lower)
+            else:
+                data = cursor.fetchone()
+                result = data[0]
+        return result
+
+    def detete_table(self, sql_query):
+        result = None
+        print(sql_query)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            self.connection.commit()
+        self._table_index = update_table_index(self._table_index, sql_query, fold=str.lower)
+        return result
+    
+    def connection_close(self):
+        """Closes the connection or returns it to the pool.
+
+        The prepared statements are not DEALLOCATEd: a pooled session keeps them on purpose so the
+        next borrower reuses them (prepare_statement lists them from pg_prepared_statements), and
+        a closed session drops them anyway. Only the cache of this manager is cleared.
+        """
+        if self.connection is None:
+            return
+        self.statements.clear(release=False)
+        self._server_statements = None
+        if self.use_pool:
+            self.pool.release(self.connection)
+        else:
+            self.connection.close()
+        self.connection = None
+
+    def find_min_max_value(self, table_name, column_name):
+        sql_query=f'SELECT min({column_name}) AS min_value, max({column_name}) AS max_value FROM {table_name}'
+        result={}
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            temp_result = cursor.fetchall()
+            for each in temp_result:
+                temp = ['null' if e is None else e for e in each ]
+                result={"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
+        return result
+    
+    
+    def table_space(self, table_name):
+        """it used to check the table space in Kbs 
+        Parameters
+        ----------
+        table_name : str
+            it contain the name Of Table Name 
+
+        Returns
+        -------
+        result :  integer
+            it return the integer value related to table space in kbs. 
+        """
+        table_space_kb=0
+        sql_query = "SELECT pg_size_pretty ( pg_total_relation_size ($table_name) ) size"
+        print("----sql_query-------", sql_query)
+        table_space_kb = self.execute_bound(sql_query, {'table_name': table_name})[0][0]
+        print("table space -------", table_space_kb)    
+        return table_space_kb
+
+    def table_spaces(self):
+        """Size in bytes of every table of the schema from one pg_class query.
+
+        Partitions (at any level) of a declaratively partitioned table are added to the root table,
+        which has no storage of its own.
+
+        Returns
+        -------
+        result : dict
+            table name -> table_bytes (heap and TOAST), index_bytes, lob_bytes (always 0), total_bytes
+            and partitions (partition name -> bytes, empty when the table is not partitioned).
+        """
+        sql = """SELECT COALESCE(root.relname, c.relname), c.relname, c.relispartition,
+                        pg_table_size(c.oid), pg_indexes_size(c.oid)
+                 FROM pg_class c
+                 JOIN pg_namespace n ON n.oid = c.relnamespace
+                 LEFT JOIN pg_class root ON root.oid = pg_partition_root(c.oid)
+                 WHERE n.nspname = $schema AND c.relkind IN ('r', 'p')
+                   AND NOT (c.relkind = 'p' AND c.relispartition)"""
+        spaces = {}
+        for table_name, relation_name, is_partition, table_bytes, index_bytes in self.execute_bound(
+                sql, {'schema': self.schema_name}):
+            partition_name = relation_name if is_partition else None
+            add_segment_size(spaces, table_name, 'table', table_bytes, partition_name)
+            add_segment_size(spaces, table_name, 'index', index_bytes, partition_name)
+        return table_spaces_result(spaces)
+
+    def find_min_max_values(self, table_name, columns=None):
+        """min and max of several columns with a single scan of the table, see db_stats.table_min_max."""
+        return table_min_max(self, table_name, columns)
+
+    def fetch_rows(self, sql_query):
+        """run a select and return all rows as tuples."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            return cursor.fetchall()
+
+    def iter_rows(self, sql_query, batch_size=10000):
+        """run a select and yield its rows, fetched batch_size rows per round trip."""
+        # a named cursor is server side, a plain psycopg2 cursor would load the whole result
+        with self.connection.cursor(name=f"iter_rows_{next(CURSOR_NUMBERS)}") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(sql_query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def query_arrow(self, sql_query, batch_size=10000):
+        """Runs a select and returns its result as a pyarrow.Table built column wise batch by batch."""
+        with self.connection.cursor(name=f"query_arrow_{next(CURSOR_NUMBERS)}") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(sql_query)
+            return cursor_to_arrow(cursor, batch_size)
+
+    def profile_columns(self, table_name, columns=None, sample_percent=None):
+        """Profiles null counts, distinct counts and value lengths of the columns, see db_profile.profile_table.
+
+        Returns
+        -------
+        result : dict
+            column name -> ColumnProfile
+        """
+        return profile_table(self, table_name, columns, sample_percent)
+
+    def bulk_insert(self, table_name, columns, rows):
+        """Inserts the rows into the table with COPY FROM STDIN (text format), the batch is committed once.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the target table.
+        columns : list
+            column names, in the order of the values of each row.
+        rows : list
+            rows as tuples.
+
+        Returns
+        -------
+        result : int
+            number of rows inserted.
+        """
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write('\t'.join(copy_text_value(value) for value in row))
+            buffer.write('\n')
+        buffer.seek(0)
+        self.copy_in(table_name, buffer, copy_format='text', columns=columns)
+        return len(rows)
+
+    def copy_statement(self, table_name, direction, copy_format='csv', columns=None, header=False):
+        """build a COPY statement, direction is 'TO STDOUT' or 'FROM STDIN'."""
+        if copy_format not in ('csv', 'binary', 'text'):
+            raise ValueError(f"copy format {copy_format} is not supported, use csv, binary or text")
+        target = f"{table_name} ({', '.join(columns)})" if columns else table_name
+        options = [f"FORMAT {copy_format}"]
+        if header and copy_format == 'csv':
+            options.append("HEADER")
+        return f"COPY {target} {direction} WITH ({', '.join(options)})"
+
+    def copy_out(self, table_name, sink, copy_format='csv', columns=None, header=False, buffer_size=65536):
+        """Streams the table into a file like object with COPY ... TO STDOUT.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table, or a select wrapped in parentheses.
+        sink : file object
+            opened in binary mode for the binary format, written chunk by chunk.
+        copy_format : str
+            csv, binary or text.
+
+        Returns
+        -------
+        result : int
+            number of rows copied.
+        """
+        sql_query = self.copy_statement(table_name, 'TO STDOUT', copy_format, columns, header)
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(sql_query, sink, size=buffer_size)
+            return cursor.rowcount
+
+    def copy_in(self, table_name, source, copy_format='csv', columns=None, header=False, buffer_size=65536):
+        """Loads a file like object into the table with COPY ... FROM STDIN, the load is committed once.
+
+        Parameters
+        ----------
+        table_name : str
+            name of the table.
+        source : file object
+            opened in binary mode for the binary format, read buffer_size bytes at a time.
+        copy_format : str
+            csv, binary or text.
+
+        Returns
+        -------
+        result : int
+            number of rows loaded.
+        """
+        sql_query = self.copy_statement(table_name, 'FROM STDIN', copy_format, columns, header)
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(sql_query, source, size=buffer_size)
+            row_count = cursor.rowcount
+        self.connection.commit()
+        return row_count
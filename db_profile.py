@@ -0,0 +1,171 @@
+import hashlib
+import math
+
+from db_stats import split_table_name
+
+
+APPROX_DISTINCT_DIALECTS = ('oracle', 'mssql', 'azure_sql')
+# percent of the table read for the HyperLogLog sketch on the other engines, unless told otherwise
+DEFAULT_SAMPLE_PERCENT = 10
+# types profiled for nulls only, per dialect: postgres text is the ordinary string type, mysql TEXT is a LOB
+LOB_TYPES = {
+    'oracle': {'CLOB', 'NCLOB', 'BLOB', 'BFILE', 'LONG', 'LONG RAW', 'XMLTYPE'},
+    'postgres': {'BYTEA', 'XML'},
+    'mysql': {'TINYBLOB', 'BLOB', 'MEDIUMBLOB', 'LONGBLOB', 'TEXT', 'MEDIUMTEXT', 'LONGTEXT'},
+    'mssql': {'IMAGE', 'NTEXT', 'TEXT', 'XML'},
+    'azure_sql': {'IMAGE', 'NTEXT', 'TEXT', 'XML'},
+    'db2': {'CLOB', 'BLOB', 'DBCLOB', 'XML'},
+}
+
+
+class HyperLogLog:
+    """
+    this class estimates the number of distinct values seen, in 2 ** precision bytes of memory.
+    """
+
+    __slots__ = ('precision', 'size', 'registers')
+
+    def __init__(self, precision=14) -> None:
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+
+    def add(self, value):
+        hashed = int.from_bytes(hashlib.blake2b(repr(value).encode('utf-8'), digest_size=8).digest(), 'big')
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+        return int(round(estimate))
+
+
+class ColumnProfile:
+    """
+    this class holds the profile of one column.
+    """
+
+    __slots__ = ('column_name', 'data_type', 'row_count', 'null_count', 'distinct_count', 'distinct_source',
+                 'min_length', 'max_length', 'avg_length')
+
+    def __init__(self, column_name, data_type, row_count, null_count, distinct_count=None, distinct_source=None,
+                 min_length=None, max_length=None, avg_length=None) -> None:
+        self.column_name = column_name
+        self.data_type = data_type
+        self.row_count = row_count
+        self.null_count = null_count
+        self.distinct_count = distinct_count
+        self.distinct_source = distinct_source
+        self.min_length = min_length
+        self.max_length = max_length
+        self.avg_length = avg_length
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def _text_length(dialect, column):
+    if dialect == 'oracle':
+        return f"LENGTH(TO_CHAR({column}))"
+    if dialect == 'postgres':
+        return f"length({column}::text)"
+    if dialect == 'mysql':
+        return f"CHAR_LENGTH({column})"
+    if dialect in ('mssql', 'azure_sql'):
+        return f"LEN(CAST({column} AS NVARCHAR(4000)))"
+    return f"LENGTH(CAST({column} AS VARCHAR(4000)))"
+
+
+def _sample_clause(dialect, sample_percent):
+    if not sample_percent or sample_percent >= 100:
+        return ''
+    if dialect in ('postgres', 'db2'):
+        return f" TABLESAMPLE SYSTEM ({sample_percent})"
+    if dialect == 'mysql':
+        return f" WHERE RAND() < {sample_percent / 100}"
+    if dialect == 'oracle':
+        return f" SAMPLE ({sample_percent})"
+    return f" TABLESAMPLE ({sample_percent} PERCENT)"
+
+
+def profile_table(manager, table_name, columns=None, sample_percent=None, batch_size=10000):
+    """Profiles the columns of a table with one aggregate query.
+
+    Null counts and value lengths always come from the aggregate query. Distinct counts use
+    APPROX_COUNT_DISTINCT on engines having it, otherwise a client side HyperLogLog fed by one
+    more read of a sample of the table; the count is then the distinct count of the sample
+    (distinct_source 'sample'), not an estimate for the whole table.
+
+    Parameters
+    ----------
+    manager : connection manager
+    table_name : str
+        name of the table.
+    columns : list
+        columns to profile, by default every column from fetch_table_details.
+    sample_percent : float
+        percent of the table read for the HyperLogLog sketch, DEFAULT_SAMPLE_PERCENT when None,
+        100 reads every row.
+
+    Returns
+    -------
+    result : dict
+        column name -> ColumnProfile
+    """
+    _, name = split_table_name(table_name)
+    details = {each['column_name']: each.get('DATA_TYPE') for each in manager.fetch_table_details(name)}
+    if columns is None:
+        columns = list(details)
+    dialect = manager.dialect
+    approx = dialect in APPROX_DISTINCT_DIALECTS
+
+    lob_types = LOB_TYPES.get(dialect, set())
+    lob_columns = {column for column in columns
+                   if str(details.get(column, '')).upper().split('(')[0].strip() in lob_types}
+    select_list = ['COUNT(*)']
+    for column in columns:
+        if column in lob_columns:
+            select_list += [f"COUNT({column})", 'NULL', 'NULL', 'NULL', 'NULL']
+            continue
+        length = _text_length(dialect, column)
+        select_list += [f"COUNT({column})",
+                        f"APPROX_COUNT_DISTINCT({column})" if approx else 'NULL',
+                        f"MIN({length})", f"MAX({length})", f"AVG({length})"]
+    row = manager.fetch_rows(f"SELECT {', '.join(select_list)} FROM {table_name}")[0]
+
+    row_count = row[0]
+    result = {}
+    sketch_columns = []
+    for index, column in enumerate(columns):
+        non_null, distinct, min_length, max_length, avg_length = row[1 + index * 5:6 + index * 5]
+        profile = ColumnProfile(column, details.get(column), row_count, row_count - non_null,
+                                min_length=min_length, max_length=max_length,
+                                avg_length=float(avg_length) if avg_length is not None else None)
+        if distinct is not None:
+            profile.distinct_count = int(distinct)
+            profile.distinct_source = 'approx_count_distinct'
+        elif column not in lob_columns:
+            sketch_columns.append(column)
+        result[column] = profile
+
+    if sketch_columns:
+        if sample_percent is None:
+            sample_percent = DEFAULT_SAMPLE_PERCENT
+        sampled = 0 < sample_percent < 100
+        sketches = [HyperLogLog() for _ in sketch_columns]
+        sql_query = f"SELECT {', '.join(sketch_columns)} FROM {table_name}{_sample_clause(dialect, sample_percent)}"
+        for each_row in manager.iter_rows(sql_query, batch_size):
+            for sketch, value in zip(sketches, each_row):
+                if value is not None:
+                    sketch.add(value)
+        for column, sketch in zip(sketch_columns, sketches):
+            result[column].distinct_count = sketch.count()
+            result[column].distinct_source = 'sample' if sampled else 'hyperloglog'
+    return result
@@ -0,0 +1,428 @@
+import functools
+import re
+import threading
+from collections import OrderedDict
+
+
+# how each manager sends bind variables to its driver, see the execute_bound of the managers
+#   named   :name      oracledb
+#   numeric $1         PREPARE / EXECUTE of psycopg2
+#   qmark   ?          prepared cursors of mysql.connector / pyodbc, ibm_db.prepare
+#   at      @name      sp_executesql of pymssql
+PARAM_STYLES = {
+    'oracle': 'named',
+    'postgres': 'numeric',
+    'mysql': 'qmark',
+    'mssql': 'at',
+    'azure_sql': 'qmark',
+    'db2': 'qmark',
+}
+
+# $name or '$name' (string.Template style, as in the postgres_sql file) marks a bind variable;
+# a $ inside an identifier (v$session, GV$SQL, BIN$...) is not one
+PARAMETER = re.compile(r"'\$\{?([A-Za-z_][A-Za-z0-9_]*)\}?'|(?<![\w$])\$\{?([A-Za-z_][A-Za-z0-9_]*)\}?")
+
+SQL_SERVER_TABLE_COLUMNS = '''
+    SELECT
+        COLUMN_NAME, DATA_TYPE, IS_NULLABLE, column_default,
+        CASE
+            WHEN DATA_TYPE IN ('decimal', 'numeric') THEN NUMERIC_PRECISION
+            WHEN DATA_TYPE IN ('datetime2', 'time', 'datetimeoffset') THEN DATETIME_PRECISION
+            ELSE CHARACTER_MAXIMUM_LENGTH
+        END AS Length,
+        NUMERIC_PRECISION AS Precision,
+        NUMERIC_SCALE AS Scale
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_NAME = $table_name'''
+
+# table_spaces, run once per schema: bytes per table, partition and table / index / lob allocation
+SQL_SERVER_TABLE_SPACES = '''
+    SELECT t.name, p.partition_number,
+           CASE WHEN a.type = 2 THEN 'lob' WHEN i.index_id IN (0, 1) THEN 'table' ELSE 'index' END AS kind,
+           SUM(a.total_pages) * 8192 AS total_bytes
+    FROM sys.tables t
+    INNER JOIN sys.indexes i ON t.object_id = i.object_id
+    INNER JOIN sys.partitions p ON i.object_id = p.object_id AND i.index_id = p.index_id
+    INNER JOIN sys.allocation_units a ON p.partition_id = a.container_id
+    WHERE SCHEMA_NAME(t.schema_id) = $schema AND t.is_ms_shipped = 0
+    GROUP BY t.name, p.partition_number,
+             CASE WHEN a.type = 2 THEN 'lob' WHEN i.index_id IN (0, 1) THEN 'table' ELSE 'index' END'''
+
+# (dialect, query name) -> catalog SQL, run once per table by the metadata harvest unless noted
+CATALOG_QUERIES = {
+    ('oracle', 'table_columns'): '''
+        SELECT column_name, DATA_TYPE, NULLABLE, DATA_DEFAULT, DATA_LENGTH, DATA_PRECISION, DATA_SCALE
+        FROM all_tab_columns
+        WHERE TABLE_NAME = $table_name AND OWNER = $owner
+        ORDER BY column_id''',
+    ('oracle', 'primary_key_constraints'): '''
+        SELECT cols.table_name,
+               cols.column_name,
+               cols.position,
+               cons.status,
+               cons.owner,
+               cons.CONSTRAINT_NAME,
+               cons.CONSTRAINT_TYPE,
+               CASE WHEN cons.SEARCH_CONDITION IS NULL THEN '' END AS SEARCH_CONDITION
+        FROM all_constraints cons, all_cons_columns cols
+        WHERE cons.constraint_name = cols.constraint_name
+            AND cons.owner = cols.owner
+            AND cons.owner = $owner
+            AND cons.table_name = $table_name
+            AND cons.CONSTRAINT_TYPE != 'R'
+        ORDER BY cols.table_name, cols.position''',
+    ('oracle', 'foreign_key_constraints'): '''
+        SELECT a.constraint_name,
+               a.table_name,
+               a.column_name,
+               c.owner,
+               c_pk.table_name r_table_name,
+               b.column_name r_column_name,
+               c_pk.owner r_owner,
+               c.constraint_type
+        FROM user_cons_columns a
+        JOIN user_constraints c ON a.owner = c.owner
+            AND a.constraint_name = c.constraint_name
+        JOIN user_constraints c_pk ON c.r_owner = c_pk.owner
+            AND c.r_constraint_name = c_pk.constraint_name
+        JOIN user_cons_columns b ON C_PK.owner = b.owner
+            AND C_PK.CONSTRAINT_NAME = b.constraint_name AND b.POSITION = a.POSITION
+        WHERE c.constraint_type = 'R' AND c.owner = $owner AND a.table_name = $table_name''',
+    ('oracle', 'unique_indexes'): '''
+        select ind.table_owner,
+               ind.table_name,
+               ind_col.column_name,
+               ind.index_name,
+               ind.index_type,
+               ind.table_type
+        from sys.all_indexes ind
+        inner join sys.all_ind_columns ind_col
+            on ind.owner = ind_col.index_owner
+            and ind.index_name = ind_col.index_name
+        where ind.uniqueness = 'UNIQUE' AND ind.owner = $owner AND ind.table_name = $table_name''',
+    ('oracle', 'partitions'): '''
+        SELECT
+            p1.table_owner AS table_owner,
+            p1.table_name AS table_name,
+            p1.high_value AS high_value,
+            p1.partition_name AS partition_name,
+            c.column_name AS column_name,
+            p1.tablespace_name AS tablespace_name,
+            t.partitioning_type AS partition_type,
+            (SELECT COUNT(*)
+             FROM all_tab_partitions apt
+             WHERE apt.table_owner = p1.table_owner
+             AND apt.table_name = p1.table_name
+            ) AS partition_count,
+            p2.high_value AS min_value,
+            p1.high_value AS max_value,
+            p1.partition_position AS partition_position
+        FROM all_tab_partitions p1
+        LEFT JOIN all_tab_partitions p2
+            ON p1.PARTITION_position = p2.PARTITION_position + 1
+            AND p1.table_owner = p2.table_owner
+            AND p1.table_name = p2.table_name
+        JOIN all_part_key_columns c
+            ON p1.table_owner = c.owner
+            AND p1.table_name = c.name
+        JOIN all_part_tables t
+            ON p1.table_owner = t.owner
+            AND p1.table_name = t.table_name
+        WHERE p1.table_owner = $owner
+            AND p1.table_name = $table_name
+        ORDER BY p1.partition_position''',
+    ('mysql', 'table_columns'): '''
+        SELECT column_name, data_type, is_nullable, COLUMN_DEFAULT, character_maximum_length,
+               numeric_precision, numeric_scale, COLUMN_KEY
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE table_name = $table_name''',
+    ('mssql', 'table_columns'): SQL_SERVER_TABLE_COLUMNS,
+    ('azure_sql', 'table_columns'): SQL_SERVER_TABLE_COLUMNS,
+    ('mssql', 'table_spaces'): SQL_SERVER_TABLE_SPACES,
+    ('azure_sql', 'table_spaces'): SQL_SERVER_TABLE_SPACES,
+    ('mssql', 'partitions'): '''
+        WITH DistinctHighValues AS (
+            SELECT
+                t.name AS TableName,
+                ps.name AS PartitionSchemeName,
+                pf.name AS PartitionFunctionName,
+                pf.function_id AS PartitionFunctionID,
+                pf.type_desc AS PartitionFunctionType,
+                p.partition_number AS PartitionNumber,
+                prv.value AS HighValue,
+                c.name AS PartitionColumnName,
+                ty.name AS PartitionColumnType
+            FROM sys.tables t
+            JOIN sys.indexes i ON t.object_id = i.object_id
+            JOIN sys.partition_schemes ps ON i.data_space_id = ps.data_space_id
+            JOIN sys.partition_functions pf ON ps.function_id = pf.function_id
+            JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id = i.index_id
+            JOIN sys.partition_range_values prv ON pf.function_id = prv.function_id AND prv.boundary_id = p.partition_number - 1
+            JOIN sys.index_columns ic ON i.object_id = ic.object_id AND i.index_id = ic.index_id
+            JOIN sys.columns c ON ic.object_id = c.object_id AND ic.column_id = c.column_id
+            JOIN sys.types ty ON c.user_type_id = ty.user_type_id
+            WHERE t.name = $table_name
+        )
+        SELECT
+            TableName,
+            PartitionSchemeName,
+            PartitionFunctionName,
+            PartitionFunctionID,
+            PartitionFunctionType,
+            PartitionNumber,
+            CAST(HighValue AS VARCHAR(MAX)) AS HighValue,
+            PartitionColumnName,
+            PartitionColumnType
+        FROM DistinctHighValues
+        ORDER BY PartitionNumber''',
+    ('db2', 'table_columns'): '''
+        SELECT
+            col.COLNAME AS column_name,
+            dt.TYPENAME AS data_type,
+            col.LENGTH AS data_length,
+            dt.LENGTH AS DATA_PRECISION,
+            col.SCALE AS DATA_SCALE
+        FROM SYSCAT.COLUMNS AS col
+        JOIN SYSCAT.DATATYPES AS dt
+        ON col.TYPENAME = dt.TYPENAME
+        WHERE col.TABNAME = $table_name''',
+    ('db2', 'partitions'): '''
+        SELECT
+            dp.DATAPARTITIONNAME AS partiton_name,
+            dp.DATAPARTITIONID,
+            dp.LOWVALUE AS min_value,
+            dp.HIGHVALUE AS max_value,
+            dpe.DATAPARTITIONEXPRESSION AS column_name
+        FROM SYSCAT.DATAPARTITIONS dp
+        JOIN SYSCAT.DATAPARTITIONEXPRESSION dpe
+        ON dp.TABSCHEMA = dpe.TABSCHEMA
+            AND dp.TABNAME = dpe.TABNAME
+        WHERE dp.TABNAME = $table_name
+            AND dp.TABSCHEMA = $owner''',
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_query(template, style):
+    """Turns the $name markers of a query into bind variables of a paramstyle, cached per text.
+
+    Returns
+    -------
+    compiled : tuple
+        (sql, names); names are the bind variables in the order the driver expects their values,
+        a name used twice is one variable for the named / numeric / at styles.
+    """
+    names = []
+
+    def placeholder(match):
+        name = match.group(1) or match.group(2)
+        if style == 'qmark':
+            names.append(name)
+            return '?'
+        if name not in names:
+            names.append(name)
+        if style == 'named':
+            return f":{name}"
+        if style == 'numeric':
+            return f"${names.index(name) + 1}"
+        return f"@{name}"
+
+    return PARAMETER.sub(placeholder, template), tuple(names)
+
+
+def bind_query(template, dialect, values):
+    """Statement and parameters to run a $name query on a manager of the dialect.
+
+    Parameters
+    ----------
+    values : dict
+        value of every bind variable of the query, extra keys are ignored.
+
+    Returns
+    -------
+    bound : tuple
+        (sql, params), params is a dict for the named / at styles and a tuple for the others.
+    """
+    style = PARAM_STYLES[dialect]
+    sql_query, names = compile_query(template, style)
+    missing = [name for name in names if name not in values]
+    if missing:
+        raise KeyError(f"query needs {', '.join(missing)}")
+    if style in ('named', 'at'):
+        return sql_query, {name: values[name] for name in names}
+    return sql_query, tuple(values[name] for name in names)
+
+
+class StatementCache:
+    """
+    this class keeps the prepared statements (cursor, handle or name) of a connection by statement text.
+
+    prepare(sql) is called once per text, the least recently used statement is released with
+    release(statement) past max_size. stats() tells how many executions reused a statement.
+    """
+
+    def __init__(self, prepare, release=None, max_size=64) -> None:
+        self.prepare = prepare
+        self.release = release
+        self.max_size = max_size
+        self._statements = OrderedDict()
+        self._stats = {'prepared': 0, 'reused': 0, 'released': 0}
+
+    def get(self, sql_query):
+        statement = self._statements.get(sql_query)
+        if statement is not None:
+            self._statements.move_to_end(sql_query)
+            self._stats['reused'] += 1
+            return statement
+        statement = self._statements[sql_query] = self.prepare(sql_query)
+        self._stats['prepared'] += 1
+        while len(self._statements) > self.max_size:
+            self._discard(self._statements.popitem(last=False)[1])
+        return statement
+
+    def _discard(self, statement):
+        self._stats['released'] += 1
+        if self.release is not None:
+            try:
+                self.release(statement)
+            except Exception as err:
+                print(f"can not release prepared statement: {err}")
+
+    def clear(self, release=True):
+        """Forgets every statement, before the connection is closed or returned to the pool.
+
+        With release=False the statements are only dropped from the cache and stay on the
+        connection, e.g. server side statements a pooled session keeps for its next borrower.
+        """
+        while self._statements:
+            statement = self._statements.popitem(last=False)[1]
+            if release:
+                self._discard(statement)
+
+    def stats(self):
+        return dict(self._stats, statements=len(self._statements))
+
+
+class QueryRegistry:
+    """
+    this class holds the catalog SQL of every dialect, read and compiled once per process.
+
+    Queries are stored with $name markers and compiled on first use into the bind variable style
+    of the driver, so the statement text is the same for every table and only the values change.
+    """
+
+    def __init__(self, queries=None) -> None:
+        self._templates = dict(CATALOG_QUERIES if queries is None else queries)
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def register(self, dialect, query_name, template):
+        with self._lock:
+            self._templates[(dialect, query_name)] = template
+
+    def register_file(self, dialect, query_name, path):
+        """registers the SQL of a file, the file is read only the first time the path is seen."""
+        with self._lock:
+            if path in self._files:
+                return
+        with open(path, 'r') as file:
+            template = file.read()
+        with self._lock:
+            self._files[path] = (dialect, query_name)
+        self.register(dialect, query_name, template)
+
+    def template(self, dialect, query_name):
+        """$name SQL of a registered query, run it with the execute_bound of a manager."""
+        with self._lock:
+            if (dialect, query_name) not in self._templates:
+                raise KeyError(f"no catalog query {query_name} for {dialect}")
+            return self._templates[(dialect, query_name)]
+
+
+query_registry = QueryRegistry()
+
+
+# identifier, quoted ("..." `...` [...]) or not, and a possibly qualified table name
+IDENTIFIER = r'(?:"[^"]*"|`[^`]*`|\[[^\]]*\]|[^\s(),.;"`\[\]]+)'
+TABLE_NAME = rf'{IDENTIFIER}(?:\s*\.\s*{IDENTIFIER})*'
+# CREATE TABLE / DROP TABLE statements run through create_table / delete_table
+DDL_TABLE = re.compile(
+    r"^\s*(?:(CREATE)(?:\s+OR\s+REPLACE)?(?:\s+(?:GLOBAL|LOCAL))?(?:\s+(?:TEMPORARY|TEMP))?(?:\s+UNLOGGED)?"
+    r"|(DROP))\s+TABLE\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?"
+    rf"({TABLE_NAME}(?:\s*,\s*{TABLE_NAME})*)",
+    re.IGNORECASE)
+# statements that may add, remove or rename tables
+DDL_STATEMENT = re.compile(r"^\s*(?:CREATE|DROP|ALTER|RENAME)\b", re.IGNORECASE)
+
+
+def update_table_index(table_index, sql_query, fold=None, normalize=None, schema=None):
+    """Adds / removes the tables of a CREATE TABLE / DROP TABLE statement in a find_tables index.
+
+    Parameters
+    ----------
+    table_index : set
+        names known to find_tables, None when not loaded yet (left alone).
+    sql_query : str
+        statement that was run.
+    fold : callable
+        case the engine folds unquoted names to (str.lower for Postgres, str.upper for Oracle / DB2),
+        quoted names are kept as written.
+    normalize : callable
+        applied to every name, the case the index keeps (str.lower for a case insensitive index).
+    schema : str
+        schema the index holds, as the catalog spells it; None when the index holds every schema
+        of the database.
+
+    Returns
+    -------
+    table_index : set
+        the updated index; None when the statement is DDL that could not be parsed or names a table
+        outside the index (another schema or database), so the next find_tables reads the catalog
+        again instead of trusting a stale index.
+    """
+    if table_index is None or not isinstance(sql_query, str):
+        return table_index
+    match = DDL_TABLE.match(sql_query)
+    if match is None:
+        return None if DDL_STATEMENT.match(sql_query) else table_index
+    if schema is not None and normalize is not None:
+        schema = normalize(schema)
+    names = []
+    for table_name in re.findall(TABLE_NAME, match.group(3)):
+        parts = [_plain_identifier(part, fold, normalize) for part in re.findall(IDENTIFIER, table_name)]
+        if len(parts) > 2 or (len(parts) == 2 and schema is not None and parts[0] != schema):
+            return None
+        names.append(parts[-1])
+    for name in names:
+        if match.group(1):
+            table_index.add(name)
+        else:
+            table_index.discard(name)
+    return table_index
+
+
+def _plain_identifier(identifier, fold=None, normalize=None):
+    """identifier as the catalog keeps it: quotes removed, unquoted names folded, then normalized."""
+    if identifier[0] in '"`[':
+        identifier = identifier[1:-1]
+    elif fold is not None:
+        identifier = fold(identifier)
+    if normalize is not None:
+        identifier = normalize(identifier)
+    return identifier
+    match = DDL_TABLE.match(sql_query)
+    if match is None:
+        return None if DDL_STATEMENT.match(sql_query) else table_index
+    for table_name in re.findall(TABLE_NAME, match.group(3)):
+        name = re.findall(IDENTIFIER, table_name)[-1]
+        if name[0] in '"`[':
+            name = name[1:-1]
+        elif fold is not None:
+            name = fold(name)
+        if normalize is not None:
+            name = normalize(name)
+        if match.group(1):
+            table_index.add(name)
+        else:
+            table_index.discard(name)
+    return table_index
@@ -0,0 +1,124 @@
+import mmap
+import os
+import pickle
+import struct
+
+from db_metadata import compact_record, to_plain
+
+
+SNAPSHOT_MAGIC = b'DBMSNAP1'
+SNAPSHOT_VERSION = 1
+# magic, format version, table count, offset of the index
+HEADER = struct.Struct('<8sIIQ')
+# name offset, name length, data offset, data length; entries sorted by name
+INDEX_ENTRY = struct.Struct('<QIQQ')
+
+
+def write_snapshot(path, meta_data_details):
+    """Writes metadata_details output to a binary snapshot file.
+
+    Every table is pickled on its own, followed by the table names and an index sorted by name,
+    so a reader can binary search the index in place and unpickle only the table it needs.
+
+    Parameters
+    ----------
+    path : str
+        snapshot file, written to path.tmp first and renamed.
+    meta_data_details : list
+        metadata of the tables, dicts or compact descriptors.
+
+    Returns
+    -------
+    table_count : int
+    """
+    entries = []
+    with open(path + '.tmp', 'wb') as file:
+        file.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, 0))
+        for table in meta_data_details:
+            data = pickle.dumps(to_plain(table), protocol=pickle.HIGHEST_PROTOCOL)
+            entries.append([table['table_name'].encode('utf-8'), 0, file.tell(), len(data)])
+            file.write(data)
+        entries.sort(key=lambda each: each[0])
+        for entry in entries:
+            entry[1] = file.tell()
+            file.write(entry[0])
+        index_offset = file.tell()
+        for name, name_offset, data_offset, data_length in entries:
+            file.write(INDEX_ENTRY.pack(name_offset, len(name), data_offset, data_length))
+        file.seek(0)
+        file.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(entries), index_offset))
+    os.replace(path + '.tmp', path)
+    return len(entries)
+
+
+class MetadataSnapshot:
+    """
+    this class reads one table at a time from a snapshot written by write_snapshot.
+
+    The file is memory mapped, a lookup is a binary search over the index and one unpickle, the
+    rest of the schema is never read.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.table_count, self.index_offset = HEADER.unpack_from(self._mmap, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a metadata snapshot")
+        if version != SNAPSHOT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is a version {version} snapshot,"
+                             f" this reader supports version {SNAPSHOT_VERSION}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.table_count
+
+    def __contains__(self, table_name):
+        return self._find(table_name) is not None
+
+    def _entry(self, position):
+        name_offset, name_length, data_offset, data_length = INDEX_ENTRY.unpack_from(
+            self._mmap, self.index_offset + position * INDEX_ENTRY.size)
+        return self._mmap[name_offset:name_offset + name_length], data_offset, data_length
+
+    def _find(self, table_name):
+        key = table_name.encode('utf-8')
+        low, high = 0, self.table_count
+        while low < high:
+            middle = (low + high) // 2
+            name, data_offset, data_length = self._entry(middle)
+            if name == key:
+                return data_offset, data_length
+            if name < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def get(self, table_name, compact=False):
+        """metadata of one table (same dict as metadata_details returns for it), None if it is not in the snapshot."""
+        found = self._find(table_name)
+        if found is None:
+            return None
+        data_offset, data_length = found
+        table = pickle.loads(self._mmap[data_offset:data_offset + data_length])
+        return compact_record(table) if compact else table
+
+    def table_names(self):
+        """names of all the tables, sorted."""
+        return [self._entry(position)[0].decode('utf-8') for position in range(self.table_count)]
+
+    def load_all(self, compact=False):
+        """metadata of every table, sorted by name."""
+        return [self.get(name, compact) for name in self.table_names()]
+
+    def close(self):
+        self._mmap.close()
@@ -0,0 +1,22 @@
+def stage_table_statement(stage_name, table_name, columns):
+    """SELECT INTO creating an empty stage table with the columns of the table, without their IDENTITY property.
+
+    SELECT INTO carries IDENTITY over unless the select contains a UNION, the empty second branch
+    drops it so the staged rows can hold explicit identity values.
+    """
+    column_list = ', '.join(columns)
+    return (f"SELECT TOP 0 {column_list} INTO {stage_name} FROM {table_name}"
+            f" UNION ALL SELECT TOP 0 {column_list} FROM {table_name}")
+
+
+def merge_statement(table_name, stage_name, columns, key_columns):
+    """MERGE of the stage table into the table on the key columns."""
+    condition = ' AND '.join(f"target.{column} = source.{column}" for column in key_columns)
+    sql_query = f"MERGE INTO {table_name} AS target USING {stage_name} AS source ON {condition}"
+    update_columns = [column for column in columns if column not in key_columns]
+    if update_columns:
+        assignments = ', '.join(f"target.{column} = source.{column}" for column in update_columns)
+        sql_query += f" WHEN MATCHED THEN UPDATE SET {assignments}"
+    sql_query += (f" WHEN NOT MATCHED THEN INSERT ({', '.join(columns)})"
+                  f" VALUES ({', '.join('source.' + column for column in columns)});")
+    return sql_query
@@ -0,0 +1,188 @@
+import datetime
+import hashlib
+import time
+
+
+def split_table_name(table_name, default_schema=None):
+    """split a 'schema.table' name, the default schema is used for a bare table name.
+
+    Returns
+    -------
+    result : tuple
+        (schema, table)
+    """
+    if '.' in table_name:
+        schema, table = table_name.split('.', 1)
+        return schema, table
+    return default_schema, table_name
+
+
+def count_estimate(row_count, last_analyzed, max_stats_age_days=7, stale=False):
+    """Build the result of table_count_estimate from the optimizer statistics of a table.
+
+    Parameters
+    ----------
+    row_count : int
+        row count kept in the catalog, None or negative when the table has no statistics.
+    last_analyzed : datetime
+        when the statistics were gathered, None when the engine keeps the count up to date itself.
+    max_stats_age_days : float
+        statistics older than this are reported as stale, None disables the check.
+    stale : bool
+        staleness already known from the catalog (e.g. Oracle STALE_STATS).
+
+    Returns
+    -------
+    result : dict
+        row_count, estimated, last_analyzed, stats_age_days and stale.
+    """
+    missing = row_count is None or row_count < 0
+    stats_age_days = None
+    if last_analyzed is not None:
+        if isinstance(last_analyzed, datetime.datetime):
+            now = datetime.datetime.now(last_analyzed.tzinfo)
+        else:
+            last_analyzed = datetime.datetime.combine(last_analyzed, datetime.time())
+            now = datetime.datetime.now()
+        stats_age_days = (now - last_analyzed).total_seconds() / 86400
+        if max_stats_age_days is not None and stats_age_days > max_stats_age_days:
+            stale = True
+    return {'row_count': None if missing else int(row_count),
+            'estimated': True,
+            'last_analyzed': last_analyzed,
+            'stats_age_days': stats_age_days,
+            'stale': bool(stale or missing)}
+
+
+MIN_MAX_TYPES = {'NUMBER', 'FLOAT', 'BINARY_FLOAT', 'BINARY_DOUBLE', 'INTEGER', 'INT', 'SMALLINT', 'BIGINT',
+                 'TINYINT', 'MEDIUMINT', 'DECIMAL', 'NUMERIC', 'REAL', 'DOUBLE', 'DOUBLE PRECISION', 'DECFLOAT',
+                 'MONEY', 'SMALLMONEY', 'DATE', 'DATETIME', 'DATETIME2', 'SMALLDATETIME', 'DATETIMEOFFSET',
+                 'TIME', 'YEAR'}
+
+
+def min_max_columns(column_details):
+    """names of the numeric and date/time columns of a fetch_table_details result."""
+    columns = []
+    for column in column_details:
+        data_type = str(column.get('DATA_TYPE', '')).upper().split('(')[0].strip()
+        if data_type in MIN_MAX_TYPES or data_type.startswith(('TIMESTAMP', 'TIME ')):
+            columns.append(column['column_name'])
+    return columns
+
+
+def min_max_query(table_name, columns):
+    """one select returning min and max of every column."""
+    select_list = ', '.join(f"min({column}), max({column})" for column in columns)
+    return f"SELECT {select_list} FROM {table_name}"
+
+
+def min_max_result(columns, row):
+    """column -> {"min_value", "max_value"} in the same format as find_min_max_value."""
+    result = {}
+    for index, column in enumerate(columns):
+        temp = ['null' if e is None else e for e in row[index * 2:index * 2 + 2]]
+        result[column] = {"min_value": f'{temp[0]}', "max_value": f'{temp[1]}'}
+    return result
+
+
+def table_min_max(manager, table_name, columns=None):
+    """Finds min and max of several columns with a single scan of the table.
+
+    Parameters
+    ----------
+    manager : connection manager
+        any manager exposing fetch_table_details and fetch_rows.
+    table_name : str
+        name of the table.
+    columns : list
+        columns to profile, by default every numeric and date/time column from fetch_table_details.
+
+    Returns
+    -------
+    result : dict
+        column name -> {"min_value", "max_value"}, same format as find_min_max_value.
+    """
+    if columns is None:
+        _, name = split_table_name(table_name)
+        columns = min_max_columns(manager.fetch_table_details(name))
+    if not columns:
+        return {}
+    rows = manager.fetch_rows(min_max_query(table_name, columns))
+    return min_max_result(columns, rows[0])
+
+
+def add_segment_size(spaces, table_name, kind, size, partition=None):
+    """Adds one segment of a catalog size query to the table_spaces result.
+
+    Parameters
+    ----------
+    spaces : dict
+        table name -> sizes, filled in place.
+    table_name : str
+        table owning the segment.
+    kind : str
+        table, index or lob.
+    size : int
+        size of the segment in bytes.
+    partition : str
+        partition of the segment, None when the table is not partitioned.
+    """
+    space = spaces.setdefault(table_name, {'table_bytes': 0, 'index_bytes': 0, 'lob_bytes': 0,
+                                           'total_bytes': 0, 'partitions': {}})
+    size = int(size or 0)
+    space[f'{kind}_bytes'] += size
+    space['total_bytes'] += size
+    if partition is not None:
+        space['partitions'][partition] = space['partitions'].get(partition, 0) + size
+
+
+def table_spaces_result(spaces):
+    """spaces with the partitions of single partition tables dropped (a plain table is one partition on some engines)."""
+    for space in spaces.values():
+        if len(space['partitions']) < 2:
+            space['partitions'] = {}
+    return spaces
+
+
+def checksum_stream(row_hashes):
+    """Folds row hashes into one running sha256, memory stays flat whatever the row count.
+
+    Two tables match when their checksum and row_count match, same as comparing the lists
+    returned by calculate_checksum in order. A failed query or fetch raises, a partial stream
+    never yields a checksum.
+
+    Parameters
+    ----------
+    row_hashes : iterable
+        hash of every row in the order of the checksum query, e.g. iter_checksum of a manager.
+
+    Returns
+    -------
+    result : dict
+        checksum (hex digest), row_count, elapsed_seconds and rows_per_sec.
+    """
+    start_time = time.perf_counter()
+    aggregate = hashlib.sha256()
+    row_count = 0
+    for row_hash in row_hashes:
+        aggregate.update(str(row_hash).encode('utf-8'))
+        aggregate.update(b'\n')
+        row_count += 1
+    elapsed = time.perf_counter() - start_time
+    print(f"checksum of {row_count} rows in {elapsed:.2f} seconds")
+    return {'checksum': aggregate.hexdigest(),
+            'row_count': row_count,
+            'elapsed_seconds': elapsed,
+            'rows_per_sec': row_count / elapsed if elapsed else None}
+
+
+def batched(rows, batch_size):
+    """yield lists of batch_size rows."""
+    batch = []
+    for row in rows:
+        batch.append(tuple(row))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,128 @@
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from db_stats import checksum_stream
+
+
+DEFAULT_CHECKS = ('count', 'min_max', 'table_space', 'checksum')
+
+
+class ValidationOrchestrator:
+    """
+    this class runs the source vs target validation checks of a list of tables concurrently.
+
+    Every check of both sides is scheduled on one bounded worker pool, the number of checks
+    running against the same host is capped, and a result record is yielded per table as soon
+    as all its checks are done.
+    """
+
+    def __init__(self, source_class, source_info, target_class, target_info,
+                 max_workers=8, per_host_limit=4, checks=DEFAULT_CHECKS) -> None:
+        """
+        source_class / target_class are *ConectionManger classes, source_info / target_info their connection_info.
+        """
+        self.sides = {
+            'source': (source_class, dict(source_info, use_pool=True,
+                                          pool_max_size=max(int(source_info.get('pool_max_size', 0)), per_host_limit))),
+            'target': (target_class, dict(target_info, use_pool=True,
+                                          pool_max_size=max(int(target_info.get('pool_max_size', 0)), per_host_limit))),
+        }
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.checks = checks
+        self._host_limits = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, connection_info):
+        host = f"{connection_info.get('host_address')}:{connection_info.get('port_number')}"
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+    def _run_check(self, side, table_name, check, checksum_query):
+        manager_class, connection_info = self.sides[side]
+        with self._host_semaphore(connection_info):
+            manager = manager_class(connection_info)
+            try:
+                if check == 'count':
+                    if hasattr(manager, 'table_count'):
+                        return manager.table_count(table_name)
+                    status, records_count = manager.table_count_db2(table_name)
+                    return records_count if status else None
+                if check == 'min_max':
+                    return manager.find_min_max_values(table_name)
+                if check == 'table_space':
+                    return manager.table_space(table_name)
+                if check == 'checksum':
+                    if hasattr(manager, 'calculate_checksum_stream'):
+                        return manager.calculate_checksum_stream(checksum_query)['checksum']
+                    # same fold over the first column for the managers without a checksum stream of their own
+                    return checksum_stream(row[0] for row in manager.iter_rows(checksum_query))['checksum']
+                raise ValueError(f"unknown check {check}")
+            finally:
+                manager.connection_close()
+
+    def run(self, tables, checksum_queries=None):
+        """Validates the tables, yielding one record per table as its checks finish.
+
+        Parameters
+        ----------
+        tables : list
+            table names, or (source table, target table) tuples when the names differ.
+        checksum_queries : dict
+            table name -> (source query, target query), the checksum check is skipped for other tables.
+            The hash of a row is the first selected column, both sides are folded with db_stats.checksum_stream.
+
+        Returns
+        -------
+        records : generator
+            dict with table_name, source and target results per check, errors and match per check.
+        """
+        checksum_queries = checksum_queries or {}
+        pairs = [each if isinstance(each, (tuple, list)) else (each, each) for each in tables]
+        counts = Counter(source_table for source_table, _ in pairs)
+        duplicates = sorted(name for name, count in counts.items() if count > 1)
+        if duplicates:
+            # records are keyed by the source name, a second entry would overwrite the first
+            raise ValueError(f"tables listed more than once: {', '.join(duplicates)}")
+        records = {}
+        pending = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for source_table, target_table in pairs:
+                records[source_table] = {'table_name': source_table, 'source': {}, 'target': {}, 'errors': {}}
+                pending[source_table] = 0
+                for check in self.checks:
+                    queries = (None, None)
+                    if check == 'checksum':
+                        if source_table not in checksum_queries:
+                            continue
+                        queries = checksum_queries[source_table]
+                    for side, table_name, query in (('source', source_table, queries[0]),
+                                                    ('target', target_table, queries[1])):
+                        future = executor.submit(self._run_check, side, table_name, check, query)
+                        futures[future] = (source_table, side, check)
+                        pending[source_table] += 1
+
+            # tables without any scheduled check (e.g. only checksum requested and no query given)
+            for table_name in [name for name, count in pending.items() if count == 0]:
+                yield self._finish(records.pop(table_name))
+
+            for future in as_completed(futures):
+                table_name, side, check = futures[future]
+                record = records[table_name]
+                try:
+                    record[side][check] = future.result()
+                except Exception as err:
+                    record['errors'][f"{side}.{check}"] = str(err)
+                pending[table_name] -= 1
+                if pending[table_name] == 0:
+                    yield self._finish(records.pop(table_name))
+
+    @staticmethod
+    def _finish(record):
+        record['match'] = {check: record['source'].get(check) == record['target'].get(check)
+                           for check in record['source'] if check in record['target']}
+        return record
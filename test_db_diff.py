@@ -0,0 +1,66 @@
+import math
+import sqlite3
+import zlib
+
+import pytest
+
+from db_diff import MerkleTableDiff, row_text_expression
+
+HASH = "row_hash(name, amount)"
+
+
+class SqliteManager:
+    def __init__(self, rows, dialect='sqlite'):
+        self.dialect = dialect
+        self.connection = sqlite3.connect(':memory:')
+        self.connection.create_function('FLOOR', 1, math.floor)
+        self.connection.create_function('row_hash', 2, lambda *values: zlib.crc32(repr(values).encode('utf-8')))
+        self.connection.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT, amount INTEGER)")
+        self.connection.executemany("INSERT INTO t VALUES (?, ?, ?)", rows)
+
+    def fetch_rows(self, sql_query):
+        return self.connection.execute(sql_query).fetchall()
+
+
+def diff(source_rows, target_rows, **kwargs):
+    return MerkleTableDiff(SqliteManager(source_rows), SqliteManager(target_rows), 't', key_column='id',
+                           columns=['name', 'amount'], source_hash_expression=HASH,
+                           target_hash_expression=HASH, **kwargs).run()
+
+
+def test_merkle_diff_finds_changed_rows():
+    rows = [(key, f"name {key}", key * 10) for key in range(1, 5001)]
+    target = [row for row in rows if row[0] not in (17, 4000)]
+    target[100] = (target[100][0], 'changed', 0)
+    target.append((6000, 'extra', 1))
+    result = diff(rows, target, fanout=8, leaf_rows=50)
+    assert result['missing_in_target'] == [17, 4000]
+    assert result['missing_in_source'] == [6000]
+    assert result['mismatched'] == [target[100][0]]
+
+
+def test_merkle_diff_skips_matching_buckets():
+    rows = [(key, f"name {key}", key) for key in range(1, 10001)]
+    changed = list(rows)
+    changed[5000] = (5001, 'changed', 0)
+    result = diff(rows, changed, fanout=16, leaf_rows=100)
+    assert result['mismatched'] == [5001]
+    # two min / max queries plus a few levels of buckets, never one query per bucket of the table
+    assert result['queries'] < 20
+
+
+def test_row_text_marks_null_columns():
+    connection = sqlite3.connect(':memory:')
+    # CONCAT_WS of MySQL / Postgres / SQL Server skips null arguments
+    connection.create_function('CONCAT_WS', -1, lambda sep, *values: sep.join(
+        str(value) for value in values if value is not None))
+    text = row_text_expression('mysql', ['a', 'b'])
+    first, second = (connection.execute(f"SELECT {text} FROM (SELECT ? AS a, ? AS b)", row).fetchone()[0]
+                     for row in ((None, 'x'), ('x', None)))
+    assert first != second
+
+
+def test_merkle_diff_rejects_default_hashes_across_engines():
+    with pytest.raises(ValueError):
+        MerkleTableDiff(SqliteManager([], 'oracle'), SqliteManager([], 'postgres'), 't', key_column='id',
+                        columns=['name'])
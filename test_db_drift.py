@@ -0,0 +1,62 @@
+from db_drift import schema_drift, table_drift
+
+
+def column(name, data_type, length=10):
+    return {'column_name': name, 'DATA_TYPE': data_type, 'DATA_LENGTH': length}
+
+
+def constraint(name, columns, constraint_type='P'):
+    return [{'constraint_name': name, 'constraint_type': constraint_type, 'column_name': column_name,
+             'position': position, 'r_table_name': None} for position, column_name in columns]
+
+
+def partition(name, high_value, position):
+    return {'partition_name': name, 'max_value': high_value, 'partition_position': position,
+            'selected': False, 'dropped': False}
+
+
+def test_columns_added_removed_and_retyped():
+    old = {'table_name': 'T', 'column_detail': [column('ID', 'NUMBER'), column('NAME', 'VARCHAR2'),
+                                                column('OLD', 'DATE')]}
+    new = {'table_name': 't', 'column_detail': [column('id', 'NUMBER'), column('name', 'CLOB', 4000),
+                                                column('extra', 'DATE')]}
+    drift = table_drift(old, new)
+    assert drift['columns_added'] == ['extra']
+    assert drift['columns_removed'] == ['old']
+    assert drift['columns_retyped'] == {'name': ['VARCHAR2', 'CLOB']}
+    assert drift['columns_changed']['name']['DATA_LENGTH'] == [10, 4000]
+    assert table_drift(old, old) == {}
+
+
+def test_constraints_compared_by_signature_not_name():
+    columns = [(position, f"C{position}") for position in range(1, 12)]
+    old = {'table_name': 't', 'constraint_details': constraint('SYS_C0001', columns)}
+    renamed = {'table_name': 't', 'constraint_details': constraint('PK__T__1', [(str(position), name)
+                                                                               for position, name in columns])}
+    assert table_drift(old, renamed) == {}
+    added = table_drift({'table_name': 't'}, old)['constraints_added'][0]
+    assert added['columns'] == [f"c{position}" for position in range(1, 12)]
+    reordered = {'table_name': 't', 'constraint_details': constraint('SYS_C0001', [(1, 'C2'), (2, 'C1')])}
+    drift = table_drift({'table_name': 't', 'constraint_details': constraint('PK', [(1, 'C1'), (2, 'C2')])},
+                        reordered)
+    assert drift['constraints_added'][0]['columns'] == ['c2', 'c1']
+    assert drift['constraints_removed'][0]['columns'] == ['c1', 'c2']
+
+
+def test_partitions_added_and_changed():
+    old = {'table_name': 't', 'partition_json': [partition('P1', '100', 1), partition('P2', '200', 2)]}
+    new = {'table_name': 't', 'partition_json': [partition('P0', '50', 1), partition('P1', '100', 2),
+                                                 dict(partition('P2', '300', 3), selected=True)]}
+    drift = table_drift(old, new)
+    assert drift['partitions_added'] == ['P0']
+    assert 'partitions_removed' not in drift
+    # only the high value of P2 changed, its position and selected flag are ignored
+    assert drift['partitions_changed'] == {'P2': {'max_value': ['200', '300']}}
+
+
+def test_schema_drift_tables():
+    old = [{'table_name': 'A', 'column_detail': [column('ID', 'NUMBER')]}, {'table_name': 'B'}]
+    new = [{'table_name': 'a', 'column_detail': [column('ID', 'INTEGER')]}, {'table_name': 'c'}]
+    drift = schema_drift(old, new)
+    assert drift['tables_added'] == ['c'] and drift['tables_removed'] == ['b']
+    assert drift['tables']['a']['columns_retyped'] == {'id': ['NUMBER', 'INTEGER']}
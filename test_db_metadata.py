@@ -0,0 +1,87 @@
+import os
+
+from db_metadata import MetadataCache
+
+
+class FakeManager:
+    """catalog of table name -> (DDL marker, columns), counting the metadata_details calls."""
+
+    dialect = 'fake'
+
+    def __init__(self, tables):
+        self.connection_info = {'host_address': 'db'}
+        self.tables = tables
+        self.calls = []
+
+    def ddl_markers(self):
+        return {name: marker for name, (marker, _) in self.tables.items()}
+
+    def details(self, name):
+        return {'table_name': name, 'column_detail': self.tables[name][1]}
+
+    def metadata_details(self, table_name=None):
+        self.calls.append(table_name)
+        if table_name is None:
+            return [self.details(name) for name in self.tables]
+        return [self.details(table_name)] if table_name in self.tables else []
+
+
+def catalog(count):
+    return {f"t{each}": ('1', [f"c{each}"]) for each in range(count)}
+
+
+def test_first_run_fetches_the_schema_in_one_call(tmp_path):
+    manager = FakeManager(catalog(3))
+    cache = MetadataCache(manager, str(tmp_path))
+    assert [each['table_name'] for each in cache.metadata_details()] == ['t0', 't1', 't2']
+    assert manager.calls == [None]
+    assert os.path.exists(cache.cache_path)
+
+
+def test_changed_new_and_dropped_tables(tmp_path):
+    manager = FakeManager(catalog(10))
+    cache = MetadataCache(manager, str(tmp_path))
+    cache.metadata_details()
+    manager.tables['t1'] = ('2', ['changed'])
+    manager.tables['new'] = ('1', ['n'])
+    del manager.tables['t5']
+    manager.calls = []
+    result = {each['table_name']: each for each in cache.metadata_details()}
+    assert sorted(manager.calls) == ['new', 't1']
+    assert result['t1']['column_detail'] == ['changed'] and 'new' in result and 't5' not in result
+    assert 't5' not in cache.load()['markers']
+
+
+def test_many_changes_switch_to_one_bulk_fetch(tmp_path):
+    manager = FakeManager(catalog(10))
+    cache = MetadataCache(manager, str(tmp_path), bulk_fraction=0.2)
+    cache.metadata_details()
+    for name in ('t0', 't1', 't2'):
+        manager.tables[name] = ('2', ['changed'])
+    manager.calls = []
+    result = cache.metadata_details()
+    assert manager.calls == [None]
+    assert [each['table_name'] for each in result] == [f"t{each}" for each in range(10)]
+
+
+def test_unchanged_schema_is_not_saved_again(tmp_path):
+    manager = FakeManager(catalog(3))
+    cache = MetadataCache(manager, str(tmp_path))
+    cache.metadata_details()
+    os.utime(cache.cache_path, (0, 0))
+    manager.calls = []
+    cache.metadata_details()
+    assert manager.calls == [] and os.path.getmtime(cache.cache_path) == 0
+
+
+def test_table_dropped_during_refresh_is_skipped(tmp_path):
+    manager = FakeManager(catalog(10))
+    cache = MetadataCache(manager, str(tmp_path))
+    cache.metadata_details()
+    manager.tables['t3'] = ('2', ['changed'])
+    markers = manager.ddl_markers()
+    manager.ddl_markers = lambda: dict(markers)
+    del manager.tables['t3']
+    result = cache.metadata_details()
+    assert 't3' not in [each['table_name'] for each in result]
+    assert 't3' not in cache.load()['markers']
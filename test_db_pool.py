@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from db_pool import ConnectionPool, PoolRegistry, run_with_pool
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeFactory:
+    """create_connection following the managers convention, (err, connection)."""
+
+    def __init__(self):
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            con = FakeConnection(len(self.connections))
+            self.connections.append(con)
+        return None, con
+
+
+def test_acquire_reuses_released_connection():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, max_size=2)
+    err, first = pool.acquire()
+    assert err is None
+    pool.release(first)
+    assert first.rollbacks == 1
+    assert pool.acquire() == (None, first)
+    assert len(factory.connections) == 1
+
+
+def test_release_twice_keeps_one_idle_entry():
+    pool = ConnectionPool(FakeFactory(), max_size=2)
+    _, con = pool.acquire()
+    pool.release(con)
+    pool.release(con)
+    stats = pool.stats()
+    assert stats['idle'] == 1 and stats['returned'] == 1 and stats['in_use'] == 0
+
+
+def test_idle_connections_are_evicted_down_to_min_size():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=1, max_size=3, idle_timeout=0.01)
+    connections = [pool.acquire()[1] for _ in range(3)]
+    for con in connections:
+        pool.release(con)
+    time.sleep(0.02)
+    stats = pool.stats()
+    assert stats['size'] == 1 and stats['idle'] == 1 and stats['evicted'] == 2
+    assert sum(con.closed for con in connections) == 2
+
+
+def test_acquire_times_out_when_exhausted():
+    pool = ConnectionPool(FakeFactory(), max_size=1, wait_timeout=0.05)
+    _, con = pool.acquire()
+    err, missing = pool.acquire()
+    assert missing is None and 'exhausted' in str(err)
+    assert pool.stats()['waits'] == 1
+    pool.release(con)
+    assert pool.acquire()[1] is con
+
+
+def test_stats_counts_borrowed_and_created():
+    pool = ConnectionPool(FakeFactory(), min_size=1, max_size=4)
+    first = pool.acquire()[1]
+    second = pool.acquire()[1]
+    pool.discard(second)
+    stats = pool.stats()
+    assert stats['created'] == 2 and stats['borrowed'] == 2
+    assert stats['size'] == 1 and stats['in_use'] == 1 and stats['idle'] == 0
+    pool.release(first)
+    pool.close()
+    assert pool.stats()['size'] == 0 and first.closed
+
+
+def test_registry_shares_pool_per_connection():
+    registry = PoolRegistry()
+    factory = FakeFactory()
+    info = {'host_address': 'db', 'port_number': 1, 'pool_max_size': 3}
+    pool = registry.get_pool('Manager', info, factory)
+    assert registry.get_pool('Manager', dict(info, pool_max_size=9), factory) is pool
+    assert registry.get_pool('Other', info, factory) is not pool
+    assert pool.max_size == 3
+    pool.release(pool.acquire()[1])
+    registry.close_all()
+    assert factory.connections[0].closed and registry.stats() == {}
+
+
+def test_run_with_pool_leaves_a_borrowed_connection_alone():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, max_size=3, wait_timeout=1)
+    _, own = pool.acquire()
+    used = set()
+    result = run_with_pool(pool, lambda con, item: used.add(con.number) or item * 2, range(10), max_workers=8)
+    assert result == {item: item * 2 for item in range(10)}
+    assert own.number not in used and len(factory.connections) <= 3
+    assert pool.stats()['in_use'] == 1
+
+
+def test_run_with_pool_discards_connection_on_error():
+    pool = ConnectionPool(FakeFactory(), max_size=2)
+
+    def fail(con, item):
+        raise RuntimeError(item)
+
+    with pytest.raises(RuntimeError):
+        run_with_pool(pool, fail, [1])
+    assert pool.stats()['size'] == 0
@@ -0,0 +1,53 @@
+from db_profile import HyperLogLog, profile_table
+
+
+def test_hyperloglog_estimate_within_error():
+    sketch = HyperLogLog(precision=12)
+    for value in range(50000):
+        sketch.add(value)
+        sketch.add(value)
+    assert abs(sketch.count() - 50000) / 50000 < 0.05
+
+
+def test_hyperloglog_small_counts():
+    sketch = HyperLogLog()
+    assert sketch.count() == 0
+    for value in ('a', 'b', 'c', 'a', None):
+        sketch.add(value)
+    assert sketch.count() == 4
+
+
+class FakeManager:
+    """postgres like manager, one aggregate row and the rows read for the sketch."""
+
+    dialect = 'postgres'
+
+    def __init__(self, values):
+        self.values = values
+        self.queries = []
+
+    def fetch_table_details(self, table_name):
+        return [{'column_name': 'name', 'DATA_TYPE': 'text'}]
+
+    def fetch_rows(self, sql_query):
+        non_null = [value for value in self.values if value is not None]
+        return [(len(self.values), len(non_null), None, 1, 5, 3.0)]
+
+    def iter_rows(self, sql_query, batch_size=10000):
+        self.queries.append(sql_query)
+        return iter([(value,) for value in self.values])
+
+
+def test_profile_table_samples_the_sketch_by_default():
+    manager = FakeManager(['a', 'b', None, 'a'])
+    profile = profile_table(manager, 'public.t')['name']
+    assert manager.queries == ["SELECT name FROM public.t TABLESAMPLE SYSTEM (10)"]
+    assert profile.null_count == 1 and profile.distinct_count == 2
+    assert profile.distinct_source == 'sample'
+
+
+def test_profile_table_reads_every_row_at_100_percent():
+    manager = FakeManager(['a', 'b'])
+    profile = profile_table(manager, 't', sample_percent=100)['name']
+    assert manager.queries == ["SELECT name FROM t"]
+    assert profile.distinct_source == 'hyperloglog'
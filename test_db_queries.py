@@ -0,0 +1,76 @@
+import pytest
+
+from db_queries import StatementCache, bind_query, compile_query, update_table_index
+
+
+def test_compile_query_styles():
+    template = "SELECT * FROM t WHERE a = $a AND b = '$b' AND c = $a"
+    assert compile_query(template, 'qmark') == ("SELECT * FROM t WHERE a = ? AND b = ? AND c = ?", ('a', 'b', 'a'))
+    assert compile_query(template, 'named') == ("SELECT * FROM t WHERE a = :a AND b = :b AND c = :a", ('a', 'b'))
+    assert compile_query(template, 'numeric') == ("SELECT * FROM t WHERE a = $1 AND b = $2 AND c = $1", ('a', 'b'))
+    assert compile_query(template, 'at') == ("SELECT * FROM t WHERE a = @a AND b = @b AND c = @a", ('a', 'b'))
+
+
+def test_compile_query_keeps_dollar_identifiers():
+    assert compile_query("select * from v$session where a=$x", 'qmark') == (
+        "select * from v$session where a=?", ('x',))
+    assert compile_query("SELECT sql_id FROM GV$SQL WHERE inst_id = ${inst}", 'named') == (
+        "SELECT sql_id FROM GV$SQL WHERE inst_id = :inst", ('inst',))
+    assert compile_query('DROP TABLE "BIN$abc==$0"', 'qmark') == ('DROP TABLE "BIN$abc==$0"', ())
+
+
+def test_bind_query_params_per_dialect():
+    template = "SELECT * FROM t WHERE owner = $owner AND name = $name"
+    values = {'owner': 'HR', 'name': 'EMP', 'unused': 1}
+    assert bind_query(template, 'oracle', values) == (
+        "SELECT * FROM t WHERE owner = :owner AND name = :name", {'owner': 'HR', 'name': 'EMP'})
+    assert bind_query(template, 'postgres', values)[1] == ('HR', 'EMP')
+    assert bind_query(template, 'db2', values)[1] == ('HR', 'EMP')
+    assert bind_query(template, 'mssql', values)[1] == {'owner': 'HR', 'name': 'EMP'}
+
+
+def test_bind_query_missing_value():
+    with pytest.raises(KeyError):
+        bind_query("SELECT * FROM t WHERE a = $a", 'mysql', {})
+
+
+def test_statement_cache_reuse_and_eviction():
+    released = []
+    cache = StatementCache(lambda sql: f"prepared {sql}", released.append, max_size=2)
+    assert cache.get('a') == 'prepared a'
+    cache.get('b')
+    cache.get('a')
+    cache.get('c')
+    assert released == ['prepared b']
+    assert cache.stats() == {'prepared': 3, 'reused': 1, 'released': 1, 'statements': 2}
+    cache.clear(release=False)
+    assert released == ['prepared b'] and cache.stats()['statements'] == 0
+
+
+def test_update_table_index_folds_unquoted_names():
+    assert update_table_index(set(), "CREATE TABLE Orders (id int)", fold=str.lower) == {'orders'}
+    assert update_table_index(set(), 'CREATE TABLE public."Orders" (id int)', fold=str.lower) == {'Orders'}
+    assert update_table_index(set(), "create table orders (id int)", fold=str.upper) == {'ORDERS'}
+    assert update_table_index(set(), "CREATE TABLE [dbo].[Orders] (id int)", normalize=str.lower) == {'orders'}
+
+
+def test_update_table_index_statement_forms():
+    assert update_table_index(set(), "CREATE UNLOGGED TABLE a (id int)") == {'a'}
+    assert update_table_index(set(), "CREATE TEMP TABLE b AS SELECT 1") == {'b'}
+    assert update_table_index(set(), "CREATE OR REPLACE TABLE s.c (id int)") == {'c'}
+    assert update_table_index(set(), "CREATE TABLE IF NOT EXISTS `d`(id int)") == {'d'}
+    assert update_table_index({'a', 'b', 'c'}, "DROP TABLE IF EXISTS a, s.b CASCADE") == {'c'}
+
+
+def test_update_table_index_unparsed_ddl_resets_the_index():
+    assert update_table_index({'a'}, "ALTER TABLE a RENAME TO b") is None
+    assert update_table_index({'a'}, "INSERT INTO a VALUES (1)") == {'a'}
+    assert update_table_index(None, "CREATE TABLE a (id int)") is None
+
+
+def test_update_table_index_other_schema_resets_the_index():
+    assert update_table_index({'A'}, "create table hr.b (id int)", fold=str.upper, schema='HR') == {'A', 'B'}
+    assert update_table_index({'A'}, "DROP TABLE scott.a", fold=str.upper, schema='HR') is None
+    assert update_table_index({'a'}, "DROP TABLE a, other.a", schema='sales') is None
+    assert update_table_index({'a'}, "DROP TABLE [DBO].[a]", normalize=str.lower, schema='dbo') == set()
+    assert update_table_index({'a'}, "DROP TABLE otherdb.dbo.a", normalize=str.lower) is None
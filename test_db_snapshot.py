@@ -0,0 +1,43 @@
+import struct
+
+import pytest
+
+from db_snapshot import SNAPSHOT_MAGIC, MetadataSnapshot, write_snapshot
+
+
+TABLES = [{'table_name': name, 'column_detail': [{'column_name': 'id', 'DATA_TYPE': 'NUMBER'}],
+           'partition_json': []} for name in ('orders', 'Émigré', 'accounts', 'zeta')]
+
+
+def test_write_and_lookup_round_trip(tmp_path):
+    path = str(tmp_path / 'schema.snap')
+    assert write_snapshot(path, TABLES) == 4
+    with MetadataSnapshot(path) as snapshot:
+        assert len(snapshot) == 4
+        assert snapshot.table_names() == sorted(table['table_name'] for table in TABLES)
+        assert snapshot.get('orders') == TABLES[0]
+        assert snapshot.get('Émigré') == TABLES[1]
+        assert 'zeta' in snapshot and 'missing' not in snapshot
+        assert snapshot.get('missing') is None
+        assert snapshot.get('accounts', compact=True).column_detail[0].column_name == 'id'
+        assert len(snapshot.load_all()) == 4
+
+
+def test_empty_snapshot(tmp_path):
+    path = str(tmp_path / 'empty.snap')
+    write_snapshot(path, [])
+    with MetadataSnapshot(path) as snapshot:
+        assert len(snapshot) == 0 and snapshot.get('orders') is None
+
+
+def test_rejects_bad_magic_and_version(tmp_path):
+    path = tmp_path / 'bad.snap'
+    path.write_bytes(b'not a snapshot at all, just some bytes')
+    with pytest.raises(ValueError, match='not a metadata snapshot'):
+        MetadataSnapshot(str(path))
+    write_snapshot(str(path), TABLES)
+    data = bytearray(path.read_bytes())
+    struct.pack_into('<8sI', data, 0, SNAPSHOT_MAGIC, 2)
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match='version 2'):
+        MetadataSnapshot(str(path))
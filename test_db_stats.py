@@ -0,0 +1,72 @@
+import datetime
+
+from db_stats import (add_segment_size, checksum_stream, count_estimate, min_max_columns, min_max_query,
+                      min_max_result, split_table_name, table_min_max, table_spaces_result)
+
+
+class FakeManager:
+    def __init__(self, column_details, rows):
+        self.column_details = column_details
+        self.rows = rows
+        self.queries = []
+
+    def fetch_table_details(self, table_name):
+        return self.column_details
+
+    def fetch_rows(self, sql_query):
+        self.queries.append(sql_query)
+        return self.rows
+
+
+def test_split_table_name():
+    assert split_table_name('hr.emp') == ('hr', 'emp')
+    assert split_table_name('emp', 'public') == ('public', 'emp')
+
+
+def test_count_estimate():
+    fresh = count_estimate(10, datetime.datetime.now() - datetime.timedelta(days=1))
+    assert fresh['row_count'] == 10 and not fresh['stale']
+    old = count_estimate(10, datetime.date.today() - datetime.timedelta(days=30))
+    assert old['stale']
+    missing = count_estimate(-1, None)
+    assert missing['row_count'] is None and missing['stale']
+
+
+def test_min_max_helpers():
+    details = [{'column_name': 'id', 'DATA_TYPE': 'NUMBER(10)'},
+               {'column_name': 'name', 'DATA_TYPE': 'VARCHAR2'},
+               {'column_name': 'created', 'DATA_TYPE': 'TIMESTAMP(6)'}]
+    columns = min_max_columns(details)
+    assert columns == ['id', 'created']
+    assert min_max_query('t', columns) == "SELECT min(id), max(id), min(created), max(created) FROM t"
+    assert min_max_result(columns, (1, 9, None, None)) == {
+        'id': {'min_value': '1', 'max_value': '9'},
+        'created': {'min_value': 'null', 'max_value': 'null'}}
+
+
+def test_table_min_max_single_scan():
+    manager = FakeManager([{'column_name': 'id', 'DATA_TYPE': 'INT'}], [(1, 5)])
+    assert table_min_max(manager, 'hr.t') == {'id': {'min_value': '1', 'max_value': '5'}}
+    assert manager.queries == ["SELECT min(id), max(id) FROM hr.t"]
+    assert table_min_max(FakeManager([{'column_name': 'n', 'DATA_TYPE': 'TEXT'}], []), 't') == {}
+
+
+def test_table_spaces_result():
+    spaces = {}
+    add_segment_size(spaces, 'a', 'table', 100, '1')
+    add_segment_size(spaces, 'a', 'index', 50, '1')
+    add_segment_size(spaces, 'b', 'table', 10, 'p1')
+    add_segment_size(spaces, 'b', 'lob', None, 'p2')
+    add_segment_size(spaces, 'b', 'lob', 5, 'p2')
+    assert table_spaces_result(spaces) == {
+        'a': {'table_bytes': 100, 'index_bytes': 50, 'lob_bytes': 0, 'total_bytes': 150, 'partitions': {}},
+        'b': {'table_bytes': 10, 'index_bytes': 0, 'lob_bytes': 5, 'total_bytes': 15,
+              'partitions': {'p1': 10, 'p2': 5}}}
+
+
+def test_checksum_stream_order_and_count():
+    first = checksum_stream(iter(['a', 'b']))
+    assert first['row_count'] == 2
+    assert first['checksum'] == checksum_stream(['a', 'b'])['checksum']
+    assert first['checksum'] != checksum_stream(['b', 'a'])['checksum']
+    assert checksum_stream([])['row_count'] == 0
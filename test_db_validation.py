@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from db_stats import checksum_stream
+from db_validation import ValidationOrchestrator
+
+
+class FakeManager:
+    """manager answering every check from connection_info['tables'], table name -> row count."""
+
+    running = {}
+    peak = {}
+    lock = threading.Lock()
+
+    def __init__(self, connection_info):
+        self.connection_info = connection_info
+        self.host = connection_info['host_address']
+        with self.lock:
+            self.running[self.host] = self.running.get(self.host, 0) + 1
+            self.peak[self.host] = max(self.peak.get(self.host, 0), self.running[self.host])
+        time.sleep(0.01)
+
+    def table_count(self, table_name):
+        return self.connection_info['tables'][table_name]
+
+    def find_min_max_values(self, table_name):
+        return {'id': {'min_value': '1', 'max_value': str(self.table_count(table_name))}}
+
+    def table_space(self, table_name):
+        raise RuntimeError(f"no segment for {table_name}")
+
+    def iter_rows(self, sql_query, batch_size=10000):
+        return iter([(f"hash {key}",) for key in range(self.table_count(sql_query))])
+
+    def connection_close(self):
+        with self.lock:
+            self.running[self.host] -= 1
+
+
+class FakeStreamManager(FakeManager):
+    """manager with its own checksum stream, like Oracle and DB2."""
+
+    def calculate_checksum_stream(self, sql_query):
+        return checksum_stream(f"hash {key}" for key in range(self.table_count(sql_query)))
+
+
+def orchestrator(source_tables, target_tables, source_class=FakeManager, **kwargs):
+    return ValidationOrchestrator(source_class, {'host_address': 'src', 'port_number': 1, 'tables': source_tables},
+                                  FakeManager, {'host_address': 'dst', 'port_number': 1, 'tables': target_tables},
+                                  **kwargs)
+
+
+def test_run_yields_one_record_per_table():
+    records = {record['table_name']: record for record in
+               orchestrator({'a': 3, 'b': 5}, {'a': 3, 'b': 4, 'c': 4}).run(['a', ('b', 'c')])}
+    assert sorted(records) == ['a', 'b']
+    assert records['a']['match'] == {'count': True, 'min_max': True}
+    assert records['b']['match'] == {'count': False, 'min_max': False}
+    assert records['b']['target']['count'] == 4
+    assert set(records['a']['errors']) == {'source.table_space', 'target.table_space'}
+
+
+def test_run_caps_checks_per_host():
+    FakeManager.peak.clear()
+    tables = {f"t{each}": each for each in range(10)}
+    records = list(orchestrator(tables, tables, max_workers=8, per_host_limit=2).run(list(tables)))
+    assert len(records) == 10
+    assert FakeManager.peak['src'] <= 2 and FakeManager.peak['dst'] <= 2
+
+
+def test_run_rejects_duplicate_source_names():
+    with pytest.raises(ValueError, match='a'):
+        list(orchestrator({'a': 1}, {'a': 1}).run(['a', ('a', 'b')]))
+
+
+def test_run_yields_tables_without_checks():
+    records = list(orchestrator({'a': 1}, {'a': 1}, checks=('checksum',)).run(['a']))
+    assert records == [{'table_name': 'a', 'source': {}, 'target': {}, 'errors': {}, 'match': {}}]
+
+
+def test_checksum_falls_back_to_iter_rows():
+    records = list(orchestrator({'a': 50}, {'a': 50}, source_class=FakeStreamManager, checks=('checksum',))
+                   .run(['a'], checksum_queries={'a': ('a', 'a')}))
+    assert records[0]['errors'] == {}
+    assert records[0]['match'] == {'checksum': True}